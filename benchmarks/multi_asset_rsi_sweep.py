@@ -0,0 +1,256 @@
+"""
+Offline parameter sweep of the MultiAssetRSIStrategy daily signal over cached daily candles.
+
+Every combination of the grids of rsi_length, bullish/bearish entry and exit levels, sma_length and
+rebalance_threshold is simulated with the signal, weighting and rebalance rules of the strategy, acting on the close
+of each daily candle. The rest of the parameters are read from the strategy config file. The intraday stops are not
+simulated. With the weighting of the strategy, a held pair without a buy signal gets a target weight of zero whether
+its RSI reached the exit level or not, so the exit levels don't change the results and their grids default to the
+values of the config.
+
+The RSI of every pair is computed once per rsi_length and the SMA of BTC-USDT once per sma_length as NumPy matrices.
+The combinations are split in chunks spread over a process pool, and each chunk is simulated at once with the state of
+all its combinations broadcast as (combinations, pairs) arrays, so the cost is one vectorized step per candle and
+chunk.
+
+The candles are read from CSV files with timestamp and close columns, aligned by timestamp, or generated as random
+walks with --synthetic.
+
+Usage: python benchmarks/multi_asset_rsi_sweep.py --candles BTC-USDT=btc_1d.csv --candles ETH-USDT=eth_1d.csv
+       python benchmarks/multi_asset_rsi_sweep.py --synthetic 2000 [--workers 4] [--top 20] [--output sweep.csv]
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bots"))
+
+from controllers.utils.pmm_dynamic import rma  # noqa: E402
+from scripts.utils.multi_asset_rsi_config import MultiAssetRSIConfig, MultiAssetRSIParams  # noqa: E402
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bots", "conf",
+                                   "multi_asset_rsi_config.yaml")
+GRID_COLUMNS = ["rsi_length", "bullish_rsi_entry", "bullish_rsi_exit", "bearish_rsi_entry", "bearish_rsi_exit",
+                "sma_length", "rebalance_threshold"]
+ETH_BTC_RSI_ADJUSTMENT = 5
+DAYS_PER_YEAR = 365
+
+_market: Dict[str, np.ndarray] = {}
+
+
+def load_candles(paths: Dict[str, str]) -> pd.DataFrame:
+    """
+    :return: close prices with one column per trading pair, indexed by the timestamps present in all the files.
+    """
+    closes = [pd.read_csv(path, usecols=["timestamp", "close"]).set_index("timestamp")["close"].rename(pair)
+              for pair, path in paths.items()]
+    return pd.concat(closes, axis=1, join="inner").sort_index()
+
+
+def get_synthetic_candles(trading_pairs: List[str], n_candles: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    market_returns = rng.normal(0.0005, 0.03, n_candles)
+    closes = {pair: 100 * np.exp(np.cumsum(market_returns + rng.normal(0, 0.02, n_candles)))
+              for pair in trading_pairs}
+    return pd.DataFrame(closes, index=np.arange(n_candles) * 86400.0)
+
+
+def rsi(close: np.ndarray, length: int) -> np.ndarray:
+    """
+    RSI with the Wilder moving average of pandas_ta, the same values as the indicator cache of the strategy.
+    """
+    change = np.concatenate([[np.nan], np.diff(close)])
+    gain = rma(np.where(np.isnan(change), np.nan, np.maximum(change, 0)), length)
+    loss = rma(np.where(np.isnan(change), np.nan, np.maximum(-change, 0)), length)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return 100 * gain / (gain + loss)
+
+
+def sma(close: np.ndarray, length: int) -> np.ndarray:
+    result = np.full(len(close), np.nan)
+    if len(close) >= length:
+        cumsum = np.concatenate([[0.0], np.cumsum(close)])
+        result[length - 1:] = (cumsum[length:] - cumsum[:-length]) / length
+    return result
+
+
+def build_market(closes: pd.DataFrame, params: MultiAssetRSIParams, rsi_lengths: List[int],
+                 sma_lengths: List[int]) -> Dict[str, np.ndarray]:
+    """
+    Indicator matrices shared by all the combinations: rsi (rsi lengths, candles, pairs), sma (sma lengths, candles),
+    the momentum score and the next candle return (candles, pairs) and the ETH/BTC entry level adjustment (candles,).
+    """
+    close = closes[params.trading_pairs].to_numpy(dtype=float)
+    btc_close = closes["BTC-USDT"].to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        momentum = np.abs(close[3:] / close[:-3] - 1) ** 3.5
+        next_returns = close[1:] / close[:-1] - 1
+    eth_btc_adjustment = np.zeros(len(close))
+    if "ETH-USDT" in closes:
+        eth_btc_rsi = rsi(closes["ETH-USDT"].to_numpy(dtype=float) / btc_close, params.eth_btc_rsi_length)
+        eth_btc_adjustment[eth_btc_rsi > 70] = -ETH_BTC_RSI_ADJUSTMENT
+        eth_btc_adjustment[eth_btc_rsi < 30] = ETH_BTC_RSI_ADJUSTMENT
+    return {
+        "rsi": np.stack([np.column_stack([rsi(close[:, i], length) for i in range(close.shape[1])])
+                         for length in rsi_lengths]),
+        "sma": np.stack([sma(btc_close, length) for length in sma_lengths]),
+        "btc_close": btc_close,
+        "momentum": np.nan_to_num(np.concatenate([np.zeros((3, close.shape[1])), momentum])),
+        "next_returns": np.nan_to_num(np.concatenate([next_returns, np.zeros((1, close.shape[1]))])),
+        "eth_btc_adjustment": eth_btc_adjustment,
+        "eth_mask": np.array(["ETH" in pair for pair in params.trading_pairs]),
+        "allocation": np.array(params.allocation),
+        "max_position_ratio": np.array(params.max_position_ratio),
+    }
+
+
+def init_worker(market: Dict[str, np.ndarray]):
+    global _market
+    _market = market
+
+
+def simulate(combinations: np.ndarray, fee: float) -> np.ndarray:
+    """
+    Simulate the daily signal of a chunk of combinations at once.
+    :param combinations: rows of (rsi index, bullish entry, bullish exit, bearish entry, bearish exit, sma index,
+    rebalance threshold).
+    :return: rows of (total return, max drawdown, annualized sharpe, number of trades).
+    """
+    market = _market
+    rsi_index = combinations[:, 0].astype(int)
+    bullish_entry, bearish_entry = combinations[:, 1:2], combinations[:, 3:4]
+    sma_index = combinations[:, 5].astype(int)
+    threshold = combinations[:, 6:7]
+    neutral_entry = (bullish_entry + bearish_entry) / 2
+    eth_mask = market["eth_mask"]
+    n_combinations, n_pairs = len(combinations), len(eth_mask)
+
+    weights = np.zeros((n_combinations, n_pairs))
+    value = np.ones(n_combinations)
+    peak = np.ones(n_combinations)
+    max_drawdown = np.zeros(n_combinations)
+    returns_sum = np.zeros(n_combinations)
+    returns_sum_sq = np.zeros(n_combinations)
+    trades = np.zeros(n_combinations)
+    n_candles = len(market["btc_close"])
+    for t in range(n_candles - 1):
+        pair_rsi = market["rsi"][rsi_index, t]
+        regime_sma = market["sma"][sma_index, t][:, None]
+        with np.errstate(invalid="ignore"):
+            bull = market["btc_close"][t] > regime_sma * 1.05
+            bear = market["btc_close"][t] < regime_sma * 0.95
+            entry = np.where(bull, bullish_entry, np.where(bear, bearish_entry, neutral_entry)) + \
+                eth_mask * market["eth_btc_adjustment"][t]
+            buy = (weights <= 0) & (pair_rsi <= entry)
+        scores = np.where(buy, market["momentum"][t], 0)
+        total_score = scores.sum(axis=1, keepdims=True)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            target_weights = np.where(total_score > 0,
+                                      np.minimum(scores / total_score, market["max_position_ratio"]), 0)
+        rebalance = np.abs(weights - target_weights) > threshold
+        new_weights = np.where(rebalance, target_weights * market["allocation"], weights)
+        turnover = np.abs(new_weights - weights).sum(axis=1)
+        trades += (rebalance & (new_weights != weights)).sum(axis=1)
+        weights = new_weights
+        growth = 1 + (weights * market["next_returns"][t]).sum(axis=1)
+        period_return = growth * (1 - fee * turnover) - 1
+        value *= 1 + period_return
+        weights = weights * (1 + market["next_returns"][t]) / growth[:, None]
+        peak = np.maximum(peak, value)
+        max_drawdown = np.maximum(max_drawdown, 1 - value / peak)
+        returns_sum += period_return
+        returns_sum_sq += period_return ** 2
+    n_periods = max(n_candles - 1, 1)
+    mean = returns_sum / n_periods
+    std = np.sqrt(np.maximum(returns_sum_sq / n_periods - mean ** 2, 0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(DAYS_PER_YEAR), 0)
+    return np.column_stack([value - 1, max_drawdown, sharpe, trades])
+
+
+def get_combinations(grids: Dict[str, List[float]]) -> np.ndarray:
+    """
+    Cartesian product of the grids, with rsi_length and sma_length replaced by their index in their grid.
+    """
+    values = [range(len(grids["rsi_length"]))] + [grids[column] for column in GRID_COLUMNS[1:5]] + \
+        [range(len(grids["sma_length"])), grids["rebalance_threshold"]]
+    return np.array(list(itertools.product(*values)), dtype=float)
+
+
+def sweep(closes: pd.DataFrame, params: MultiAssetRSIParams, grids: Dict[str, List[float]], workers: int,
+          chunk_size: int, fee: float) -> pd.DataFrame:
+    market = build_market(closes, params, grids["rsi_length"], grids["sma_length"])
+    combinations = get_combinations(grids)
+    chunks = np.array_split(combinations, max(1, -(-len(combinations) // chunk_size)))
+    if workers <= 1:
+        init_worker(market)
+        results = [simulate(chunk, fee) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(market,)) as executor:
+            results = list(executor.map(simulate, chunks, itertools.repeat(fee)))
+    result = pd.DataFrame(combinations, columns=GRID_COLUMNS)
+    result["rsi_length"] = np.array(grids["rsi_length"])[result["rsi_length"].astype(int)]
+    result["sma_length"] = np.array(grids["sma_length"])[result["sma_length"].astype(int)]
+    result[["total_return", "max_drawdown", "sharpe", "trades"]] = np.concatenate(results)
+    return result.sort_values("sharpe", ascending=False, ignore_index=True)
+
+
+def parse_list(value: str, cast=float) -> List:
+    return [cast(item) for item in value.split(",") if item]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--candles", action="append", default=[], metavar="PAIR=PATH",
+                        help="CSV file with the daily candles of a trading pair of the config.")
+    parser.add_argument("--synthetic", type=int, default=0, help="Number of random walk daily candles to use.")
+    parser.add_argument("--rsi-lengths", type=lambda value: parse_list(value, int), default=[7, 10, 14, 21])
+    parser.add_argument("--bullish-entries", type=parse_list, default=[55, 60, 65, 70, 75, 80])
+    parser.add_argument("--bullish-exits", type=parse_list)
+    parser.add_argument("--bearish-entries", type=parse_list, default=[20, 25, 30, 35, 40, 45])
+    parser.add_argument("--bearish-exits", type=parse_list)
+    parser.add_argument("--sma-lengths", type=lambda value: parse_list(value, int), default=[50, 100, 150, 200])
+    parser.add_argument("--rebalance-thresholds", type=parse_list, default=[0.05, 0.1, 0.15, 0.2])
+    parser.add_argument("--fee", type=float, default=0.001, help="Fee paid on the traded notional.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=512)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output", help="CSV file to save the results of all the combinations.")
+    args = parser.parse_args()
+
+    config = MultiAssetRSIConfig.load(args.config) if os.path.exists(args.config) else MultiAssetRSIConfig()
+    params = config.params
+    if args.synthetic:
+        closes = get_synthetic_candles(params.trading_pairs, args.synthetic)
+    else:
+        paths = dict(item.split("=", 1) for item in args.candles)
+        missing_pairs = set(params.trading_pairs) - set(paths)
+        if missing_pairs:
+            parser.error(f"Missing the candles of {sorted(missing_pairs)}, use --candles PAIR=PATH or --synthetic.")
+        closes = load_candles(paths)
+    grids = {"rsi_length": args.rsi_lengths, "bullish_rsi_entry": args.bullish_entries,
+             "bullish_rsi_exit": args.bullish_exits or [params.bullish_rsi_exit],
+             "bearish_rsi_entry": args.bearish_entries,
+             "bearish_rsi_exit": args.bearish_exits or [params.bearish_rsi_exit], "sma_length": args.sma_lengths,
+             "rebalance_threshold": args.rebalance_thresholds}
+
+    start = time.perf_counter()
+    result = sweep(closes, params, grids, workers=args.workers, chunk_size=args.chunk_size, fee=args.fee)
+    elapsed = time.perf_counter() - start
+    print(f"Simulated {len(result)} combinations over {len(closes)} candles of {params.trading_pairs} "
+          f"in {elapsed:.2f} s with {args.workers} workers.")
+    print(result.head(args.top).to_string())
+    if args.output:
+        result.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
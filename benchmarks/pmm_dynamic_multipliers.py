@@ -0,0 +1,123 @@
+"""
+Benchmark of the PMM Dynamic multipliers over a synthetic candles history.
+
+Compares the previous pandas implementation (pandas_ta when it is installed, otherwise an equivalent pandas port with
+the same row-wise histogram sign) against the NumPy kernel of the streaming indicators, shared by the controller and the config page, in batch
+mode and in streaming mode (one indicator engine update per candle).
+
+Usage: python benchmarks/pmm_dynamic_multipliers.py [--candles 100000] [--streaming-candles 10000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bots"))
+
+from controllers.utils.indicators import ATR, MACD, IndicatorEngine  # noqa: E402
+from controllers.utils.pmm_dynamic import get_multipliers, get_pmm_dynamic_multipliers  # noqa: E402
+
+MACD_FAST, MACD_SLOW, MACD_SIGNAL, NATR_LENGTH = 21, 42, 9, 14
+
+
+def get_candles(n_candles: int, seed: int = 42) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n_candles)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.002, n_candles))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.002, n_candles))
+    return pd.DataFrame({"timestamp": np.arange(n_candles) * 60.0, "open": open_, "high": high, "low": low,
+                         "close": close, "volume": rng.uniform(1, 10, n_candles)})
+
+
+def pandas_ema(close: pd.Series, length: int) -> pd.Series:
+    close = close.loc[close.first_valid_index():].copy()
+    close.iloc[length - 1] = close.iloc[:length].mean()
+    close.iloc[:length - 1] = np.nan
+    return close.ewm(span=length, adjust=False).mean()
+
+
+def legacy_multipliers(df: pd.DataFrame):
+    try:
+        import pandas_ta as ta
+        natr = ta.natr(df["high"], df["low"], df["close"], length=NATR_LENGTH) / 100
+        macd_output = ta.macd(df["close"], fast=MACD_FAST, slow=MACD_SLOW, signal=MACD_SIGNAL)
+        macd = macd_output[f"MACD_{MACD_FAST}_{MACD_SLOW}_{MACD_SIGNAL}"]
+        macdh = macd_output[f"MACDh_{MACD_FAST}_{MACD_SLOW}_{MACD_SIGNAL}"]
+    except ImportError:
+        previous_close = df["close"].shift()
+        true_range = pd.concat([df["high"] - df["low"], (df["high"] - previous_close).abs(),
+                                (previous_close - df["low"]).abs()], axis=1).max(axis=1, skipna=False)
+        atr = true_range.ewm(alpha=1 / NATR_LENGTH, min_periods=NATR_LENGTH).mean()
+        natr = atr / df["close"]
+        macd = pandas_ema(df["close"], MACD_FAST) - pandas_ema(df["close"], MACD_SLOW)
+        macdh = macd - pandas_ema(macd, MACD_SIGNAL).reindex(macd.index)
+    macd_signal = - (macd - macd.mean()) / macd.std()
+    macdh_signal = macdh.apply(lambda x: 1 if x > 0 else -1)
+    max_price_shift = natr / 2
+    price_multiplier = ((0.5 * macd_signal + 0.5 * macdh_signal) * max_price_shift)
+    return price_multiplier.to_numpy(), natr.to_numpy()
+
+
+def batch_multipliers(df: pd.DataFrame):
+    return get_pmm_dynamic_multipliers(df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(),
+                                       MACD_FAST, MACD_SLOW, MACD_SIGNAL, NATR_LENGTH)
+
+
+def streaming_multipliers(df: pd.DataFrame, window: int):
+    engine = IndicatorEngine([ATR(NATR_LENGTH), MACD(MACD_FAST, MACD_SLOW, MACD_SIGNAL)], history_size=window)
+    suffix = f"_{MACD_FAST}_{MACD_SLOW}_{MACD_SIGNAL}"
+    columns = [f"NATR_{NATR_LENGTH}", f"MACD{suffix}", f"MACDh{suffix}"]
+    engine.update(df.iloc[:window])
+    for end in range(window + 1, len(df) + 1):
+        engine.update(df.iloc[end - window:end])
+        features = engine.tail(window, columns)
+        get_multipliers(features[:, 0], features[:, 1], features[:, 2])
+
+
+def timeit(function, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candles", type=int, default=100_000)
+    parser.add_argument("--streaming-candles", type=int, default=10_000)
+    args = parser.parse_args()
+
+    df = get_candles(args.candles)
+    legacy_price, legacy_spread = legacy_multipliers(df)
+    price, spread = batch_multipliers(df)
+    print(f"Max abs difference: price {np.nanmax(np.abs(price - legacy_price)):.3e}, "
+          f"spread {np.nanmax(np.abs(spread - legacy_spread)):.3e}")
+
+    legacy_time = timeit(legacy_multipliers, df)
+    batch_time = timeit(batch_multipliers, df)
+    print(f"Batch over {args.candles} candles: legacy {legacy_time * 1000:.1f} ms | "
+          f"numpy {batch_time * 1000:.1f} ms | speedup x{legacy_time / batch_time:.1f}")
+
+    window = max(MACD_FAST, MACD_SLOW, MACD_SIGNAL, NATR_LENGTH) + 100
+    stream_df = df.iloc[:args.streaming_candles]
+    n_updates = len(stream_df) - window
+    streaming_time = timeit(streaming_multipliers, stream_df, window, repeat=1)
+
+    def recompute_window():
+        for end in range(window + 1, len(stream_df) + 1):
+            legacy_multipliers(stream_df.iloc[end - window:end])
+    recompute_time = timeit(recompute_window, repeat=1)
+    print(f"Streaming {n_updates} updates over a {window} candles window: "
+          f"legacy recompute {recompute_time / n_updates * 1e6:.0f} us/update | "
+          f"engine + kernel {streaming_time / n_updates * 1e6:.0f} us/update | "
+          f"speedup x{recompute_time / streaming_time:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
@@ -10,6 +10,10 @@ from hummingbot.strategy_v2.controllers.directional_trading_controller_base impo
     DirectionalTradingControllerConfigBase,
 )
 
+from controllers.utils.feature_cache import FeatureCache
+from controllers.utils.features import FeaturesStore, ProcessedData
+from controllers.utils.indicators import CANDLE_COLUMNS, BollingerBands
+
 
 class BollingerV1ControllerConfig(DirectionalTradingControllerConfigBase):
     controller_name: str = "bollinger_v1"
@@ -62,26 +66,44 @@ class BollingerV1Controller(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.indicators = FeatureCache.get_instance().get_engine(
+            connector_name=config.candles_connector,
+            trading_pair=config.candles_trading_pair,
+            interval=config.interval,
+            indicators=[BollingerBands(length=config.bb_length, std=config.bb_std)],
+            owner=config.id,
+            history_size=self.max_records)
+        self._features_version = 0
         super().__init__(config, *args, **kwargs)
+        self.processed_data = ProcessedData()
+
+    def on_stop(self):
+        FeatureCache.get_instance().release(self.config.id)
+        super().on_stop()
+
+    def get_features_columns(self) -> List[str]:
+        suffix = f"_{self.config.bb_length}_{self.config.bb_std}"
+        return CANDLE_COLUMNS + [f"BBL{suffix}", f"BBM{suffix}", f"BBU{suffix}", f"BBP{suffix}"]
+
+    def get_signal(self, bbp):
+        short_condition = bbp > self.config.bb_short_threshold
+        long_condition = bbp < self.config.bb_long_threshold
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
 
     async def update_processed_data(self):
         df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
                                                       trading_pair=self.config.candles_trading_pair,
                                                       interval=self.config.interval,
                                                       max_records=self.max_records)
-        # Add indicators
-        df.ta.bbands(length=self.config.bb_length, std=self.config.bb_std, append=True)
-        bbp = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"]
-
-        # Generate signal
-        long_condition = bbp < self.config.bb_long_threshold
-        short_condition = bbp > self.config.bb_short_threshold
-
-        # Generate signal
-        df["signal"] = 0
-        df.loc[long_condition, "signal"] = 1
-        df.loc[short_condition, "signal"] = -1
+        # Advance the indicators with the new candles, the engine can be shared with other controllers
+        self.indicators.update(df)
+        if self.indicators.version == self._features_version:
+            return
+        self._features_version = self.indicators.version
+        columns = self.get_features_columns()
+        features = self.indicators.tail(max(self.max_records, len(df)), columns)
+        signal = self.get_signal(features[:, columns.index(f"BBP_{self.config.bb_length}_{self.config.bb_std}")])
 
         # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+        self.processed_data["signal"] = int(signal[-1])
+        self.processed_data["features"] = FeaturesStore.from_array(features, columns, signal=signal.astype(np.int8))
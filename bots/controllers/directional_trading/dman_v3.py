@@ -2,7 +2,7 @@ import time
 from decimal import Decimal
 from typing import List, Optional, Tuple
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
@@ -15,6 +15,11 @@ from hummingbot.strategy_v2.controllers.directional_trading_controller_base impo
 from hummingbot.strategy_v2.executors.dca_executor.data_types import DCAExecutorConfig, DCAMode
 from hummingbot.strategy_v2.executors.position_executor.data_types import TrailingStop
 
+from controllers.utils.dca_ladder import DCALadderCache, DCALadderTemplate
+from controllers.utils.feature_cache import FeatureCache
+from controllers.utils.features import FeaturesStore, ProcessedData
+from controllers.utils.indicators import CANDLE_COLUMNS, BollingerBands
+
 
 class DManV3ControllerConfig(DirectionalTradingControllerConfigBase):
     controller_name: str = "dman_v3"
@@ -124,18 +129,14 @@ class DManV3ControllerConfig(DirectionalTradingControllerConfigBase):
         return v
 
     def get_spreads_and_amounts_in_quote(self, trade_type: TradeType, total_amount_quote: Decimal) -> Tuple[List[Decimal], List[Decimal]]:
-        amounts_pct = self.dca_amounts_pct
-        if amounts_pct is None:
-            # Equally distribute if amounts_pct is not set
-            spreads = self.dca_spreads
-            normalized_amounts_pct = [Decimal('1.0') / len(spreads) for _ in spreads]
-        else:
-            if trade_type == TradeType.BUY:
-                normalized_amounts_pct = [amt_pct / sum(amounts_pct) for amt_pct in amounts_pct]
-            else:  # TradeType.SELL
-                normalized_amounts_pct = [amt_pct / sum(amounts_pct) for amt_pct in amounts_pct]
+        ladder = DCALadderTemplate.build(trade_type, self.dca_spreads, self.get_dca_amounts_pct())
+        return self.dca_spreads, ladder.get_amounts_quote(total_amount_quote)
 
-        return self.dca_spreads, [amt_pct * total_amount_quote for amt_pct in normalized_amounts_pct]
+    def get_dca_amounts_pct(self) -> List[Decimal]:
+        if self.dca_amounts_pct is None:
+            # Equally distribute if amounts_pct is not set
+            return [Decimal('1.0') / len(self.dca_spreads) for _ in self.dca_spreads]
+        return self.dca_amounts_pct
 
 
 class DManV3Controller(DirectionalTradingControllerBase):
@@ -153,44 +154,63 @@ class DManV3Controller(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.indicators = FeatureCache.get_instance().get_engine(
+            connector_name=config.candles_connector,
+            trading_pair=config.candles_trading_pair,
+            interval=config.interval,
+            indicators=[BollingerBands(length=config.bb_length, std=config.bb_std)],
+            owner=config.id,
+            history_size=self.max_records)
+        self._features_version = 0
         super().__init__(config, *args, **kwargs)
+        self.processed_data = ProcessedData()
+        self.ladders = DCALadderCache()
+
+    def on_stop(self):
+        FeatureCache.get_instance().release(self.config.id)
+        super().on_stop()
+
+    def get_features_columns(self) -> List[str]:
+        suffix = f"_{self.config.bb_length}_{self.config.bb_std}"
+        return CANDLE_COLUMNS + [f"BBL{suffix}", f"BBM{suffix}", f"BBU{suffix}", f"BBB{suffix}", f"BBP{suffix}"]
+
+    def get_signal(self, bbp):
+        short_condition = bbp > self.config.bb_short_threshold
+        long_condition = bbp < self.config.bb_long_threshold
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
 
     async def update_processed_data(self):
         df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
                                                       trading_pair=self.config.candles_trading_pair,
                                                       interval=self.config.interval,
                                                       max_records=self.max_records)
-        # Add indicators
-        df.ta.bbands(length=self.config.bb_length, std=self.config.bb_std, append=True)
-
-        # Generate signal
-        long_condition = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"] < self.config.bb_long_threshold
-        short_condition = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"] > self.config.bb_short_threshold
-
-        # Generate signal
-        df["signal"] = 0
-        df.loc[long_condition, "signal"] = 1
-        df.loc[short_condition, "signal"] = -1
+        # Advance the indicators with the new candles, the engine can be shared with other controllers
+        self.indicators.update(df)
+        if self.indicators.version == self._features_version:
+            return
+        self._features_version = self.indicators.version
+        columns = self.get_features_columns()
+        features = self.indicators.tail(max(self.max_records, len(df)), columns)
+        signal = self.get_signal(features[:, columns.index(f"BBP_{self.config.bb_length}_{self.config.bb_std}")])
 
         # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+        self.processed_data["signal"] = int(signal[-1])
+        self.processed_data["features"] = FeaturesStore.from_array(features, columns, signal=signal.astype(np.int8))
 
     def get_spread_multiplier(self) -> Decimal:
         if self.config.dynamic_order_spread:
-            df = self.processed_data["features"]
-            bb_width = df[f"BBB_{self.config.bb_length}_{self.config.bb_std}"].iloc[-1]
+            bb_width = self.indicators.get_latest(f"BBB_{self.config.bb_length}_{self.config.bb_std}")
             return Decimal(bb_width / 200)
         else:
             return Decimal("1.0")
 
     def get_executor_config(self, trade_type: TradeType, price: Decimal, amount: Decimal) -> DCAExecutorConfig:
-        spread, amounts_quote = self.config.get_spreads_and_amounts_in_quote(trade_type, amount * price)
-        spread_multiplier = self.get_spread_multiplier()
-        if trade_type == TradeType.BUY:
-            prices = [price * (1 - spread * spread_multiplier) for spread in spread]
-        else:
-            prices = [price * (1 + spread * spread_multiplier) for spread in spread]
+        # The ladder is built for the rounded multiplier, so the targets are scaled by the same value as the prices
+        spread_multiplier = self.ladders.get_bucket(self.get_spread_multiplier())
+        ladder = self.ladders.get(trade_type, self.config.dca_spreads, self.config.get_dca_amounts_pct(),
+                                  spread_multiplier)
+        prices = ladder.get_prices(price)
+        amounts_quote = ladder.get_amounts_quote(amount * price)
         if self.config.dynamic_target:
             stop_loss = self.config.stop_loss * spread_multiplier
             if self.config.trailing_stop:
@@ -1,6 +1,6 @@
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
@@ -10,6 +10,10 @@ from hummingbot.strategy_v2.controllers.directional_trading_controller_base impo
     DirectionalTradingControllerConfigBase,
 )
 
+from controllers.utils.feature_cache import FeatureCache
+from controllers.utils.features import FeaturesStore, ProcessedData
+from controllers.utils.indicators import CANDLE_COLUMNS, MACD, BollingerBands
+
 
 class MACDBBV1ControllerConfig(DirectionalTradingControllerConfigBase):
     controller_name: str = "macd_bb_v1"
@@ -72,29 +76,51 @@ class MACDBBV1Controller(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.indicators = FeatureCache.get_instance().get_engine(
+            connector_name=config.candles_connector,
+            trading_pair=config.candles_trading_pair,
+            interval=config.interval,
+            indicators=[BollingerBands(length=config.bb_length, std=config.bb_std),
+                        MACD(fast=config.macd_fast, slow=config.macd_slow, signal=config.macd_signal)],
+            owner=config.id,
+            history_size=self.max_records)
+        self._features_version = 0
         super().__init__(config, *args, **kwargs)
+        self.processed_data = ProcessedData()
 
-    async def update_processed_data(self):
-        df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
-                                                      trading_pair=self.config.candles_trading_pair,
-                                                      interval=self.config.interval,
-                                                      max_records=self.max_records)
-        # Add indicators
-        df.ta.bbands(length=self.config.bb_length, std=self.config.bb_std, append=True)
-        df.ta.macd(fast=self.config.macd_fast, slow=self.config.macd_slow, signal=self.config.macd_signal, append=True)
+    def on_stop(self):
+        FeatureCache.get_instance().release(self.config.id)
+        super().on_stop()
 
-        bbp = df[f"BBP_{self.config.bb_length}_{self.config.bb_std}"]
-        macdh = df[f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
-        macd = df[f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
+    def get_features_columns(self) -> List[str]:
+        bb_suffix = f"_{self.config.bb_length}_{self.config.bb_std}"
+        macd_suffix = f"_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"
+        return CANDLE_COLUMNS + [f"BBL{bb_suffix}", f"BBM{bb_suffix}", f"BBU{bb_suffix}", f"BBP{bb_suffix}",
+                                 f"MACD{macd_suffix}", f"MACDh{macd_suffix}", f"MACDs{macd_suffix}"]
 
-        # Generate signal
+    def get_signal(self, bbp, macdh, macd):
         long_condition = (bbp < self.config.bb_long_threshold) & (macdh > 0) & (macd < 0)
         short_condition = (bbp > self.config.bb_short_threshold) & (macdh < 0) & (macd > 0)
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
 
-        df["signal"] = 0
-        df.loc[long_condition, "signal"] = 1
-        df.loc[short_condition, "signal"] = -1
+    async def update_processed_data(self):
+        df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
+                                                      trading_pair=self.config.candles_trading_pair,
+                                                      interval=self.config.interval,
+                                                      max_records=self.max_records)
+        # Advance the indicators with the new candles, the engine can be shared with other controllers
+        self.indicators.update(df)
+        if self.indicators.version == self._features_version:
+            return
+        self._features_version = self.indicators.version
+        bbp_column = f"BBP_{self.config.bb_length}_{self.config.bb_std}"
+        macdh_column = f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"
+        macd_column = f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"
+        columns = self.get_features_columns()
+        features = self.indicators.tail(max(self.max_records, len(df)), columns)
+        signal = self.get_signal(features[:, columns.index(bbp_column)], features[:, columns.index(macdh_column)],
+                                 features[:, columns.index(macd_column)])
 
         # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+        self.processed_data["signal"] = int(signal[-1])
+        self.processed_data["features"] = FeaturesStore.from_array(features, columns, signal=signal.astype(np.int8))
@@ -1,6 +1,6 @@
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
+import numpy as np
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
@@ -10,6 +10,10 @@ from hummingbot.strategy_v2.controllers.directional_trading_controller_base impo
     DirectionalTradingControllerConfigBase,
 )
 
+from controllers.utils.feature_cache import FeatureCache
+from controllers.utils.features import FeaturesStore, ProcessedData
+from controllers.utils.indicators import CANDLE_COLUMNS, SuperTrend as SuperTrendIndicator
+
 
 class SuperTrendConfig(DirectionalTradingControllerConfigBase):
     controller_name: str = "supertrend_v1"
@@ -63,26 +67,50 @@ class SuperTrend(DirectionalTradingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.indicators = FeatureCache.get_instance().get_engine(
+            connector_name=config.candles_connector,
+            trading_pair=config.candles_trading_pair,
+            interval=config.interval,
+            indicators=[SuperTrendIndicator(length=config.length, multiplier=config.multiplier)],
+            owner=config.id,
+            history_size=self.max_records)
+        self._features_version = 0
         super().__init__(config, *args, **kwargs)
+        self.processed_data = ProcessedData()
+
+    def on_stop(self):
+        FeatureCache.get_instance().release(self.config.id)
+        super().on_stop()
+
+    def get_features_columns(self) -> List[str]:
+        suffix = f"_{self.config.length}_{self.config.multiplier}"
+        return CANDLE_COLUMNS + [f"SUPERT{suffix}", f"SUPERTd{suffix}"]
+
+    def get_signal(self, percentage_distance, supertrend_direction):
+        long_condition = (supertrend_direction == 1) & (percentage_distance < self.config.percentage_threshold)
+        short_condition = (supertrend_direction == -1) & (percentage_distance < self.config.percentage_threshold)
+        return np.where(short_condition, -1, np.where(long_condition, 1, 0))
 
     async def update_processed_data(self):
         df = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
                                                       trading_pair=self.config.candles_trading_pair,
                                                       interval=self.config.interval,
                                                       max_records=self.max_records)
-        # Add indicators
-        df.ta.supertrend(length=self.config.length, multiplier=self.config.multiplier, append=True)
-        df["percentage_distance"] = abs(df["close"] - df[f"SUPERT_{self.config.length}_{self.config.multiplier}"]) / df["close"]
-
-        # Generate long and short conditions
-        long_condition = (df[f"SUPERTd_{self.config.length}_{self.config.multiplier}"] == 1) & (df["percentage_distance"] < self.config.percentage_threshold)
-        short_condition = (df[f"SUPERTd_{self.config.length}_{self.config.multiplier}"] == -1) & (df["percentage_distance"] < self.config.percentage_threshold)
-
-        # Choose side
-        df['signal'] = 0
-        df.loc[long_condition, 'signal'] = 1
-        df.loc[short_condition, 'signal'] = -1
+        # Advance the indicators with the new candles, the engine can be shared with other controllers
+        self.indicators.update(df)
+        if self.indicators.version == self._features_version:
+            return
+        self._features_version = self.indicators.version
+        supertrend_column = f"SUPERT_{self.config.length}_{self.config.multiplier}"
+        direction_column = f"SUPERTd_{self.config.length}_{self.config.multiplier}"
+        columns = self.get_features_columns()
+        features = self.indicators.tail(max(self.max_records, len(df)), columns)
+        close = features[:, columns.index("close")]
+        percentage_distance = np.abs(close - features[:, columns.index(supertrend_column)]) / close
+        signal = self.get_signal(percentage_distance, features[:, columns.index(direction_column)])
 
         # Update processed data
-        self.processed_data["signal"] = df["signal"].iloc[-1]
-        self.processed_data["features"] = df
+        self.processed_data["signal"] = int(signal[-1])
+        self.processed_data["features"] = FeaturesStore.from_array(features, columns,
+                                                                   percentage_distance=percentage_distance,
+                                                                   signal=signal.astype(np.int8))
@@ -1,7 +1,8 @@
+import math
 from decimal import Decimal
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
 
-from pydantic import Field
+from pydantic import BaseModel, Field, field_validator
 
 from hummingbot.core.data_type.common import OrderType, PositionMode, PriceType, TradeType
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
@@ -9,13 +10,57 @@ from hummingbot.strategy_v2.controllers import ControllerBase, ControllerConfigB
 from hummingbot.strategy_v2.executors.data_types import ConnectorPair
 from hummingbot.strategy_v2.executors.grid_executor.data_types import GridExecutorConfig
 from hummingbot.strategy_v2.executors.position_executor.data_types import TripleBarrierConfig
-from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction
+from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction, StopExecutorAction
 from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
 
+from controllers.utils.feature_cache import FeatureCache
+from controllers.utils.indicators import IndicatorEngine, Volatility
+
+
+class GridSpec(BaseModel):
+    """
+    Trading pair, boundaries, side and amount of one of the grids run by a multi-grid GridStrike controller.
+    """
+    trading_pair: str
+    side: TradeType = TradeType.BUY
+    start_price: Decimal
+    end_price: Decimal
+    limit_price: Decimal
+    total_amount_quote: Decimal = Decimal("1000")
+    grid_id: Optional[str] = None
+
+    @property
+    def id(self) -> str:
+        return self.grid_id or f"{self.trading_pair}_{self.side.name}"
+
+    def is_inside_bounds(self, price: Decimal) -> bool:
+        return self.start_price <= price <= self.end_price
+
+    def recenter(self, mid_price: Decimal, half_width: Decimal) -> "GridSpec":
+        """
+        Grid with the same side and amount centered on the mid price, the limit price keeps its relative distance to
+        the closest boundary.
+        """
+        start_price = mid_price - half_width
+        end_price = mid_price + half_width
+        if self.side == TradeType.BUY:
+            limit_price = start_price * self.limit_price / self.start_price
+        else:
+            limit_price = end_price * self.limit_price / self.end_price
+        return self.model_copy(update={"start_price": start_price, "end_price": end_price, "limit_price": limit_price})
+
 
 class GridStrikeConfig(ControllerConfigBase):
     """
     Configuration required to run the GridStrike strategy for one connector and trading pair.
+    When grids is set, the controller runs one grid executor for each grid spec, all of them on the same connector and
+    with the execution and risk settings of this config, and the top level pair, boundaries, side and amount are not
+    used.
+    With recenter enabled, a grid whose mid price leaves its boundaries is moved to a range centered on the mid price.
+    The half width of the new range is recenter_volatility_multiplier times the rolling volatility of the
+    recenter_interval candles, and never less than the half width of the grid in the config, so the grid is widened
+    in volatile markets and contracts back to its configured width when the volatility falls. The position of the
+    grid is kept when it is moved, so the inventory is not closed at market.
     """
     controller_type: str = "generic"
     controller_name: str = "grid_strike"
@@ -45,6 +90,16 @@ class GridStrikeConfig(ControllerConfigBase):
     activation_bounds: Optional[Decimal] = Field(default=None, json_schema_extra={"is_updatable": True})
     keep_position: bool = Field(default=False, json_schema_extra={"is_updatable": True})
 
+    # Multi-grid
+    grids: List[GridSpec] = []
+
+    # Re-centering
+    recenter: bool = False
+    recenter_interval: str = "1m"
+    recenter_volatility_length: int = 100
+    recenter_volatility_multiplier: Decimal = Field(default=Decimal("3"), json_schema_extra={"is_updatable": True})
+    recenter_cooldown: int = Field(default=300, json_schema_extra={"is_updatable": True})
+
     # Risk Management
     triple_barrier_config: TripleBarrierConfig = TripleBarrierConfig(
         take_profit=Decimal("0.001"),
@@ -52,25 +107,135 @@ class GridStrikeConfig(ControllerConfigBase):
         take_profit_order_type=OrderType.LIMIT_MAKER,
     )
 
+    @field_validator("grids")
+    @classmethod
+    def validate_grid_ids(cls, grids: List[GridSpec]) -> List[GridSpec]:
+        # The executors are assigned to their grid by its id
+        grid_ids = [grid.id for grid in grids]
+        duplicated_ids = sorted({grid_id for grid_id in grid_ids if grid_ids.count(grid_id) > 1})
+        if duplicated_ids:
+            raise ValueError(f"The grid ids {duplicated_ids} are duplicated, set a different grid_id for each grid.")
+        return grids
+
+    def get_grids(self) -> List[GridSpec]:
+        if self.grids:
+            return self.grids
+        return [GridSpec(trading_pair=self.trading_pair, side=self.side, start_price=self.start_price,
+                         end_price=self.end_price, limit_price=self.limit_price,
+                         total_amount_quote=self.total_amount_quote)]
+
     def update_markets(self, markets: Dict[str, Set[str]]) -> Dict[str, Set[str]]:
         if self.connector_name not in markets:
             markets[self.connector_name] = set()
-        markets[self.connector_name].add(self.trading_pair)
+        for grid in self.get_grids():
+            markets[self.connector_name].add(grid.trading_pair)
         return markets
 
 
+GRID_LEVEL_STATES = ("NOT_ACTIVE", "OPEN_ORDER_PLACED", "OPEN_ORDER_FILLED", "CLOSE_ORDER_PLACED", "COMPLETE")
+
+
+class GridExecutorStats(NamedTuple):
+    """
+    Snapshot of the counters of a grid executor, used to render the status.
+    """
+    levels_by_state: Tuple[int, ...]
+    filled_orders: int
+    failed_orders: int
+    canceled_orders: int
+    realized_buy_size_quote: Decimal
+    realized_sell_size_quote: Decimal
+    realized_pnl_quote: Decimal
+    realized_fees_quote: Decimal
+    position_pnl_quote: Decimal
+    position_size_quote: Decimal
+    open_liquidity_placed: Decimal
+    close_liquidity_placed: Decimal
+
+    @property
+    def total_orders(self) -> int:
+        return self.filled_orders + self.failed_orders + self.canceled_orders
+
+
+class GridExecutorCounters:
+    """
+    Running order counters of a grid executor, kept while the executor is active. The order lists of the custom info
+    only grow, so the counters only move by the orders appended since the last update. The PnL, position, liquidity and
+    level fields change with the price and are read from the custom info on every update.
+    """
+    __slots__ = ("filled_orders", "failed_orders", "canceled_orders")
+
+    def __init__(self):
+        self.filled_orders = 0
+        self.failed_orders = 0
+        self.canceled_orders = 0
+
+    def update(self, custom_info: Dict) -> GridExecutorStats:
+        self.filled_orders = len(custom_info["filled_orders"])
+        self.failed_orders = len(custom_info["failed_orders"])
+        self.canceled_orders = len(custom_info["canceled_orders"])
+        levels_by_state = custom_info["levels_by_state"]
+        return GridExecutorStats(
+            levels_by_state=tuple(len(levels_by_state.get(state, [])) for state in GRID_LEVEL_STATES),
+            filled_orders=self.filled_orders,
+            failed_orders=self.failed_orders,
+            canceled_orders=self.canceled_orders,
+            realized_buy_size_quote=custom_info["realized_buy_size_quote"],
+            realized_sell_size_quote=custom_info["realized_sell_size_quote"],
+            realized_pnl_quote=custom_info["realized_pnl_quote"],
+            realized_fees_quote=custom_info["realized_fees_quote"],
+            position_pnl_quote=custom_info["position_pnl_quote"],
+            position_size_quote=custom_info["position_size_quote"],
+            open_liquidity_placed=custom_info["open_liquidity_placed"],
+            close_liquidity_placed=custom_info["close_liquidity_placed"],
+        )
+
+
 class GridStrike(ControllerBase):
+    # Define standard box width for consistency
+    box_width = 114
+
     def __init__(self, config: GridStrikeConfig, *args, **kwargs):
+        self.volatility_engines: Dict[str, IndicatorEngine] = {}
+        # Candles feeds of the volatility, kept by the controller so the candles_config of the user is not modified
+        self.volatility_candles_config: List[CandlesConfig] = []
+        if config.recenter:
+            trading_pairs = {grid.trading_pair for grid in config.get_grids()}
+            self.volatility_candles_config = [CandlesConfig(connector=config.connector_name, trading_pair=trading_pair,
+                                                            interval=config.recenter_interval,
+                                                            max_records=config.recenter_volatility_length + 2)
+                                              for trading_pair in trading_pairs]
+            self.volatility_engines = {trading_pair: FeatureCache.get_instance().get_engine(
+                connector_name=config.connector_name,
+                trading_pair=trading_pair,
+                interval=config.recenter_interval,
+                indicators=[Volatility(length=config.recenter_volatility_length)],
+                owner=config.id,
+                history_size=1) for trading_pair in trading_pairs}
         super().__init__(config, *args, **kwargs)
         self.config = config
-        self._last_grid_levels_update = 0
-        self.trading_rules = None
-        self.grid_levels = []
+        # Grids moved by the re-centering, with the spec of the config they were created from
+        self.recentered_grids: Dict[str, Tuple[GridSpec, GridSpec]] = {}
+        self._last_recenter_timestamp: Dict[str, float] = {}
+        self.mid_prices: Dict[str, Decimal] = {}
+        self.grid_counters: Dict[str, GridExecutorCounters] = {}
+        self._executor_status_lines: Dict[str, Tuple[GridExecutorStats, List[str]]] = {}
         self.initialize_rate_sources()
 
+    def initialize_candles(self):
+        super().initialize_candles()
+        for candles_config in self.volatility_candles_config:
+            self.market_data_provider.initialize_candles_feed(candles_config)
+
+    def on_stop(self):
+        FeatureCache.get_instance().release(self.config.id)
+        super().on_stop()
+
     def initialize_rate_sources(self):
+        trading_pairs = {grid.trading_pair for grid in self.config.get_grids()}
         self.market_data_provider.initialize_rate_sources([ConnectorPair(connector_name=self.config.connector_name,
-                                                                         trading_pair=self.config.trading_pair)])
+                                                                         trading_pair=trading_pair)
+                                                           for trading_pair in trading_pairs])
 
     def active_executors(self) -> List[ExecutorInfo]:
         return [
@@ -78,122 +243,227 @@ class GridStrike(ControllerBase):
             if executor.is_active
         ]
 
-    def is_inside_bounds(self, price: Decimal) -> bool:
-        return self.config.start_price <= price <= self.config.end_price
+    def get_grids(self) -> List[GridSpec]:
+        """
+        Grids of the config, replaced by their re-centered version while the spec in the config doesn't change.
+        """
+        grids = []
+        for grid in self.config.get_grids():
+            config_grid, recentered_grid = self.recentered_grids.get(grid.id, (None, None))
+            grids.append(recentered_grid if config_grid == grid else grid)
+        return grids
+
+    def active_executors_by_grid(self) -> Dict[str, List[ExecutorInfo]]:
+        """
+        Active executors grouped by the id of their grid, stored in the level id of the executor config. The executors
+        created by the single grid mode have no level id and belong to the only grid.
+        """
+        grids = self.config.get_grids()
+        executors_by_grid = {grid.id: [] for grid in grids}
+        for executor in self.active_executors():
+            grid_id = executor.config.level_id or grids[0].id
+            executors_by_grid.setdefault(grid_id, []).append(executor)
+        return executors_by_grid
+
+    def update_mid_prices(self):
+        """
+        Read the mid price of every trading pair once per tick, the snapshot is shared by all the grids.
+        """
+        trading_pairs = {grid.trading_pair for grid in self.config.get_grids()}
+        self.mid_prices = {trading_pair: self.market_data_provider.get_price_by_type(
+            self.config.connector_name, trading_pair, PriceType.MidPrice) for trading_pair in trading_pairs}
+
+    def get_mid_price(self, trading_pair: str) -> Decimal:
+        if trading_pair not in self.mid_prices:
+            self.update_mid_prices()
+        return self.mid_prices[trading_pair]
+
+    def get_volatility(self, trading_pair: str) -> Optional[Decimal]:
+        engine = self.volatility_engines.get(trading_pair)
+        volatility = engine.get_latest(f"VOLATILITY_{self.config.recenter_volatility_length}") if engine else None
+        if volatility is None or math.isnan(volatility):
+            return None
+        return Decimal(str(volatility))
 
     def determine_executor_actions(self) -> List[ExecutorAction]:
-        mid_price = self.market_data_provider.get_price_by_type(
-            self.config.connector_name, self.config.trading_pair, PriceType.MidPrice)
-        if len(self.active_executors()) == 0 and self.is_inside_bounds(mid_price):
-            return [CreateExecutorAction(
-                controller_id=self.config.id,
-                executor_config=GridExecutorConfig(
-                    timestamp=self.market_data_provider.time(),
-                    connector_name=self.config.connector_name,
-                    trading_pair=self.config.trading_pair,
-                    start_price=self.config.start_price,
-                    end_price=self.config.end_price,
-                    leverage=self.config.leverage,
-                    limit_price=self.config.limit_price,
-                    side=self.config.side,
-                    total_amount_quote=self.config.total_amount_quote,
-                    min_spread_between_orders=self.config.min_spread_between_orders,
-                    min_order_amount_quote=self.config.min_order_amount_quote,
-                    max_open_orders=self.config.max_open_orders,
-                    max_orders_per_batch=self.config.max_orders_per_batch,
-                    order_frequency=self.config.order_frequency,
-                    activation_bounds=self.config.activation_bounds,
-                    triple_barrier_config=self.config.triple_barrier_config,
-                    level_id=None,
-                    keep_position=self.config.keep_position,
-                ))]
-        return []
+        actions = []
+        active_executors_by_grid = self.active_executors_by_grid()
+        for grid in self.get_grids():
+            active_executors = active_executors_by_grid.get(grid.id, [])
+            mid_price = self.get_mid_price(grid.trading_pair)
+            if grid.is_inside_bounds(mid_price):
+                if not active_executors:
+                    actions.append(CreateExecutorAction(controller_id=self.config.id,
+                                                        executor_config=self.get_executor_config(grid)))
+            elif self.config.recenter:
+                actions.extend(self.recenter_grid(grid, mid_price, active_executors))
+        return actions
+
+    def recenter_grid(self, grid: GridSpec, mid_price: Decimal,
+                      active_executors: List[ExecutorInfo]) -> List[ExecutorAction]:
+        """
+        Move the grid around the mid price. The active executor of the grid is stopped keeping its position, which
+        cancels all its open orders at once without closing the inventory, and the executor of the new range is created
+        in the same batch of actions.
+        """
+        now = self.market_data_provider.time()
+        volatility = self.get_volatility(grid.trading_pair)
+        if volatility is None or now - self._last_recenter_timestamp.get(grid.id, 0) < self.config.recenter_cooldown:
+            return []
+        config_grid = next(config_grid for config_grid in self.config.get_grids() if config_grid.id == grid.id)
+        half_width = max((config_grid.end_price - config_grid.start_price) / 2,
+                         self.config.recenter_volatility_multiplier * volatility * mid_price)
+        recentered_grid = grid.recenter(mid_price, half_width)
+        self.recentered_grids[grid.id] = (config_grid, recentered_grid)
+        self._last_recenter_timestamp[grid.id] = now
+        self.logger().info(f"Re-centering grid {grid.id}: {grid.start_price:.6f}-{grid.end_price:.6f} -> "
+                           f"{recentered_grid.start_price:.6f}-{recentered_grid.end_price:.6f}")
+        actions = [StopExecutorAction(controller_id=self.config.id, executor_id=executor.id, keep_position=True)
+                   for executor in active_executors]
+        actions.append(CreateExecutorAction(controller_id=self.config.id,
+                                            executor_config=self.get_executor_config(recentered_grid)))
+        return actions
+
+    def get_executor_config(self, grid: GridSpec) -> GridExecutorConfig:
+        return GridExecutorConfig(
+            timestamp=self.market_data_provider.time(),
+            connector_name=self.config.connector_name,
+            trading_pair=grid.trading_pair,
+            start_price=grid.start_price,
+            end_price=grid.end_price,
+            leverage=self.config.leverage,
+            limit_price=grid.limit_price,
+            side=grid.side,
+            total_amount_quote=grid.total_amount_quote,
+            min_spread_between_orders=self.config.min_spread_between_orders,
+            min_order_amount_quote=self.config.min_order_amount_quote,
+            max_open_orders=self.config.max_open_orders,
+            max_orders_per_batch=self.config.max_orders_per_batch,
+            order_frequency=self.config.order_frequency,
+            activation_bounds=self.config.activation_bounds,
+            triple_barrier_config=self.config.triple_barrier_config,
+            level_id=grid.id if self.config.grids else None,
+            keep_position=self.config.keep_position,
+        )
 
     async def update_processed_data(self):
-        pass
+        self.update_mid_prices()
+        self.update_volatility()
+
+    def update_volatility(self):
+        for trading_pair, engine in self.volatility_engines.items():
+            engine.update(self.market_data_provider.get_candles_df(connector_name=self.config.connector_name,
+                                                                   trading_pair=trading_pair,
+                                                                   interval=self.config.recenter_interval,
+                                                                   max_records=self.config.recenter_volatility_length + 2))
+
+    def drop_inactive_counters(self, active_executor_ids: Set[str]):
+        """
+        Forget the counters and status lines of the executors that stopped being active.
+        """
+        for executor_id in set(self.grid_counters) - active_executor_ids:
+            del self.grid_counters[executor_id]
+            self._executor_status_lines.pop(executor_id, None)
 
     def to_format_status(self) -> List[str]:
         status = []
-        mid_price = self.market_data_provider.get_price_by_type(
-            self.config.connector_name, self.config.trading_pair, PriceType.MidPrice)
-        # Define standard box width for consistency
-        box_width = 114
+        active_executors_by_grid = self.active_executors_by_grid()
+        self.drop_inactive_counters({executor.id for executors in active_executors_by_grid.values()
+                                     for executor in executors})
+        for grid in self.get_grids():
+            status.extend(self.format_grid_status(grid))
+            for executor in active_executors_by_grid.get(grid.id, []):
+                counters = self.grid_counters.setdefault(executor.id, GridExecutorCounters())
+                status.extend(self.get_executor_status_lines(executor.id, counters.update(executor.custom_info)))
+        return status
+
+    def format_grid_status(self, grid: GridSpec) -> List[str]:
+        status = []
+        mid_price = self.get_mid_price(grid.trading_pair)
+        box_width = self.box_width
         # Top Grid Configuration box with simple borders
         status.append("┌" + "─" * box_width + "┐")
         # First line: Grid Configuration and Mid Price
-        left_section = "Grid Configuration:"
+        left_section = f"Grid Configuration: {grid.id}" if self.config.grids else "Grid Configuration:"
         padding = box_width - len(left_section) - 4  # -4 for the border characters and spacing
         config_line1 = f"│ {left_section}{' ' * padding}"
         padding2 = box_width - len(config_line1) + 1  # +1 for correct right border alignment
         config_line1 += " " * padding2 + "│"
         status.append(config_line1)
         # Second line: Configuration parameters
-        config_line2 = f"│ Start: {self.config.start_price:.4f} │ End: {self.config.end_price:.4f} │ Side: {self.config.side} │ Limit: {self.config.limit_price:.4f} │ Mid Price: {mid_price:.4f} │"
+        config_line2 = f"│ Start: {grid.start_price:.4f} │ End: {grid.end_price:.4f} │ Side: {grid.side} │ Limit: {grid.limit_price:.4f} │ Mid Price: {mid_price:.4f} │"
         padding = box_width - len(config_line2) + 1  # +1 for correct right border alignment
         config_line2 += " " * padding + "│"
         status.append(config_line2)
         # Third line: Max orders and Inside bounds
-        config_line3 = f"│ Max Orders: {self.config.max_open_orders}   │ Inside bounds: {1 if self.is_inside_bounds(mid_price) else 0}"
+        config_line3 = f"│ Max Orders: {self.config.max_open_orders}   │ Inside bounds: {1 if grid.is_inside_bounds(mid_price) else 0}"
         padding = box_width - len(config_line3) + 1  # +1 for correct right border alignment
         config_line3 += " " * padding + "│"
         status.append(config_line3)
         status.append("└" + "─" * box_width + "┘")
-        for level in self.active_executors():
-            # Define column widths for perfect alignment
-            col_width = box_width // 3  # Dividing the total width by 3 for equal columns
-            total_width = box_width
-            # Grid Status header - use long line and running status
-            status_header = f"Grid Status: {level.id} (RunnableStatus.RUNNING)"
-            status_line = f"┌ {status_header}" + "─" * (total_width - len(status_header) - 2) + "┐"
-            status.append(status_line)
-            # Calculate exact column widths for perfect alignment
-            col1_end = col_width
-            # Column headers
-            header_line = "│ Level Distribution" + " " * (col1_end - 20) + "│"
-            header_line += " Order Statistics" + " " * (col_width - 18) + "│"
-            header_line += " Performance Metrics" + " " * (col_width - 21) + "│"
-            status.append(header_line)
-            # Data for the three columns
-            level_dist_data = [
-                f"NOT_ACTIVE: {len(level.custom_info['levels_by_state'].get('NOT_ACTIVE', []))}",
-                f"OPEN_ORDER_PLACED: {len(level.custom_info['levels_by_state'].get('OPEN_ORDER_PLACED', []))}",
-                f"OPEN_ORDER_FILLED: {len(level.custom_info['levels_by_state'].get('OPEN_ORDER_FILLED', []))}",
-                f"CLOSE_ORDER_PLACED: {len(level.custom_info['levels_by_state'].get('CLOSE_ORDER_PLACED', []))}",
-                f"COMPLETE: {len(level.custom_info['levels_by_state'].get('COMPLETE', []))}"
-            ]
-            order_stats_data = [
-                f"Total: {sum(len(level.custom_info[k]) for k in ['filled_orders', 'failed_orders', 'canceled_orders'])}",
-                f"Filled: {len(level.custom_info['filled_orders'])}",
-                f"Failed: {len(level.custom_info['failed_orders'])}",
-                f"Canceled: {len(level.custom_info['canceled_orders'])}"
-            ]
-            perf_metrics_data = [
-                f"Buy Vol: {level.custom_info['realized_buy_size_quote']:.4f}",
-                f"Sell Vol: {level.custom_info['realized_sell_size_quote']:.4f}",
-                f"R. PnL: {level.custom_info['realized_pnl_quote']:.4f}",
-                f"R. Fees: {level.custom_info['realized_fees_quote']:.4f}",
-                f"P. PnL: {level.custom_info['position_pnl_quote']:.4f}",
-                f"Position: {level.custom_info['position_size_quote']:.4f}"
-            ]
-            # Build rows with perfect alignment
-            max_rows = max(len(level_dist_data), len(order_stats_data), len(perf_metrics_data))
-            for i in range(max_rows):
-                col1 = level_dist_data[i] if i < len(level_dist_data) else ""
-                col2 = order_stats_data[i] if i < len(order_stats_data) else ""
-                col3 = perf_metrics_data[i] if i < len(perf_metrics_data) else ""
-                row = "│ " + col1
-                row += " " * (col1_end - len(col1) - 2)  # -2 for the "│ " at the start
-                row += "│ " + col2
-                row += " " * (col_width - len(col2) - 2)  # -2 for the "│ " before col2
-                row += "│ " + col3
-                row += " " * (col_width - len(col3) - 2)  # -2 for the "│ " before col3
-                row += "│"
-                status.append(row)
-            # Liquidity line with perfect alignment
-            status.append("├" + "─" * total_width + "┤")
-            liquidity_line = f"│ Open Liquidity: {level.custom_info['open_liquidity_placed']:.4f} │ Close Liquidity: {level.custom_info['close_liquidity_placed']:.4f} │"
-            liquidity_line += " " * (total_width - len(liquidity_line) + 1)  # +1 for correct right border alignment
-            liquidity_line += "│"
-            status.append(liquidity_line)
-            status.append("└" + "─" * total_width + "┘")
+        return status
+
+    def get_executor_status_lines(self, executor_id: str, stats: GridExecutorStats) -> List[str]:
+        """
+        Status box of a grid executor, rendered again only when its counters change.
+        """
+        cached_stats, lines = self._executor_status_lines.get(executor_id, (None, []))
+        if cached_stats != stats:
+            lines = self.format_executor_status(executor_id, stats)
+            self._executor_status_lines[executor_id] = (stats, lines)
+        return lines
+
+    def format_executor_status(self, executor_id: str, stats: GridExecutorStats) -> List[str]:
+        status = []
+        # Define column widths for perfect alignment
+        col_width = self.box_width // 3  # Dividing the total width by 3 for equal columns
+        total_width = self.box_width
+        # Grid Status header - use long line and running status
+        status_header = f"Grid Status: {executor_id} (RunnableStatus.RUNNING)"
+        status_line = f"┌ {status_header}" + "─" * (total_width - len(status_header) - 2) + "┐"
+        status.append(status_line)
+        # Calculate exact column widths for perfect alignment
+        col1_end = col_width
+        # Column headers
+        header_line = "│ Level Distribution" + " " * (col1_end - 20) + "│"
+        header_line += " Order Statistics" + " " * (col_width - 18) + "│"
+        header_line += " Performance Metrics" + " " * (col_width - 21) + "│"
+        status.append(header_line)
+        # Data for the three columns
+        level_dist_data = [f"{state}: {count}" for state, count in zip(GRID_LEVEL_STATES, stats.levels_by_state)]
+        order_stats_data = [
+            f"Total: {stats.total_orders}",
+            f"Filled: {stats.filled_orders}",
+            f"Failed: {stats.failed_orders}",
+            f"Canceled: {stats.canceled_orders}"
+        ]
+        perf_metrics_data = [
+            f"Buy Vol: {stats.realized_buy_size_quote:.4f}",
+            f"Sell Vol: {stats.realized_sell_size_quote:.4f}",
+            f"R. PnL: {stats.realized_pnl_quote:.4f}",
+            f"R. Fees: {stats.realized_fees_quote:.4f}",
+            f"P. PnL: {stats.position_pnl_quote:.4f}",
+            f"Position: {stats.position_size_quote:.4f}"
+        ]
+        # Build rows with perfect alignment
+        max_rows = max(len(level_dist_data), len(order_stats_data), len(perf_metrics_data))
+        for i in range(max_rows):
+            col1 = level_dist_data[i] if i < len(level_dist_data) else ""
+            col2 = order_stats_data[i] if i < len(order_stats_data) else ""
+            col3 = perf_metrics_data[i] if i < len(perf_metrics_data) else ""
+            row = "│ " + col1
+            row += " " * (col1_end - len(col1) - 2)  # -2 for the "│ " at the start
+            row += "│ " + col2
+            row += " " * (col_width - len(col2) - 2)  # -2 for the "│ " before col2
+            row += "│ " + col3
+            row += " " * (col_width - len(col3) - 2)  # -2 for the "│ " before col3
+            row += "│"
+            status.append(row)
+        # Liquidity line with perfect alignment
+        status.append("├" + "─" * total_width + "┤")
+        liquidity_line = f"│ Open Liquidity: {stats.open_liquidity_placed:.4f} │ Close Liquidity: {stats.close_liquidity_placed:.4f} │"
+        liquidity_line += " " * (total_width - len(liquidity_line) + 1)  # +1 for correct right border alignment
+        liquidity_line += "│"
+        status.append(liquidity_line)
+        status.append("└" + "─" * total_width + "┘")
         return status
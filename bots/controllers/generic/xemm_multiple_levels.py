@@ -1,6 +1,6 @@
 import time
 from decimal import Decimal
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, Set, Tuple
 
 import pandas as pd
 from pydantic import Field, field_validator
@@ -12,6 +12,7 @@ from hummingbot.strategy_v2.controllers.controller_base import ControllerBase, C
 from hummingbot.strategy_v2.executors.data_types import ConnectorPair
 from hummingbot.strategy_v2.executors.xemm_executor.data_types import XEMMExecutorConfig
 from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, ExecutorAction
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
 
 
 class XEMMMultipleLevelsConfig(ControllerConfigBase):
@@ -66,41 +67,93 @@ class XEMMMultipleLevelsConfig(ControllerConfigBase):
         return markets
 
 
+class XEMMLevelTable:
+    """
+    Active executors by level, keyed by (maker side, target profitability), and count of the stopped executors with
+    fills by maker side. The table is updated with the lifecycle transitions of the executors (created, done), so the
+    executors already done are skipped and the levels are checked in constant time. update only needs the executors
+    created or changed since the previous update, sync rescans the full executors info for the strategies that don't
+    track the changes.
+    """
+
+    def __init__(self):
+        self.active_by_level: Dict[Tuple[TradeType, Decimal], int] = {}
+        self.stopped_by_side: Dict[TradeType, int] = {TradeType.BUY: 0, TradeType.SELL: 0}
+        self._active_levels: Dict[str, Tuple[TradeType, Decimal]] = {}
+        self._done_executors: Set[str] = set()
+
+    @property
+    def imbalance(self) -> int:
+        return self.stopped_by_side[TradeType.BUY] - self.stopped_by_side[TradeType.SELL]
+
+    def get_active_executors(self, side: TradeType, target_profitability: Decimal) -> int:
+        return self.active_by_level.get((side, target_profitability), 0)
+
+    def update(self, changed_executors: Iterable[ExecutorInfo]):
+        for executor in changed_executors:
+            if executor.id in self._done_executors:
+                continue
+            if executor.is_done:
+                self._on_executor_done(executor)
+            elif executor.id not in self._active_levels:
+                self._on_executor_created(executor)
+
+    def remove(self, executor_ids: Iterable[str]):
+        for executor_id in executor_ids:
+            self._release_level(executor_id)
+
+    def sync(self, executors_info: List[ExecutorInfo]):
+        self.update(executors_info)
+        # Executors that left the list while active are no longer tracked by the orchestrator
+        self.remove(set(self._active_levels) - {executor.id for executor in executors_info})
+
+    def _on_executor_created(self, executor: ExecutorInfo):
+        level = (executor.config.maker_side, executor.config.target_profitability)
+        self._active_levels[executor.id] = level
+        self.active_by_level[level] = self.active_by_level.get(level, 0) + 1
+
+    def _on_executor_done(self, executor: ExecutorInfo):
+        self._release_level(executor.id)
+        self._done_executors.add(executor.id)
+        if executor.filled_amount_quote != 0:
+            self.stopped_by_side[executor.config.maker_side] += 1
+
+    def _release_level(self, executor_id: str):
+        level = self._active_levels.pop(executor_id, None)
+        if level is not None:
+            self.active_by_level[level] -= 1
+
+
 class XEMMMultipleLevels(ControllerBase):
 
     def __init__(self, config: XEMMMultipleLevelsConfig, *args, **kwargs):
         self.config = config
         self.buy_levels_targets_amount = config.buy_levels_targets_amount
         self.sell_levels_targets_amount = config.sell_levels_targets_amount
+        self.level_table = XEMMLevelTable()
+        self._executors_updates_received = False
         super().__init__(config, *args, **kwargs)
 
+    def on_executors_update(self, changed_executors: List[ExecutorInfo], removed_executor_ids: List[str]):
+        """
+        Called by the strategies that track the executors changes with the executors of the controller created or
+        changed since the previous call and the ids of the executors that are no longer reported.
+        """
+        self._executors_updates_received = True
+        self.level_table.update(changed_executors)
+        self.level_table.remove(removed_executor_ids)
+
     async def update_processed_data(self):
-        pass
+        if not self._executors_updates_received:
+            self.level_table.sync(self.executors_info)
 
     def determine_executor_actions(self) -> List[ExecutorAction]:
         executor_actions = []
         mid_price = self.market_data_provider.get_price_by_type(self.config.maker_connector, self.config.maker_trading_pair, PriceType.MidPrice)
-        active_buy_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: not e.is_done and e.config.maker_side == TradeType.BUY
-        )
-        active_sell_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: not e.is_done and e.config.maker_side == TradeType.SELL
-        )
-        stopped_buy_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: e.is_done and e.config.maker_side == TradeType.BUY and e.filled_amount_quote != 0
-        )
-        stopped_sell_executors = self.filter_executors(
-            executors=self.executors_info,
-            filter_func=lambda e: e.is_done and e.config.maker_side == TradeType.SELL and e.filled_amount_quote != 0
-        )
-        imbalance = len(stopped_buy_executors) - len(stopped_sell_executors)
+        imbalance = self.level_table.imbalance
         for target_profitability, amount in self.buy_levels_targets_amount:
-            active_buy_executors_target = [e.config.target_profitability == target_profitability for e in active_buy_executors]
-
-            if len(active_buy_executors_target) == 0 and imbalance < self.config.max_executors_imbalance:
+            active_buy_executors_target = self.level_table.get_active_executors(TradeType.BUY, target_profitability)
+            if active_buy_executors_target == 0 and imbalance < self.config.max_executors_imbalance:
                 min_profitability = target_profitability - self.config.min_profitability
                 max_profitability = target_profitability + self.config.max_profitability
                 config = XEMMExecutorConfig(
@@ -118,8 +171,8 @@ class XEMMMultipleLevels(ControllerBase):
                 )
                 executor_actions.append(CreateExecutorAction(executor_config=config, controller_id=self.config.id))
         for target_profitability, amount in self.sell_levels_targets_amount:
-            active_sell_executors_target = [e.config.target_profitability == target_profitability for e in active_sell_executors]
-            if len(active_sell_executors_target) == 0 and imbalance > -self.config.max_executors_imbalance:
+            active_sell_executors_target = self.level_table.get_active_executors(TradeType.SELL, target_profitability)
+            if active_sell_executors_target == 0 and imbalance > -self.config.max_executors_imbalance:
                 min_profitability = target_profitability - self.config.min_profitability
                 max_profitability = target_profitability + self.config.max_profitability
                 config = XEMMExecutorConfig(
@@ -139,5 +192,5 @@ class XEMMMultipleLevels(ControllerBase):
         return executor_actions
 
     def to_format_status(self) -> List[str]:
-        all_executors_custom_info = pd.DataFrame(e.custom_info for e in self.executors_info)
-        return [format_df_for_printout(all_executors_custom_info, table_format="psql", )]
+        active_executors_custom_info = pd.DataFrame(e.custom_info for e in self.executors_info if e.is_active)
+        return [format_df_for_printout(active_executors_custom_info, table_format="psql", )]
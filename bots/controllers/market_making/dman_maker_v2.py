@@ -4,7 +4,6 @@ from typing import List, Optional
 import pandas_ta as ta  # noqa: F401
 from pydantic import Field, field_validator
 
-from hummingbot.core.data_type.common import TradeType
 from hummingbot.data_feed.candles_feed.data_types import CandlesConfig
 from hummingbot.strategy_v2.controllers.market_making_controller_base import (
     MarketMakingControllerBase,
@@ -13,6 +12,8 @@ from hummingbot.strategy_v2.controllers.market_making_controller_base import (
 from hummingbot.strategy_v2.executors.dca_executor.data_types import DCAExecutorConfig, DCAMode
 from hummingbot.strategy_v2.models.executor_actions import ExecutorAction, StopExecutorAction
 
+from controllers.utils.dca_ladder import DCALadderCache
+
 
 class DManMakerV2Config(MarketMakingControllerConfigBase):
     """
@@ -70,8 +71,8 @@ class DManMakerV2(MarketMakingControllerBase):
     def __init__(self, config: DManMakerV2Config, *args, **kwargs):
         super().__init__(config, *args, **kwargs)
         self.config = config
-        self.dca_amounts_pct = [Decimal(amount) / sum(self.config.dca_amounts) for amount in self.config.dca_amounts]
         self.spreads = self.config.dca_spreads
+        self.ladders = DCALadderCache()
 
     def first_level_refresh_condition(self, executor):
         if self.config.top_executor_refresh_time is not None:
@@ -92,12 +93,9 @@ class DManMakerV2(MarketMakingControllerBase):
 
     def get_executor_config(self, level_id: str, price: Decimal, amount: Decimal):
         trade_type = self.get_trade_type_from_level_id(level_id)
-        if trade_type == TradeType.BUY:
-            prices = [price * (1 - spread) for spread in self.spreads]
-        else:
-            prices = [price * (1 + spread) for spread in self.spreads]
-        amounts = [amount * pct for pct in self.dca_amounts_pct]
-        amounts_quote = [amount * price for amount, price in zip(amounts, prices)]
+        ladder = self.ladders.get(trade_type, self.spreads, self.config.dca_amounts)
+        prices = ladder.get_prices(price)
+        amounts_quote = ladder.get_amounts_quote_from_base(amount, price)
         return DCAExecutorConfig(
             timestamp=self.market_data_provider.time(),
             connector_name=self.config.connector_name,
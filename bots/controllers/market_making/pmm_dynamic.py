@@ -1,7 +1,6 @@
 from decimal import Decimal
 from typing import List
 
-import pandas_ta as ta  # noqa: F401
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
@@ -12,6 +11,11 @@ from hummingbot.strategy_v2.controllers.market_making_controller_base import (
 )
 from hummingbot.strategy_v2.executors.position_executor.data_types import PositionExecutorConfig
 
+from controllers.utils.feature_cache import FeatureCache
+from controllers.utils.features import FeaturesStore, ProcessedData
+from controllers.utils.indicators import ATR, CANDLE_COLUMNS, MACD
+from controllers.utils.pmm_dynamic import get_multipliers
+
 
 class PMMDynamicControllerConfig(MarketMakingControllerConfigBase):
     controller_name: str = "pmm_dynamic"
@@ -86,29 +90,50 @@ class PMMDynamicController(MarketMakingControllerBase):
                 interval=config.interval,
                 max_records=self.max_records
             )]
+        self.indicators = FeatureCache.get_instance().get_engine(
+            connector_name=config.candles_connector,
+            trading_pair=config.candles_trading_pair,
+            interval=config.interval,
+            indicators=[ATR(length=config.natr_length),
+                        MACD(fast=config.macd_fast, slow=config.macd_slow, signal=config.macd_signal)],
+            owner=config.id,
+            history_size=self.max_records)
+        self._features_version = 0
         super().__init__(config, *args, **kwargs)
+        self.processed_data = ProcessedData()
+
+    def on_stop(self):
+        FeatureCache.get_instance().release(self.config.id)
+        super().on_stop()
+
+    def get_features_columns(self) -> List[str]:
+        macd_suffix = f"_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"
+        return CANDLE_COLUMNS + [f"NATR_{self.config.natr_length}", f"MACD{macd_suffix}", f"MACDh{macd_suffix}"]
 
     async def update_processed_data(self):
         candles = self.market_data_provider.get_candles_df(connector_name=self.config.candles_connector,
                                                            trading_pair=self.config.candles_trading_pair,
                                                            interval=self.config.interval,
                                                            max_records=self.max_records)
-        natr = ta.natr(candles["high"], candles["low"], candles["close"], length=self.config.natr_length) / 100
-        macd_output = ta.macd(candles["close"], fast=self.config.macd_fast,
-                              slow=self.config.macd_slow, signal=self.config.macd_signal)
-        macd = macd_output[f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
-        macd_signal = - (macd - macd.mean()) / macd.std()
-        macdh = macd_output[f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}"]
-        macdh_signal = macdh.apply(lambda x: 1 if x > 0 else -1)
-        max_price_shift = natr / 2
-        price_multiplier = ((0.5 * macd_signal + 0.5 * macdh_signal) * max_price_shift).iloc[-1]
-        candles["spread_multiplier"] = natr
-        candles["reference_price"] = candles["close"] * (1 + price_multiplier)
-        self.processed_data = {
-            "reference_price": Decimal(candles["reference_price"].iloc[-1]),
-            "spread_multiplier": Decimal(candles["spread_multiplier"].iloc[-1]),
-            "features": candles
-        }
+        # Advance the indicators with the new candles, the engine can be shared with other controllers
+        self.indicators.update(candles)
+        if self.indicators.version == self._features_version:
+            return
+        self._features_version = self.indicators.version
+        columns = self.get_features_columns()
+        features = self.indicators.tail(max(self.max_records, len(candles)), columns)
+        # The indicators are updated incrementally by the engine, the multipliers use the same kernel as the config page
+        natr = features[:, columns.index(f"NATR_{self.config.natr_length}")]
+        macd = features[:, columns.index(f"MACD_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}")]
+        macdh = features[:, columns.index(f"MACDh_{self.config.macd_fast}_{self.config.macd_slow}_{self.config.macd_signal}")]
+        price_multiplier, spread_multiplier = get_multipliers(natr, macd, macdh)
+        reference_price = features[:, columns.index("close")] * (1 + price_multiplier[-1])
+        self.processed_data = ProcessedData(
+            reference_price=Decimal(reference_price[-1]),
+            spread_multiplier=Decimal(spread_multiplier[-1]),
+            features=FeaturesStore.from_array(features, columns, spread_multiplier=spread_multiplier,
+                                              reference_price=reference_price),
+        )
 
     def get_executor_config(self, level_id: str, price: Decimal, amount: Decimal):
         trade_type = self.get_trade_type_from_level_id(level_id)
@@ -0,0 +1,73 @@
+from decimal import Decimal
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from hummingbot.core.data_type.common import TradeType
+
+
+class DCALadderTemplate(NamedTuple):
+    """
+    Price and amount ladder of a DCA executor relative to the reference price and the total amount, so the configs of
+    the executors are stamped with one multiplication per level.
+    """
+    price_factors: Tuple[Decimal, ...]
+    amount_fractions: Tuple[Decimal, ...]
+    quote_weights: Tuple[Decimal, ...]
+
+    @classmethod
+    def build(cls, side: TradeType, spreads: Sequence[Decimal], amounts: Sequence[Decimal],
+              spread_multiplier: Decimal = Decimal("1")) -> "DCALadderTemplate":
+        direction = -1 if side == TradeType.BUY else 1
+        price_factors = tuple(1 + direction * Decimal(spread) * spread_multiplier for spread in spreads)
+        total_amount = sum(Decimal(amount) for amount in amounts)
+        amount_fractions = tuple(Decimal(amount) / total_amount for amount in amounts)
+        quote_weights = tuple(fraction * factor for fraction, factor in zip(amount_fractions, price_factors))
+        return cls(price_factors, amount_fractions, quote_weights)
+
+    def get_prices(self, price: Decimal) -> List[Decimal]:
+        return [price * factor for factor in self.price_factors]
+
+    def get_amounts_quote(self, total_amount_quote: Decimal) -> List[Decimal]:
+        """
+        Quote amount of each level when the total amount is split in quote.
+        """
+        return [total_amount_quote * fraction for fraction in self.amount_fractions]
+
+    def get_amounts_quote_from_base(self, amount: Decimal, price: Decimal) -> List[Decimal]:
+        """
+        Quote amount of each level when the total amount is split in base and each level is valued at its price.
+        """
+        amount_quote = amount * price
+        return [amount_quote * weight for weight in self.quote_weights]
+
+
+class DCALadderCache:
+    """
+    Ladder templates by (side, spread multiplier bucket). The spread multiplier is rounded to significant_digits to
+    build the bucket, and the templates are rebuilt only when the spreads or amounts of the config change or when a new
+    bucket is requested.
+    """
+
+    def __init__(self, significant_digits: int = 6, max_templates: int = 256):
+        self.significant_digits = significant_digits
+        self.max_templates = max_templates
+        self._config_key: Optional[Tuple] = None
+        self._templates: Dict[Tuple[TradeType, Decimal], DCALadderTemplate] = {}
+
+    def get_bucket(self, spread_multiplier: Decimal) -> Decimal:
+        return Decimal(f"{spread_multiplier:.{self.significant_digits}g}")
+
+    def get(self, side: TradeType, spreads: Sequence[Decimal], amounts: Sequence[Decimal],
+            spread_multiplier: Decimal = Decimal("1")) -> DCALadderTemplate:
+        config_key = (tuple(spreads), tuple(amounts))
+        if config_key != self._config_key:
+            self._templates.clear()
+            self._config_key = config_key
+        bucket = self.get_bucket(spread_multiplier)
+        key = (side, bucket)
+        template = self._templates.get(key)
+        if template is None:
+            if len(self._templates) >= self.max_templates:
+                self._templates.clear()
+            template = DCALadderTemplate.build(side, spreads, amounts, bucket)
+            self._templates[key] = template
+        return template
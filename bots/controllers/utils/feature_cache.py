@@ -0,0 +1,62 @@
+from typing import Dict, Sequence, Set, Tuple
+
+from controllers.utils.indicators import Indicator, IndicatorEngine
+
+
+class FeatureCache:
+    """
+    Process wide cache of indicator engines, keyed by (connector, trading pair, interval, indicators spec). The
+    controllers that run in the same bot over the same candles feed and with the same indicators parameters share one
+    engine, so the indicators are computed once per candle update instead of once per controller. Each engine keeps
+    the ids of the controllers that use it, and it is dropped when the last of them releases it on stop, so the
+    engines don't outlive the controllers (e.g. between backtests run in the same process).
+    """
+    _shared_instance: "FeatureCache" = None
+
+    @classmethod
+    def get_instance(cls) -> "FeatureCache":
+        if cls._shared_instance is None:
+            cls._shared_instance = FeatureCache()
+        return cls._shared_instance
+
+    def __init__(self):
+        self._engines: Dict[Tuple, IndicatorEngine] = {}
+        self._owners: Dict[Tuple, Set[str]] = {}
+
+    @staticmethod
+    def get_key(connector_name: str, trading_pair: str, interval: str, indicators: Sequence[Indicator]) -> Tuple:
+        return connector_name, trading_pair, interval, tuple(indicator.spec for indicator in indicators)
+
+    def get_engine(self, connector_name: str, trading_pair: str, interval: str, indicators: Sequence[Indicator],
+                   owner: str, history_size: int = 100) -> IndicatorEngine:
+        """
+        Get the engine that computes the indicators over the candles feed, creating it if it doesn't exist.
+        :param indicators: indicators to compute, only used to create the engine if there is no engine with the same
+        spec in the cache.
+        :param owner: id of the controller that uses the engine, to release it with release.
+        :param history_size: minimum number of rows to keep in the history of the engine.
+        """
+        key = self.get_key(connector_name, trading_pair, interval, indicators)
+        engine = self._engines.get(key)
+        if engine is None:
+            engine = IndicatorEngine(indicators, history_size=history_size)
+            self._engines[key] = engine
+        else:
+            engine.set_history_size(history_size)
+        self._owners.setdefault(key, set()).add(owner)
+        return engine
+
+    def release(self, owner: str):
+        """
+        Release the engines used by the controller, dropping the ones that are not used by other controllers.
+        """
+        for key in [key for key, owners in self._owners.items() if owner in owners]:
+            owners = self._owners[key]
+            owners.discard(owner)
+            if not owners:
+                del self._owners[key]
+                del self._engines[key]
+
+    def clear(self):
+        self._engines.clear()
+        self._owners.clear()
@@ -0,0 +1,56 @@
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class FeaturesStore:
+    """
+    Compact storage of the features of a controller. Only the columns declared by the controller are kept, as float32
+    arrays, except the timestamp that needs float64 precision and the integer columns like the signal. The dataframe
+    used by the status, the backtesting and the dashboard is only built when it is requested.
+    """
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = {name: self._compact(name, values) for name, values in columns.items()}
+        self._frame: Optional[pd.DataFrame] = None
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, columns: Sequence[str], **extra_columns: np.ndarray) -> "FeaturesStore":
+        features = {column: array[:, i] for i, column in enumerate(columns)}
+        features.update(extra_columns)
+        return cls(features)
+
+    @staticmethod
+    def _compact(name: str, values: np.ndarray) -> np.ndarray:
+        values = np.asarray(values)
+        if name == "timestamp" or np.issubdtype(values.dtype, np.integer):
+            return values
+        return values.astype(np.float32)
+
+    def __len__(self):
+        return len(next(iter(self.columns.values()), []))
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def to_frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.columns)
+        return self._frame
+
+
+class ProcessedData(dict):
+    """
+    Processed data of a controller that returns the features dataframe when the stored value is a FeaturesStore, so
+    the dataframe is only built by the consumers that need it.
+    """
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, FeaturesStore):
+            return value.to_frame()
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
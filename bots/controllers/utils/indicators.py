@@ -0,0 +1,564 @@
+import math
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+CANDLE_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
+
+# Largest scale factor (as a natural log) applied inside a chunk of the linear recursion, keeps the scaled values far
+# from the float64 overflow (e ** 709) while allowing chunks of a few thousand rows for the usual lengths.
+MAX_LOG_SCALE = 300.0
+
+
+class Candle(NamedTuple):
+    timestamp: float
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+
+
+def linear_recursion(values: np.ndarray, decay: float, gain: float, initial: float = 0.0) -> np.ndarray:
+    """
+    Solve y[i] = decay * y[i - 1] + gain * values[i] with y[-1] = initial without a Python loop per row. The series is
+    split in chunks where the recursion has the closed form decay ** j * cumsum(values / decay ** k), so the cost is
+    one vectorized pass per chunk.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 1:
+        return np.array([decay * initial + gain * values[0]])
+    if decay == 0:
+        return gain * values
+    result = np.empty(len(values))
+    chunk_size = max(1, int(MAX_LOG_SCALE / -math.log(decay)))
+    powers = decay ** np.arange(chunk_size + 1)
+    previous = initial
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        size = len(chunk)
+        scaled_sum = np.cumsum(chunk / powers[:size])
+        chunk_result = powers[1:size + 1] * previous + gain * powers[:size] * scaled_sum
+        result[start:start + size] = chunk_result
+        previous = chunk_result[-1]
+    return result
+
+
+def fill_skipped(result: np.ndarray, valid: np.ndarray, initial: float) -> np.ndarray:
+    """
+    Expand the result computed over the valid values to all the values, the skipped ones repeat the previous result.
+    """
+    if valid.all():
+        return result
+    return np.concatenate([[initial], result])[np.cumsum(valid)]
+
+
+class RollingWindow:
+    """
+    Sum and sum of squares of the last length values. The sums are recomputed from the window every length
+    updates to avoid the accumulation of floating point errors, so the cost per update is O(1) amortized.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values: Deque[float] = deque(maxlen=length)
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self._updates_since_resync = 0
+
+    def append(self, value: float):
+        if len(self.values) == self.length:
+            oldest = self.values[0]
+            self.sum -= oldest
+            self.sum_sq -= oldest * oldest
+        self.values.append(value)
+        self.sum += value
+        self.sum_sq += value * value
+        self._updates_since_resync += 1
+        if self._updates_since_resync >= self.length:
+            self.sum = math.fsum(self.values)
+            self.sum_sq = math.fsum(value * value for value in self.values)
+            self._updates_since_resync = 0
+
+    def stats(self, value: Optional[float] = None) -> Tuple[int, float, float]:
+        """
+        Count, sum and sum of squares of the window, as if value was appended when it is provided.
+        """
+        count, total, total_sq = len(self.values), self.sum, self.sum_sq
+        if value is None:
+            return count, total, total_sq
+        if count == self.length:
+            oldest = self.values[0]
+            return count, total - oldest + value, total_sq - oldest * oldest + value * value
+        return count + 1, total + value, total_sq + value * value
+
+    def mean_std(self, value: Optional[float] = None, ddof: int = 0) -> Tuple[float, float]:
+        count, total, total_sq = self.stats(value)
+        if count < self.length or count <= ddof:
+            return math.nan, math.nan
+        mean = total / count
+        variance = max((total_sq - count * mean * mean) / (count - ddof), 0.0)
+        return mean, math.sqrt(variance)
+
+
+class RowBuffer:
+    """
+    Ring buffer of float rows backed by a NumPy array, keeps the last capacity rows appended.
+    """
+
+    def __init__(self, n_columns: int, capacity: int):
+        self.n_columns = n_columns
+        self._data = np.empty((capacity, n_columns))
+        self._next = 0
+        self._size = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def __len__(self):
+        return self._size
+
+    def append(self, row: Sequence[float]):
+        self._data[self._next] = row
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def first(self) -> Optional[np.ndarray]:
+        """
+        Oldest row kept in the buffer.
+        """
+        if self._size == 0:
+            return None
+        return self._data[(self._next - self._size) % self.capacity]
+
+    def extend(self, rows: np.ndarray):
+        rows = rows[len(rows) - self.capacity:] if len(rows) > self.capacity else rows
+        self._data[(self._next + np.arange(len(rows))) % self.capacity] = rows
+        self._next = (self._next + len(rows)) % self.capacity
+        self._size = min(self._size + len(rows), self.capacity)
+
+    def set_capacity(self, capacity: int):
+        if capacity == self.capacity:
+            return
+        rows = self.tail(capacity)
+        self._data = np.empty((capacity, self.n_columns))
+        self._data[:len(rows)] = rows
+        self._size = len(rows)
+        self._next = self._size % capacity
+
+    def tail(self, n: Optional[int] = None, columns: Optional[Sequence[int]] = None) -> np.ndarray:
+        """
+        Copy of the last n rows in insertion order, with only the columns indexes provided.
+        """
+        n = self._size if n is None else min(n, self._size)
+        indexes = np.arange(self._next - n, self._next) % self.capacity
+        if columns is None:
+            return self._data[indexes]
+        return self._data[np.ix_(indexes, columns)]
+
+
+class EMA:
+    """
+    Exponential moving average seeded with the simple average of the first length values, as pandas_ta does.
+    NaN values are ignored, so it can be chained after another indicator that is still warming up. The values are
+    computed in blocks with the linear recursion, so the same kernel serves a full history and a single new value.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2 / (length + 1)
+        self.count = 0
+        self.value = math.nan
+        self._seed_sum = 0.0
+
+    def run(self, values: np.ndarray, commit: bool = True) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+        valid_values = values[valid]
+        n_seed = min(len(valid_values), max(self.length - self.count, 0))
+        result = np.full(len(valid_values), np.nan)
+        seed_sum, ema = self._seed_sum, self.value
+        if n_seed:
+            seed_sum = np.cumsum(np.concatenate([[seed_sum], valid_values[:n_seed]]))[-1]
+            if self.count + n_seed == self.length:
+                ema = result[n_seed - 1] = seed_sum / self.length
+        if n_seed < len(valid_values):
+            result[n_seed:] = linear_recursion(valid_values[n_seed:], 1 - self.alpha, self.alpha, ema)
+            ema = result[-1]
+        result = fill_skipped(result, valid, self.value)
+        if commit:
+            self.count, self._seed_sum, self.value = self.count + len(valid_values), seed_sum, ema
+        return result
+
+    def step(self, value: float, commit: bool = True) -> float:
+        return float(self.run(np.array([value]), commit)[0])
+
+
+class RMA:
+    """
+    Wilder's moving average computed as an adjusted exponential mean with alpha 1 / length and min periods length,
+    the same definition used by pandas_ta. NaN values are ignored. The weighted sum and the sum of the weights are
+    computed in blocks with the linear recursion.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1 - 1 / length
+        self.count = 0
+        self.value = math.nan
+        self._weighted_sum = 0.0
+        self._weights = 0.0
+
+    def run(self, values: np.ndarray, commit: bool = True) -> np.ndarray:
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+        valid_values = values[valid]
+        weighted_sums = linear_recursion(valid_values, self.decay, 1.0, self._weighted_sum)
+        weights = linear_recursion(np.ones(len(valid_values)), self.decay, 1.0, self._weights)
+        counts = self.count + np.arange(1, len(valid_values) + 1)
+        result = np.where(counts >= self.length, weighted_sums / weights, np.nan)
+        if commit and len(valid_values):
+            self.count, self._weighted_sum, self._weights = counts[-1], weighted_sums[-1], weights[-1]
+            previous_value, self.value = self.value, result[-1]
+            return fill_skipped(result, valid, previous_value)
+        return fill_skipped(result, valid, self.value)
+
+    def step(self, value: float, commit: bool = True) -> float:
+        return float(self.run(np.array([value]), commit)[0])
+
+
+class Indicator:
+    """
+    Base class of the streaming indicators. update commits the candle to the state of the indicator and peek returns
+    the values that the candle would produce without changing the state, which is used for the candle in progress.
+    run commits a block of candles and returns one row of values per candle, the indicators with a vectorized kernel
+    override it, so the same code computes a full history in batch and the new candles of a live feed.
+    """
+
+    @property
+    def columns(self) -> List[str]:
+        raise NotImplementedError
+
+    @property
+    def spec(self) -> Tuple:
+        raise NotImplementedError
+
+    def step(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+    def update(self, candle: Candle) -> Tuple[float, ...]:
+        return self.step(candle, commit=True)
+
+    def run(self, candles: np.ndarray) -> np.ndarray:
+        """
+        Commit a block of candles.
+        :param candles: array with one row per candle and the CANDLE_COLUMNS.
+        :return: array with one row of values per candle.
+        """
+        values = [self.update(Candle(*row)) for row in candles]
+        return np.array(values, dtype=float).reshape(len(candles), len(self.columns))
+
+    def peek(self, candle: Candle) -> Tuple[float, ...]:
+        return self.step(candle, commit=False)
+
+
+class BollingerBands(Indicator):
+    def __init__(self, length: int, std: float):
+        self.length = length
+        self.std = std
+        self.reset()
+
+    def reset(self):
+        self._window = RollingWindow(self.length)
+
+    @property
+    def columns(self) -> List[str]:
+        suffix = f"_{self.length}_{self.std}"
+        return [f"BBL{suffix}", f"BBM{suffix}", f"BBU{suffix}", f"BBB{suffix}", f"BBP{suffix}"]
+
+    @property
+    def spec(self) -> Tuple:
+        return "bbands", self.length, self.std
+
+    def step(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        mean, std = self._window.mean_std(candle.close)
+        if commit:
+            self._window.append(candle.close)
+        lower = mean - self.std * std
+        upper = mean + self.std * std
+        band_range = upper - lower
+        bandwidth = 100 * band_range / mean if mean else math.nan
+        percent = (candle.close - lower) / band_range if band_range else math.nan
+        return lower, mean, upper, bandwidth, percent
+
+
+class MACD(Indicator):
+    def __init__(self, fast: int, slow: int, signal: int):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self.reset()
+
+    def reset(self):
+        self._fast_ema = EMA(self.fast)
+        self._slow_ema = EMA(self.slow)
+        self._signal_ema = EMA(self.signal)
+
+    @property
+    def columns(self) -> List[str]:
+        suffix = f"_{self.fast}_{self.slow}_{self.signal}"
+        return [f"MACD{suffix}", f"MACDh{suffix}", f"MACDs{suffix}"]
+
+    @property
+    def spec(self) -> Tuple:
+        return "macd", self.fast, self.slow, self.signal
+
+    def run_close(self, close: np.ndarray, commit: bool = True) -> np.ndarray:
+        macd = self._fast_ema.run(close, commit) - self._slow_ema.run(close, commit)
+        signal = self._signal_ema.run(macd, commit)
+        return np.column_stack([macd, macd - signal, signal])
+
+    def run(self, candles: np.ndarray) -> np.ndarray:
+        return self.run_close(candles[:, 4])
+
+    def step(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        return tuple(self.run_close(np.array([candle.close]), commit)[0])
+
+
+class ATR(Indicator):
+    """
+    Average true range with Wilder's smoothing and its normalized version (NATR) in percentage of the close.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.reset()
+
+    def reset(self):
+        self._rma = RMA(self.length)
+        self._previous_close = math.nan
+
+    @property
+    def columns(self) -> List[str]:
+        return [f"ATRr_{self.length}", f"NATR_{self.length}"]
+
+    @property
+    def spec(self) -> Tuple:
+        return "atr", self.length
+
+    def run_hlc(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, commit: bool = True) -> np.ndarray:
+        previous_close = np.concatenate([[self._previous_close], close[:-1]])
+        true_range = np.maximum.reduce([high - low, np.abs(high - previous_close), np.abs(previous_close - low)])
+        atr = self._rma.run(true_range, commit)
+        if commit and len(close):
+            self._previous_close = close[-1]
+        return np.column_stack([atr, 100 * atr / close])
+
+    def run(self, candles: np.ndarray) -> np.ndarray:
+        return self.run_hlc(candles[:, 2], candles[:, 3], candles[:, 4])
+
+    def step(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        return tuple(self.run_hlc(np.array([candle.high]), np.array([candle.low]), np.array([candle.close]), commit)[0])
+
+
+class Volatility(Indicator):
+    """
+    Rolling standard deviation of the log returns of the close over the last length candles.
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.reset()
+
+    def reset(self):
+        self._window = RollingWindow(self.length)
+        self._previous_close = math.nan
+
+    @property
+    def columns(self) -> List[str]:
+        return [f"VOLATILITY_{self.length}"]
+
+    @property
+    def spec(self) -> Tuple:
+        return "volatility", self.length
+
+    def step(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        if math.isnan(self._previous_close) or candle.close <= 0 or self._previous_close <= 0:
+            _, std = self._window.mean_std(ddof=1)
+        else:
+            log_return = math.log(candle.close / self._previous_close)
+            _, std = self._window.mean_std(log_return, ddof=1)
+            if commit:
+                self._window.append(log_return)
+        if commit:
+            self._previous_close = candle.close
+        return (std,)
+
+
+class SuperTrend(Indicator):
+    def __init__(self, length: int, multiplier: float):
+        self.length = length
+        self.multiplier = multiplier
+        self.reset()
+
+    def reset(self):
+        self._atr = ATR(self.length)
+        self._direction = 1
+        self._upper_band = math.nan
+        self._lower_band = math.nan
+        self._started = False
+
+    @property
+    def columns(self) -> List[str]:
+        suffix = f"_{self.length}_{self.multiplier}"
+        return [f"SUPERT{suffix}", f"SUPERTd{suffix}", f"SUPERTl{suffix}", f"SUPERTs{suffix}"]
+
+    @property
+    def spec(self) -> Tuple:
+        return "supertrend", self.length, self.multiplier
+
+    def step(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        atr, _ = self._atr.step(candle, commit)
+        hl2 = (candle.high + candle.low) / 2
+        upper_band = hl2 + self.multiplier * atr
+        lower_band = hl2 - self.multiplier * atr
+        if not self._started:
+            direction, trend = 1, 0.0
+            long, short = math.nan, math.nan
+        else:
+            if candle.close > self._upper_band:
+                direction = 1
+            elif candle.close < self._lower_band:
+                direction = -1
+            else:
+                direction = self._direction
+                if direction > 0 and lower_band < self._lower_band:
+                    lower_band = self._lower_band
+                if direction < 0 and upper_band > self._upper_band:
+                    upper_band = self._upper_band
+            if direction > 0:
+                trend = long = lower_band
+                short = math.nan
+            else:
+                trend = short = upper_band
+                long = math.nan
+        if commit:
+            self._started = True
+            self._direction, self._upper_band, self._lower_band = direction, upper_band, lower_band
+        return trend, direction, long, short
+
+
+class IndicatorEngine:
+    """
+    Computes a set of streaming indicators over a candles feed. The indicators only advance when a new candle closes,
+    while the last candle of the feed, which is still in progress, is evaluated without changing their state. The
+    engine keeps the latest values and a bounded history of the rows with the candle and the indicators values.
+    The first update consumes all the candles available, and the history grows to the length of the candles of every
+    update, so a single update over a long dataframe (as done in backtesting) returns the full history. When the
+    candles don't overlap with the last closed candle processed (the feed went back in time or has a gap bigger than
+    the dataframe), or start before the oldest row of the history (a new backtest over a wider range), the indicators
+    are reset and warmed up again from the dataframe. The version is increased on every change of the latest values, so the
+    consumers of an engine shared by several controllers can tell if they already processed them.
+    """
+
+    def __init__(self, indicators: Sequence[Indicator], history_size: int = 100):
+        self.indicators = list(indicators)
+        self.history_size = history_size
+        self.columns = CANDLE_COLUMNS + [column for indicator in self.indicators for column in indicator.columns]
+        self.history = RowBuffer(len(self.columns), history_size)
+        self.last_row: Optional[Tuple[float, ...]] = None
+        self.version = 0
+        self._frame: Optional[pd.DataFrame] = None
+        self._last_closed_timestamp: Optional[float] = None
+        self._last_candle: Optional[Candle] = None
+
+    @property
+    def latest(self) -> Dict[str, float]:
+        return dict(zip(self.columns, self.last_row)) if self.last_row is not None else {}
+
+    def get_latest(self, column: str) -> float:
+        if self.last_row is None:
+            return math.nan
+        return self.last_row[self.columns.index(column)]
+
+    def reset(self):
+        for indicator in self.indicators:
+            indicator.reset()
+        self.history = RowBuffer(len(self.columns), self.history_size)
+        self.last_row = None
+        self._last_closed_timestamp = None
+        self._last_candle = None
+
+    def set_history_size(self, history_size: int):
+        if history_size > self.history.capacity:
+            self.history.set_capacity(history_size)
+        self.history_size = max(self.history_size, history_size)
+
+    def update(self, candles: pd.DataFrame) -> bool:
+        """
+        Advance the indicators with the candles closed since the last update and evaluate the candle in progress.
+        :param candles: candles dataframe of the feed, sorted by timestamp.
+        :return: True if the latest values changed.
+        """
+        if candles.empty:
+            return False
+        timestamps = candles["timestamp"].to_numpy()
+        if self._last_closed_timestamp is not None and \
+                (not timestamps[0] <= self._last_closed_timestamp <= timestamps[-1] or
+                 timestamps[0] < self.history.first()[0]):
+            self.reset()
+        if len(candles) > self.history.capacity:
+            self.history.set_capacity(len(candles))
+        if self._last_closed_timestamp is None:
+            start = 0
+        else:
+            start = int(np.searchsorted(timestamps, self._last_closed_timestamp, side="right"))
+        rows = candles[CANDLE_COLUMNS].iloc[start:].to_numpy(dtype=float)
+        if len(rows) == 0:
+            return False
+        last_candle = Candle(*rows[-1])
+        if len(rows) == 1 and last_candle == self._last_candle:
+            return False
+        closed_rows = rows[:-1]
+        if len(closed_rows):
+            self.history.extend(np.column_stack([closed_rows] + [indicator.run(closed_rows)
+                                                                 for indicator in self.indicators]))
+            self._last_closed_timestamp = closed_rows[-1, 0]
+        self.last_row = self._get_row(last_candle, commit=False)
+        self._last_candle = last_candle
+        self._frame = None
+        self.version += 1
+        return True
+
+    def _get_row(self, candle: Candle, commit: bool) -> Tuple[float, ...]:
+        row = tuple(candle)
+        for indicator in self.indicators:
+            row += tuple(indicator.step(candle, commit))
+        return row
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Dataframe with the history and the latest row. The dataframe is cached until the next change, so it must not
+        be modified in place.
+        """
+        if self._frame is None:
+            self._frame = pd.DataFrame(self.tail(), columns=self.columns)
+        return self._frame
+
+    def tail(self, n: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> np.ndarray:
+        """
+        Array with the last n rows, including the latest row of the candle in progress, and only the columns provided.
+        """
+        column_indexes = None if columns is None else [self.columns.index(column) for column in columns]
+        history_rows = None if n is None else max(n - 1, 0)
+        rows = self.history.tail(history_rows, column_indexes)
+        if self.last_row is None:
+            return rows
+        last_row = np.array(self.last_row if column_indexes is None else [self.last_row[i] for i in column_indexes])
+        return np.vstack([rows, last_row])
@@ -0,0 +1,34 @@
+from typing import Tuple
+
+import numpy as np
+
+from controllers.utils.indicators import ATR, MACD
+
+
+def get_multipliers(natr_values: np.ndarray, macd_values: np.ndarray,
+                    macdh_values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Price and spread multipliers of PMM Dynamic from the NATR (in percentage), MACD and MACD histogram series. The MACD
+    is normalized with the mean and standard deviation of the series provided, so the live controller passes the
+    window of candles it keeps and the config page the full history.
+    :return: price multiplier and spread multiplier series.
+    """
+    spread_multiplier = np.asarray(natr_values, dtype=float) / 100
+    macd_values = np.asarray(macd_values, dtype=float)
+    macd_signal = - (macd_values - np.nanmean(macd_values)) / np.nanstd(macd_values, ddof=1)
+    macdh_signal = np.where(np.asarray(macdh_values) > 0, 1, -1)
+    max_price_shift = spread_multiplier / 2
+    price_multiplier = (0.5 * macd_signal + 0.5 * macdh_signal) * max_price_shift
+    return price_multiplier, spread_multiplier
+
+
+def get_pmm_dynamic_multipliers(high: np.ndarray, low: np.ndarray, close: np.ndarray, macd_fast: int,
+                                macd_slow: int, macd_signal: int, natr_length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch computation of the price and spread multipliers over a full candles history, with the same ATR and MACD
+    indicators that the controller updates on each new candle.
+    """
+    high, low, close = (np.asarray(values, dtype=float) for values in (high, low, close))
+    natr_values = ATR(natr_length).run_hlc(high, low, close)[:, 1]
+    macd_values, macdh_values, _ = MACD(macd_fast, macd_slow, macd_signal).run_close(close).T
+    return get_multipliers(natr_values, macd_values, macdh_values)
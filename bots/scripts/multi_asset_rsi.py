@@ -1,102 +1,170 @@
-from datetime import datetime, timedelta
-import pandas as pd
-import pandas_ta as ta
-from hummingbot.core.data_type.common import PriceType, TradeType
+import os
+from decimal import Decimal
+from typing import Dict
+from hummingbot.client import settings
+from hummingbot.connector.connector_base import ConnectorBase
+from hummingbot.core.data_type.common import OrderType, TradeType
+from hummingbot.core.event.events import OrderFilledEvent
 from hummingbot.strategy.script_strategy_base import ScriptStrategyBase
 from hummingbot.core.data_type.candles import CandlesFactory, CandlesConfig
+from scripts.utils.candle_scheduler import CandleCloseScheduler, ScheduleDecision
+from scripts.utils.indicator_cache import PairIndicatorCache
+from scripts.utils.multi_asset_rsi_config import MultiAssetRSIConfig
+from scripts.utils.portfolio_snapshot import PortfolioSnapshot
+from scripts.utils.ratio_candles import RatioCandles
+from scripts.utils.risk_engine import IntradayRiskEngine
 
 class MultiAssetRSIStrategy(ScriptStrategyBase):
-    # 策略参数配置
-    trading_pairs = ["BTC-USDT", "ETH-USDT"]
-    exchange = "binance"
-    
-    # RSI参数
-    rsi_length = 14
-    eth_btc_rsi_length = 14
-    bullish_rsi_entry = 70
-    bullish_rsi_exit = 65
-    bearish_rsi_entry = 30
-    bearish_rsi_exit = 35
-    sma_length = 200
-    
-    # 头寸管理
-    allocation = 0.98
-    rebalance_threshold = 0.1  # 10%变化触发调仓
-    max_position_ratio = 0.25  # 单资产最大仓位比例
-    
-    # 风险管理
-    stop_loss_pct = 0.20
-    trailing_stop_activation = 0.05  # 5%盈利后启动追踪止损
-    trailing_delta = 0.03  # 3%追踪幅度
-    
-    # 初始化变量
-    candles_config = {}
-    last_execution_time = None
-    
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+    # 配置文件conf/multi_asset_rsi_config.yaml，在init_markets和__init__中加载，文件不存在时使用默认参数
+    config_file_name = "multi_asset_rsi_config.yaml"
+    # 默认参数的市场，init_markets加载配置文件后替换
+    markets = {"binance": {"BTC-USDT", "ETH-USDT"}}
+
+    @classmethod
+    def load_strategy_config(cls) -> MultiAssetRSIConfig:
+        config_file_path = os.path.join(settings.CONF_DIR_PATH, cls.config_file_name)
+        return MultiAssetRSIConfig.load(config_file_path) if os.path.exists(config_file_path) \
+            else MultiAssetRSIConfig()
+
+    @classmethod
+    def init_markets(cls, config=None):
+        cls.markets = cls.load_strategy_config().get_markets()
+
+    def __init__(self, connectors: Dict[str, ConnectorBase], config=None):
+        super().__init__(connectors, config)
+        self.strategy_config = self.load_strategy_config()
+        params = self.strategy_config.params
+        # 没有调用init_markets时连接的是默认市场，配置文件的交易所必须已连接
+        missing_connectors = set(self.strategy_config.markets) - set(self.connectors)
+        if missing_connectors:
+            raise ValueError(f"The connectors {sorted(missing_connectors)} of {self.config_file_name} are not "
+                             f"connected, the markets of the script are set by init_markets.")
+
+        # 策略参数配置
+        self.trading_pairs = params.trading_pairs
+        self.exchange = params.exchange
+
+        # RSI参数
+        self.rsi_length = params.rsi_length
+        self.eth_btc_rsi_length = params.eth_btc_rsi_length
+        self.bullish_rsi_entry = params.bullish_rsi_entry
+        self.bullish_rsi_exit = params.bullish_rsi_exit
+        self.bearish_rsi_entry = params.bearish_rsi_entry
+        self.bearish_rsi_exit = params.bearish_rsi_exit
+        self.sma_length = params.sma_length
+
+        # 调度参数
+        self.candles_interval = params.candles_interval
+        self.signal_offset = params.signal_offset
+        self.max_feed_delay = params.max_feed_delay
+
+        # 头寸管理
+        self.allocation = params.allocation
+        self.rebalance_threshold = params.rebalance_threshold
+        self.max_position_ratio = params.max_position_ratio
+
+        # 风险管理
+        self.stop_loss_pct = params.stop_loss_pct
+        self.trailing_stop_activation = params.trailing_stop_activation
+        self.trailing_delta = params.trailing_delta
+
+        self.candles_config = {}
         # 初始化各交易对的K线配置
         for pair in self.trading_pairs:
             self.candles_config[pair] = CandlesConfig(
                 connector=self.exchange,
                 trading_pair=pair,
-                interval="1d",
+                interval=self.candles_interval,
                 max_records=300
             )
         # 注册K线数据源
         self.candles = {pair: CandlesFactory.get_candle(self.candles_config[pair])
                         for pair in self.trading_pairs}
+        # 各交易对的RSI和SMA缓存，只在新的日K线出现时推进
+        self.indicators = {pair: PairIndicatorCache(self.rsi_length, self.sma_length)
+                           for pair in self.trading_pairs}
+        # 按K线收盘调度信号计算
+        self.scheduler = CandleCloseScheduler(interval=self.candles[self.trading_pairs[0]].interval_in_seconds,
+                                              offset=self.signal_offset,
+                                              max_feed_delay=self.max_feed_delay)
+        # ETH/BTC合成K线，由ETH-USDT和BTC-USDT的K线计算，不产生额外的交易所请求
+        self.eth_btc_candles = RatioCandles(self.candles["ETH-USDT"], self.candles["BTC-USDT"], "ETH-BTC") \
+            if "ETH-USDT" in self.candles and "BTC-USDT" in self.candles else None
+        self.eth_btc_indicators = PairIndicatorCache(self.eth_btc_rsi_length, self.sma_length)
+        # 启动K线数据源，ETH/BTC合成K线负责启动和停止它的两条腿
+        self.candles_feeds = [candle for pair, candle in self.candles.items()
+                              if self.eth_btc_candles is None or pair not in ("ETH-USDT", "BTC-USDT")]
+        if self.eth_btc_candles is not None:
+            self.candles_feeds.append(self.eth_btc_candles)
+        for candles_feed in self.candles_feeds:
+            candles_feed.start()
+        # 每个tick运行的止损引擎，与每日信号分开
+        self.risk_engine = IntradayRiskEngine(stop_loss_pct=self.stop_loss_pct,
+                                              trailing_stop_activation=self.trailing_stop_activation,
+                                              trailing_delta=self.trailing_delta)
         
     def on_tick(self):
-        # 每5分钟执行一次逻辑
-        if not self._should_execute():
+        # 每个tick检查止损
+        self.apply_risk_management()
+        
+        # 信号逻辑只在所有交易对的K线收盘后执行
+        decision = self.scheduler.check(self.current_timestamp, self.get_last_candle_timestamps)
+        if decision == ScheduleDecision.SKIP:
+            stale_pairs = self.scheduler.get_stale_pairs(self.get_last_candle_timestamps())
+            self.logger().warning(f"Skipping the candle closed at {self.scheduler.last_close}, "
+                                  f"stale candles feeds: {stale_pairs}.")
+            return
+        if decision != ScheduleDecision.RUN:
             return
         
-        # 更新K线数据
-        for candle in self.candles.values():
-            candle.update()
+        # 更新指标缓存
+        self.update_indicators()
             
-        # 获取当前投资组合价值
-        total_value = self.get_total_portfolio_value()
-        target_value = total_value * self.allocation
+        # 获取投资组合快照，本次执行都使用同一个快照
+        portfolio = self.get_portfolio_snapshot()
+        target_value = portfolio.total_value * Decimal(str(self.allocation))
+        for pair in self.trading_pairs:
+            self.risk_engine.sync(pair, portfolio.get_position(pair), portfolio.mid_prices[pair])
         
         # 计算市场状态
-        market_regime = self.determine_market_regime()
+        market_regime = self.determine_market_regime(portfolio)
         
         # 生成交易信号
         signals = {}
         for pair in self.trading_pairs:
-            signals[pair] = self.generate_signal(pair, market_regime)
+            signals[pair] = self.generate_signal(pair, market_regime, portfolio)
             
         # 头寸再平衡
-        self.rebalance_positions(signals, target_value)
+        self.rebalance_positions(signals, target_value, portfolio)
         
-    def _should_execute(self):
-        # 每日执行一次策略逻辑
-        now = datetime.now()
-        if not self.last_execution_time or (now - self.last_execution_time) >= timedelta(days=1):
-            self.last_execution_time = now
-            return True
-        return False
+    def on_stop(self):
+        # 停止K线数据源
+        for candles_feed in self.candles_feeds:
+            candles_feed.stop()
+    
+    def get_last_candle_timestamps(self):
+        # 各交易对最新K线的开盘时间
+        return {pair: candle.candles_df["timestamp"].iloc[-1] if len(candle.candles_df) > 0 else None
+                for pair, candle in self.candles.items()}
     
-    def get_total_portfolio_value(self):
-        # 计算总组合价值（包括所有资产和现金）
-        total = self.connectors[self.exchange].get_available_balance("USDT")
+    def update_indicators(self):
+        # 更新指标缓存，没有新K线或价格变化时直接使用缓存值
         for pair in self.trading_pairs:
-            base = pair.split("-")[0]
-            position = self.connectors[self.exchange].get_balance(base)
-            price = self.connectors[self.exchange].get_price(pair, PriceType.MidPrice)
-            total += position * price
-        return total
+            self.indicators[pair].update(self.candles[pair].candles_df)
+        if self.eth_btc_candles is not None:
+            self.eth_btc_indicators.update(self.eth_btc_candles.candles_df)
     
-    def determine_market_regime(self):
+    def get_portfolio_snapshot(self):
+        # 计算总组合价值（包括所有资产和现金）、各资产名义价值和权重
+        return PortfolioSnapshot.capture(self.connectors[self.exchange], self.trading_pairs, quote_asset="USDT")
+    
+    def determine_market_regime(self, portfolio):
         # 使用BTC的200日SMA判断市场状态
-        btc_candles = self.candles["BTC-USDT"].candles_df
-        if len(btc_candles) < self.sma_length:
+        sma = self.indicators["BTC-USDT"].closed_values["sma"]
+        if sma is None:
             return "neutral"
         
-        sma = ta.sma(btc_candles["close"], length=self.sma_length).iloc[-1]
-        current_price = self.connectors[self.exchange].get_price("BTC-USDT", PriceType.MidPrice)
+        current_price = float(portfolio.mid_prices["BTC-USDT"])
         
         if current_price > sma * 1.05:
             return "bull"
@@ -105,25 +173,19 @@ class MultiAssetRSIStrategy(ScriptStrategyBase):
         else:
             return "neutral"
     
-    def generate_signal(self, pair, regime):
-        candles_df = self.candles[pair].candles_df
-        if len(candles_df) < self.rsi_length:
+    def generate_signal(self, pair, regime, portfolio):
+        # 读取缓存的最后一根完整K线的RSI
+        rsi = self.indicators[pair].closed_values["rsi"]
+        if rsi is None:
             return "hold"
-            
-        # 计算RSI
-        rsi = ta.rsi(candles_df["close"], length=self.rsi_length).iloc[-1]
         
-        # 计算ETH/BTC相对强弱
-        if "ETH" in pair:
-            eth_price = candles_df["close"].iloc[-1]
-            btc_price = self.candles["BTC-USDT"].candles_df["close"].iloc[-1]
-            eth_btc_ratio = eth_price / btc_price
-            eth_btc_rsi = ta.rsi(pd.Series([eth_btc_ratio]), length=self.eth_btc_rsi_length).iloc[-1]
-        else:
+        # ETH/BTC相对强弱，使用比值序列的RSI
+        eth_btc_rsi = self.eth_btc_indicators.closed_values["rsi"] if "ETH" in pair else None
+        if eth_btc_rsi is None:
             eth_btc_rsi = 50
             
         # 生成信号逻辑
-        position = self.connectors[self.exchange].get_position(pair)
+        position = portfolio.get_position(pair)
         
         if regime == "bull":
             entry_level = self.bullish_rsi_entry
@@ -150,26 +212,20 @@ class MultiAssetRSIStrategy(ScriptStrategyBase):
                 
         return "hold"
     
-    def rebalance_positions(self, signals, target_value):
-        # 计算当前头寸权重
-        current_weights = {}
-        total = self.get_total_portfolio_value()
-        for pair in self.trading_pairs:
-            base = pair.split("-")[0]
-            position = self.connectors[self.exchange].get_balance(base)
-            price = self.connectors[self.exchange].get_price(pair, PriceType.MidPrice)
-            current_weights[pair] = (position * price) / total
+    def rebalance_positions(self, signals, target_value, portfolio):
+        # 当前头寸权重来自快照
+        current_weights = portfolio.weights
             
         # 计算目标权重
         target_weights = self.calculate_target_weights(signals)
         
         # 执行再平衡
         for pair in self.trading_pairs:
-            current_weight = current_weights.get(pair, 0)
+            current_weight = float(current_weights.get(pair, 0))
             target_weight = target_weights.get(pair, 0)
             
             if abs(current_weight - target_weight) > self.rebalance_threshold:
-                self.adjust_position(pair, target_weight, target_value)
+                self.adjust_position(pair, target_weight, target_value, portfolio)
                 
     def calculate_target_weights(self, signals):
         # 基于信号和动量计算目标权重
@@ -200,12 +256,11 @@ class MultiAssetRSIStrategy(ScriptStrategyBase):
                 
         return weights
     
-    def adjust_position(self, pair, target_weight, target_value):
-        # 计算目标头寸
-        current_price = self.connectors[self.exchange].get_price(pair, PriceType.MidPrice)
-        target_notional = target_value * target_weight
-        current_position = self.connectors[self.exchange].get_balance(pair.split("-")[0])
-        current_notional = current_position * current_price
+    def adjust_position(self, pair, target_weight, target_value, portfolio):
+        # 计算目标头寸，价格和持仓来自快照
+        current_price = portfolio.mid_prices[pair]
+        target_notional = target_value * Decimal(str(target_weight))
+        current_notional = portfolio.notionals[pair]
         
         # 计算调整量
         delta = target_notional - current_notional
@@ -231,48 +286,47 @@ class MultiAssetRSIStrategy(ScriptStrategyBase):
             connector.sell(pair, amount, order_type=OrderType.MARKET)
             
     def apply_risk_management(self):
-        # 实施止损逻辑
-        for pair in self.trading_pairs:
-            position = self.connectors[self.exchange].get_position(pair)
-            if position != 0:
-                entry_price = self.get_average_entry_price(pair)
-                current_price = self.connectors[self.exchange].get_price(pair, PriceType.MidPrice)
-                
-                # 硬止损
-                if current_price <= entry_price * (1 - self.stop_loss_pct):
-                    self.close_position(pair)
-                    
-                # 追踪止损
-                if current_price >= entry_price * (1 + self.trailing_stop_activation):
-                    trailing_stop_price = current_price * (1 - self.trailing_delta)
-                    if current_price <= trailing_stop_price:
-                        self.close_position(pair)
+        # 实施止损逻辑，只读取有持仓的交易对的中间价
+        if not self.risk_engine.positions:
+            return
+        connector = self.connectors[self.exchange]
+        prices = {pair: connector.get_mid_price(pair) for pair in self.risk_engine.positions}
+        for pair, reason in self.risk_engine.evaluate(prices):
+            self.logger().info(f"{reason} triggered for {pair} at {prices[pair]}, closing the position.")
+            self.close_position(pair)
+    
+    def did_fill_order(self, event: OrderFilledEvent):
+        # 根据成交更新入场价和持仓
+        self.risk_engine.on_fill(event.trading_pair, event.trade_type, event.amount, event.price)
     
     def close_position(self, pair):
-        base = pair.split("-")[0]
-        position = self.connectors[self.exchange].get_balance(base)
+        position = self.connectors[self.exchange].get_balance(pair.split("-")[0])
         if position > 0:
             self.execute_order(pair, position, TradeType.SELL)
         elif position < 0:
             self.execute_order(pair, abs(position), TradeType.BUY)
             
     def format_status(self) -> str:
+        portfolio = self.get_portfolio_snapshot()
         status = []
         status.append("Strategy Status:")
-        status.append(f"Total Portfolio Value: {self.get_total_portfolio_value():.2f} USDT")
+        status.append(f"Total Portfolio Value: {portfolio.total_value:.2f} USDT")
         
         for pair in self.trading_pairs:
-            price = self.connectors[self.exchange].get_price(pair, PriceType.MidPrice)
-            position = self.connectors[self.exchange].get_balance(pair.split("-")[0])
+            price = portfolio.mid_prices[pair]
+            position = portfolio.get_position(pair)
             status.append(f"{pair}:")
             status.append(f"  Price: {price:.2f}")
             status.append(f"  Position: {position:.4f}")
             status.append(f"  RSI: {self.get_current_rsi(pair):.2f}")
+        
+        eth_btc_rsi = self.eth_btc_indicators.values["rsi"]
+        if eth_btc_rsi is not None:
+            status.append(f"ETH/BTC RSI: {eth_btc_rsi:.2f}")
             
         return "\n".join(status)
     
     def get_current_rsi(self, pair):
-        candles_df = self.candles[pair].candles_df
-        if len(candles_df) >= self.rsi_length:
-            return ta.rsi(candles_df["close"], length=self.rsi_length).iloc[-1]
-        return 50
+        # 只读取缓存值，不重新计算
+        rsi = self.indicators[pair].values["rsi"]
+        return rsi if rsi is not None else 50
@@ -0,0 +1,57 @@
+from enum import Enum
+from typing import Callable, Dict, List, Optional
+
+
+class ScheduleDecision(Enum):
+    WAIT = "WAIT"
+    RUN = "RUN"
+    SKIP = "SKIP"
+
+
+class CandleCloseScheduler:
+    """
+    按K线收盘触发策略计算。每根K线收盘offset秒后到期，到期前每个tick只比较一次时间戳。
+    到期后，所有交易对的最新K线都已进入新的周期（上一根K线已完整）才返回RUN；
+    如果等待超过max_feed_delay秒仍有数据源没有更新，返回SKIP并跳过这根K线。
+    启动时如果最近一次收盘已经过去，会立即对最近的完整K线计算一次。
+    """
+
+    def __init__(self, interval: float, offset: float = 0, max_feed_delay: float = 300):
+        self.interval = interval
+        self.offset = offset
+        self.max_feed_delay = max_feed_delay
+        self.next_close: Optional[float] = None
+        self.last_close: Optional[float] = None
+        self._due_since: Optional[float] = None
+
+    def get_close_time(self, timestamp: float) -> float:
+        # 当前时间之前最近一次K线收盘的时间（即当前K线的开盘时间）
+        return (timestamp - self.offset) // self.interval * self.interval
+
+    def check(self, timestamp: float, get_candle_timestamps: Callable[[], Dict[str, Optional[float]]]) -> ScheduleDecision:
+        """
+        :param get_candle_timestamps: 返回各交易对最新K线开盘时间的函数，只在到期后调用。
+        """
+        if self.next_close is None:
+            self.next_close = self.get_close_time(timestamp)
+        if timestamp < self.next_close + self.offset:
+            return ScheduleDecision.WAIT
+        if self._due_since is None:
+            self._due_since = timestamp
+        candle_timestamps = get_candle_timestamps()
+        if all(candle_timestamp is not None and candle_timestamp >= self.next_close
+               for candle_timestamp in candle_timestamps.values()):
+            decision = ScheduleDecision.RUN
+        elif timestamp - self._due_since >= self.max_feed_delay:
+            decision = ScheduleDecision.SKIP
+        else:
+            return ScheduleDecision.WAIT
+        self.last_close = self.next_close
+        self.next_close = max(self.next_close + self.interval, self.get_close_time(timestamp))
+        self._due_since = None
+        return decision
+
+    def get_stale_pairs(self, candle_timestamps: Dict[str, Optional[float]]) -> List[str]:
+        # 最近一次到期时没有更新到新K线的交易对
+        return [pair for pair, candle_timestamp in candle_timestamps.items()
+                if candle_timestamp is None or candle_timestamp < self.last_close]
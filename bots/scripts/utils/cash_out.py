@@ -0,0 +1,94 @@
+from enum import Enum
+from typing import Dict, Iterable, List
+
+from hummingbot.strategy_v2.models.base import RunnableStatus
+from hummingbot.strategy_v2.models.executor_actions import StopExecutorAction
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+class CashOutState(Enum):
+    IDLE = "IDLE"
+    STOPPING = "STOPPING"
+    DONE = "DONE"
+
+
+class CashOutCoordinator:
+    """
+    State machine of the cash out of the strategy. Once started, the running executors without a position are queued
+    to be stopped, and the queue is fed with the executors created or updated afterwards instead of rescanning all of
+    them on every tick. The stops are sent in batches of max_stops_per_batch executors per connector, at most one batch
+    per connector every batch_interval seconds, and each executor is only stopped again if it is still running
+    stop_retry_interval seconds after its stop was sent. The cash out is done when no executor is running.
+    """
+
+    def __init__(self, max_stops_per_batch: int = 20, batch_interval: float = 1, stop_retry_interval: float = 30):
+        self.max_stops_per_batch = max_stops_per_batch
+        self.batch_interval = batch_interval
+        self.stop_retry_interval = stop_retry_interval
+        self.state = CashOutState.IDLE
+        self.running_executors: Dict[str, ExecutorInfo] = {}
+        self.pending_stops: Dict[str, float] = {}
+        self._queues: Dict[str, Dict[str, ExecutorInfo]] = {}
+        self._last_batch_timestamp: Dict[str, float] = {}
+
+    @property
+    def queued_stops(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def start(self, running_executors: Iterable[ExecutorInfo]):
+        self.state = CashOutState.STOPPING
+        self.on_executors_update(running_executors)
+
+    def on_executors_update(self, executors: Iterable[ExecutorInfo]):
+        """
+        Apply the executors created or updated since the last update.
+        """
+        if self.state != CashOutState.STOPPING:
+            return
+        for executor in executors:
+            if executor.status != RunnableStatus.RUNNING or executor.is_done:
+                self.running_executors.pop(executor.id, None)
+                self.pending_stops.pop(executor.id, None)
+                self._dequeue(executor)
+                continue
+            self.running_executors[executor.id] = executor
+            if executor.is_trading:
+                self._dequeue(executor)
+            elif executor.id not in self.pending_stops:
+                self._queues.setdefault(self.get_queue_key(executor), {})[executor.id] = executor
+        if not self.running_executors:
+            self.state = CashOutState.DONE
+
+    @staticmethod
+    def get_queue_key(executor: ExecutorInfo) -> str:
+        return executor.connector_name or ""
+
+    def _dequeue(self, executor: ExecutorInfo):
+        queue = self._queues.get(self.get_queue_key(executor))
+        if queue is not None:
+            queue.pop(executor.id, None)
+
+    def get_stop_actions(self, timestamp: float) -> List[StopExecutorAction]:
+        """
+        Next batch of stops of every connector that is not rate limited.
+        """
+        if self.state != CashOutState.STOPPING:
+            return []
+        for executor_id, stop_timestamp in list(self.pending_stops.items()):
+            if timestamp - stop_timestamp >= self.stop_retry_interval:
+                executor = self.running_executors[executor_id]
+                del self.pending_stops[executor_id]
+                if not executor.is_trading:
+                    self._queues.setdefault(self.get_queue_key(executor), {})[executor_id] = executor
+        actions = []
+        for queue_key, queue in self._queues.items():
+            last_batch_timestamp = self._last_batch_timestamp.get(queue_key)
+            if not queue or (last_batch_timestamp is not None and timestamp - last_batch_timestamp < self.batch_interval):
+                continue
+            batch = list(queue.values())[:self.max_stops_per_batch]
+            for executor in batch:
+                del queue[executor.id]
+                self.pending_stops[executor.id] = timestamp
+                actions.append(StopExecutorAction(executor_id=executor.id, controller_id=executor.controller_id))
+            self._last_batch_timestamp[queue_key] = timestamp
+        return actions
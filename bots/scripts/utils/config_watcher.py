@@ -0,0 +1,69 @@
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+
+class ConfigFileWatcher:
+    """
+    Detects the changes of a set of config files by polling their modification time every poll_interval seconds.
+    A change is only reported once the file has not been modified for debounce seconds, so a file that is being
+    written or saved several times in a row is parsed once.
+    """
+
+    def __init__(self, directory: str, file_names: Sequence[str], poll_interval: float = 5, debounce: float = 2):
+        self.directory = directory
+        self.file_names = list(file_names)
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._mtimes: Dict[str, Optional[int]] = {file_name: self.get_mtime(file_name) for file_name in self.file_names}
+        self._pending_changes: Dict[str, float] = {}
+        self._last_poll_timestamp = 0
+
+    def get_mtime(self, file_name: str) -> Optional[int]:
+        try:
+            return os.stat(os.path.join(self.directory, file_name)).st_mtime_ns
+        except OSError:
+            return None
+
+    def poll(self, timestamp: float) -> List[str]:
+        """
+        :return: names of the files changed and stable for the debounce time.
+        """
+        if timestamp - self._last_poll_timestamp < self.poll_interval:
+            return []
+        self._last_poll_timestamp = timestamp
+        changed_files = []
+        for file_name in self.file_names:
+            mtime = self.get_mtime(file_name)
+            if mtime != self._mtimes.get(file_name):
+                self._mtimes[file_name] = mtime
+                self._pending_changes[file_name] = timestamp
+            elif file_name in self._pending_changes and \
+                    timestamp - self._pending_changes[file_name] >= self.debounce and mtime is not None:
+                del self._pending_changes[file_name]
+                changed_files.append(file_name)
+        return changed_files
+
+
+def get_config_changes(config: BaseModel, config_data: Dict[str, Any],
+                       new_config_data: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Compare two versions of the data of a config file. The raw data is compared instead of the running config because
+    the controllers can fill some fields at runtime, like the candles config.
+    :param config: new config parsed from new_config_data.
+    :return: new values of the changed fields marked as is_updatable, and names of the changed fields that are not
+    updatable.
+    """
+    updates = {}
+    not_updatable = []
+    model_fields = type(config).model_fields
+    for field_name in sorted(set(config_data) | set(new_config_data)):
+        if field_name not in model_fields or config_data.get(field_name) == new_config_data.get(field_name):
+            continue
+        json_schema_extra = model_fields[field_name].json_schema_extra or {}
+        if isinstance(json_schema_extra, dict) and json_schema_extra.get("is_updatable", False):
+            updates[field_name] = getattr(config, field_name)
+        else:
+            not_updatable.append(field_name)
+    return updates, not_updatable
@@ -0,0 +1,113 @@
+import hashlib
+import sqlite3
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class HighWaterMarkStore:
+    """
+    High-water marks of the PnL persisted in a small SQLite table, so they survive a restart of the bot. The values
+    are kept in memory and the changed ones are written in a single transaction at most every flush_interval seconds.
+    """
+
+    def __init__(self, db_path: str, flush_interval: float = 10):
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self._connection = sqlite3.connect(db_path)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS high_water_marks "
+                                 "(key TEXT PRIMARY KEY, value TEXT NOT NULL, timestamp REAL NOT NULL)")
+        self._connection.commit()
+        self.values: Dict[str, Decimal] = {
+            key: Decimal(value) for key, value in self._connection.execute("SELECT key, value FROM high_water_marks")}
+        self._pending_writes: Dict[str, Tuple[str, float]] = {}
+        self._last_flush_timestamp = 0
+
+    def get(self, key: str, default: Decimal = Decimal("0")) -> Decimal:
+        return self.values.get(key, default)
+
+    def set(self, key: str, value: Decimal, timestamp: float):
+        self.values[key] = value
+        self._pending_writes[key] = (str(value), timestamp)
+
+    def remove(self, keys: Iterable[str]):
+        keys = [key for key in keys if key in self.values]
+        if not keys:
+            return
+        for key in keys:
+            del self.values[key]
+            self._pending_writes.pop(key, None)
+        with self._connection:
+            self._connection.executemany("DELETE FROM high_water_marks WHERE key = ?", [(key,) for key in keys])
+
+    def flush(self, timestamp: Optional[float] = None):
+        """
+        Write the pending values, if timestamp is provided only when flush_interval seconds passed since the last
+        flush.
+        """
+        if not self._pending_writes:
+            return
+        if timestamp is not None and timestamp - self._last_flush_timestamp < self.flush_interval:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO high_water_marks (key, value, timestamp) VALUES (?, ?, ?)",
+                [(key, value, write_timestamp) for key, (value, write_timestamp) in self._pending_writes.items()])
+        self._pending_writes.clear()
+        if timestamp is not None:
+            self._last_flush_timestamp = timestamp
+
+    def close(self):
+        self.flush()
+        self._connection.close()
+
+
+class DrawdownMonitor:
+    """
+    Drawdown of each controller and of the sum of all of them from the high-water mark of their global PnL. The PnL
+    is fed only for the controllers whose performance report changed, and the global PnL is kept as a running sum,
+    so an update costs O(changed controllers). The contribution of the controllers that are removed is subtracted from
+    the global PnL. The global high-water mark is stored with a fingerprint of the controller ids it was computed for,
+    and it is reset when the set of controllers changes.
+    """
+    GLOBAL_KEY = "__global__"
+
+    def __init__(self, store: HighWaterMarkStore, controller_ids: Iterable[str]):
+        self.store = store
+        self.global_pnl = Decimal("0")
+        self._pnl_by_controller: Dict[str, Decimal] = {}
+        self.controller_ids: Set[str] = set(controller_ids)
+        self.global_key = self.get_global_key(self.controller_ids)
+        self.store.remove([key for key in self.store.values
+                           if key.startswith(self.GLOBAL_KEY) and key != self.global_key])
+
+    @classmethod
+    def get_global_key(cls, controller_ids: Iterable[str]) -> str:
+        fingerprint = hashlib.sha256(",".join(sorted(controller_ids)).encode()).hexdigest()[:16]
+        return f"{cls.GLOBAL_KEY}:{fingerprint}"
+
+    def update(self, reports: Dict[str, Dict], changed_controllers: Iterable[str], timestamp: float):
+        for controller_id in changed_controllers:
+            pnl = reports[controller_id]["global_pnl_quote"]
+            self.global_pnl += pnl - self._pnl_by_controller.get(controller_id, Decimal("0"))
+            self._pnl_by_controller[controller_id] = pnl
+            if pnl > self.store.get(controller_id):
+                self.store.set(controller_id, pnl, timestamp)
+        if self.global_pnl > self.store.get(self.global_key):
+            self.store.set(self.global_key, self.global_pnl, timestamp)
+        self.store.flush(timestamp)
+
+    def remove(self, controller_ids: Iterable[str]):
+        controller_ids = set(controller_ids)
+        if not controller_ids & self.controller_ids:
+            return
+        for controller_id in controller_ids:
+            self.global_pnl -= self._pnl_by_controller.pop(controller_id, Decimal("0"))
+        self.controller_ids -= controller_ids
+        previous_global_key, self.global_key = self.global_key, self.get_global_key(self.controller_ids)
+        self.store.remove([previous_global_key])
+
+    def get_drawdown(self, controller_id: str) -> Decimal:
+        return self.store.get(controller_id) - self._pnl_by_controller.get(controller_id, Decimal("0"))
+
+    def get_global_drawdown(self) -> Decimal:
+        return self.store.get(self.global_key) - self.global_pnl
@@ -0,0 +1,115 @@
+import json
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Set
+
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+@dataclass
+class ArchivedExecutorsSummary:
+    """
+    Aggregated stats of the executors archived for a controller.
+    """
+    executors: int = 0
+    net_pnl_quote: Decimal = Decimal("0")
+    volume_traded: Decimal = Decimal("0")
+    cum_fees_quote: Decimal = Decimal("0")
+    close_type_counts: Dict[str, int] = field(default_factory=dict)
+
+    def add(self, executor: ExecutorInfo):
+        self.executors += 1
+        self.net_pnl_quote += executor.net_pnl_quote
+        self.volume_traded += executor.filled_amount_quote
+        self.cum_fees_quote += executor.cum_fees_quote
+        close_type = executor.close_type.name if executor.close_type else "NONE"
+        self.close_type_counts[close_type] = self.close_type_counts.get(close_type, 0) + 1
+
+
+class ExecutorArchive:
+    """
+    Archival tier of the executors that are done. The executors closed for more than archive_after seconds are removed
+    from the working set that the controllers scan on every tick, added to a summary by controller and appended to a
+    JSON lines log in log_path. An executor is only archived once is_reported confirms that its done state was seen by
+    the executors tracker, so the index and the performance reports never miss it. The executor orchestrator keeps its
+    own state, so the performance reports are not affected by the archive. The ids of the archived executors are kept
+    only while the orchestrator still reports them.
+    """
+
+    def __init__(self, archive_after: float, log_path: Optional[str] = None):
+        self.archive_after = archive_after
+        self.log_path = log_path
+        self.summary_by_controller: Dict[str, ArchivedExecutorsSummary] = {}
+        self._archived_by_controller: Dict[str, Set[str]] = {}
+        self._pending_records: List[Dict] = []
+
+    @property
+    def archived_executors(self) -> int:
+        return sum(summary.executors for summary in self.summary_by_controller.values())
+
+    def is_expired(self, executor: ExecutorInfo, timestamp: float) -> bool:
+        return executor.is_done and executor.close_timestamp is not None and \
+            executor.close_timestamp + self.archive_after <= timestamp
+
+    def prune(self, controller_id: str, executors: List[ExecutorInfo], timestamp: float,
+              is_reported: Callable[[ExecutorInfo], bool]) -> List[ExecutorInfo]:
+        """
+        Archive the expired executors of the controller.
+        :param is_reported: tells if the done state of the executor was already reported to the strategy.
+        :return: working set with the active executors and the ones closed recently.
+        """
+        archived = self._archived_by_controller.get(controller_id, set())
+        still_archived = set()
+        working_set = []
+        for executor in executors:
+            if executor.id in archived:
+                still_archived.add(executor.id)
+            elif self.is_expired(executor, timestamp) and is_reported(executor):
+                self.archive(executor)
+                still_archived.add(executor.id)
+            else:
+                working_set.append(executor)
+        self._archived_by_controller[controller_id] = still_archived
+        return working_set
+
+    def archive(self, executor: ExecutorInfo):
+        if executor.controller_id not in self.summary_by_controller:
+            self.summary_by_controller[executor.controller_id] = ArchivedExecutorsSummary()
+        self.summary_by_controller[executor.controller_id].add(executor)
+        if self.log_path:
+            self._pending_records.append(self.to_record(executor))
+
+    @staticmethod
+    def to_record(executor: ExecutorInfo) -> Dict:
+        return {
+            "id": executor.id,
+            "controller_id": executor.controller_id,
+            "type": executor.type,
+            "connector_name": executor.connector_name,
+            "trading_pair": executor.trading_pair,
+            "side": executor.side.name if executor.side else None,
+            "timestamp": executor.timestamp,
+            "close_timestamp": executor.close_timestamp,
+            "close_type": executor.close_type.name if executor.close_type else None,
+            "net_pnl_quote": str(executor.net_pnl_quote),
+            "filled_amount_quote": str(executor.filled_amount_quote),
+            "cum_fees_quote": str(executor.cum_fees_quote),
+        }
+
+    def flush(self):
+        """
+        Append the executors archived since the last flush to the log.
+        """
+        if not self._pending_records:
+            return
+        with open(self.log_path, "a") as log_file:
+            log_file.writelines(json.dumps(record) + "\n" for record in self._pending_records)
+        self._pending_records = []
+
+    def format_summary(self) -> List[str]:
+        lines = []
+        for controller_id, summary in self.summary_by_controller.items():
+            close_types = ", ".join(f"{close_type}: {count}" for close_type, count in summary.close_type_counts.items())
+            lines.append(f"  {controller_id}: {summary.executors} executors | PnL: {summary.net_pnl_quote:.4f} | "
+                         f"Volume: {summary.volume_traded:.2f} | Fees: {summary.cum_fees_quote:.4f} | {close_types}")
+        return lines
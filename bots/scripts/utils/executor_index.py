@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from hummingbot.core.data_type.common import TradeType
+from hummingbot.strategy_v2.models.base import RunnableStatus
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+class ExecutorKey(NamedTuple):
+    controller_id: str
+    connector_name: Optional[str]
+    trading_pair: Optional[str]
+    status: RunnableStatus
+    is_trading: bool
+    side: Optional[TradeType]
+
+    @classmethod
+    def from_executor(cls, executor: ExecutorInfo) -> "ExecutorKey":
+        return cls(controller_id=executor.controller_id,
+                   connector_name=executor.connector_name,
+                   trading_pair=executor.trading_pair,
+                   status=executor.status,
+                   is_trading=executor.is_trading,
+                   side=executor.side)
+
+
+class ExecutorIndex:
+    """
+    Index of the executors that are not done, grouped by (controller_id, connector_name, trading_pair, status,
+    is_trading, side). The index is updated with the executors created or updated since the last tick, so the queries
+    only visit the groups that match the filters instead of scanning every executor.
+    """
+
+    def __init__(self):
+        self._executors_by_key: Dict[ExecutorKey, Dict[str, ExecutorInfo]] = {}
+        self._key_by_executor_id: Dict[str, ExecutorKey] = {}
+        self._keys_by_controller: Dict[str, Set[ExecutorKey]] = {}
+        self._keys_by_market: Dict[Tuple[str, str], Set[ExecutorKey]] = {}
+
+    def update(self, executors: Iterable[ExecutorInfo]):
+        for executor in executors:
+            self._remove(executor.id)
+            if executor.is_done:
+                continue
+            key = ExecutorKey.from_executor(executor)
+            if key not in self._executors_by_key:
+                self._executors_by_key[key] = {}
+                self._keys_by_controller.setdefault(key.controller_id, set()).add(key)
+                self._keys_by_market.setdefault((key.connector_name, key.trading_pair), set()).add(key)
+            self._executors_by_key[key][executor.id] = executor
+            self._key_by_executor_id[executor.id] = key
+
+    def remove(self, executor_ids: Iterable[str]):
+        for executor_id in executor_ids:
+            self._remove(executor_id)
+
+    def _remove(self, executor_id: str):
+        key = self._key_by_executor_id.pop(executor_id, None)
+        if key is None:
+            return
+        executors = self._executors_by_key[key]
+        del executors[executor_id]
+        if not executors:
+            del self._executors_by_key[key]
+            self._keys_by_controller[key.controller_id].discard(key)
+            self._keys_by_market[(key.connector_name, key.trading_pair)].discard(key)
+
+    def get_executors(self, controller_id: Optional[str] = None, connector_name: Optional[str] = None,
+                      trading_pair: Optional[str] = None, status: Optional[RunnableStatus] = None,
+                      is_trading: Optional[bool] = None, side: Optional[TradeType] = None) -> List[ExecutorInfo]:
+        """
+        Get the active executors that match all the filters provided, a filter with None value is not applied.
+        """
+        if controller_id is not None:
+            keys = self._keys_by_controller.get(controller_id, set())
+        elif connector_name is not None and trading_pair is not None:
+            keys = self._keys_by_market.get((connector_name, trading_pair), set())
+        else:
+            keys = self._executors_by_key.keys()
+        executors = []
+        for key in keys:
+            if (connector_name is not None and key.connector_name != connector_name) or \
+                    (trading_pair is not None and key.trading_pair != trading_pair) or \
+                    (status is not None and key.status != status) or \
+                    (is_trading is not None and key.is_trading != is_trading) or \
+                    (side is not None and key.side != side):
+                continue
+            executors.extend(self._executors_by_key[key].values())
+        return executors
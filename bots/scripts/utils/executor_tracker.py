@@ -0,0 +1,70 @@
+from typing import Dict, List, Optional, Tuple
+
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+class ExecutorTracker:
+    """
+    Keeps a small fingerprint of the executors that are not done and returns, on each sync, only the executors that
+    were created or updated since the previous sync. Once an executor is done its state can not change anymore, so it
+    is reported once and skipped on the following syncs. An executor closed before the previous sync was already
+    reported by it, so it is skipped by its close timestamp, and only the ids of the executors closed since the previous
+    sync are kept. The executors that are not done and disappear from the executors info are listed in
+    removed_executors.
+    """
+
+    def __init__(self):
+        self._fingerprints: Dict[str, Tuple] = {}
+        self._recently_done: Dict[str, Optional[float]] = {}
+        self.last_sync_timestamp: Optional[float] = None
+        self.removed_executors: List[str] = []
+
+    @staticmethod
+    def fingerprint(executor: ExecutorInfo) -> Tuple:
+        return (executor.status, executor.is_active, executor.is_trading, executor.close_type,
+                executor.net_pnl_quote, executor.filled_amount_quote, executor.cum_fees_quote)
+
+    def is_reported(self, executor: ExecutorInfo) -> bool:
+        """
+        True if the executor is done and a previous sync already reported it.
+        """
+        if not executor.is_done:
+            return False
+        close_timestamp = executor.close_timestamp
+        if close_timestamp is not None and self.last_sync_timestamp is not None and \
+                close_timestamp < self.last_sync_timestamp:
+            return True
+        return executor.id in self._recently_done
+
+    def sync(self, executors_info: Dict[str, List[ExecutorInfo]], timestamp: float) -> List[ExecutorInfo]:
+        """
+        Compare the executors info against the last known state.
+        :param executors_info: executors info by controller id, as kept by the strategy.
+        :param timestamp: current timestamp, the executors closed before it are not reported again.
+        :return: list of executors that were created or updated since the last sync.
+        """
+        changed_executors = []
+        active_executors = set()
+        for executors in executors_info.values():
+            for executor in executors:
+                if self.is_reported(executor):
+                    continue
+                if executor.is_done:
+                    changed_executors.append(executor)
+                    self._fingerprints.pop(executor.id, None)
+                    self._recently_done[executor.id] = executor.close_timestamp
+                    continue
+                active_executors.add(executor.id)
+                fingerprint = self.fingerprint(executor)
+                if self._fingerprints.get(executor.id) != fingerprint:
+                    changed_executors.append(executor)
+                    self._fingerprints[executor.id] = fingerprint
+        self.removed_executors = [executor_id for executor_id in self._fingerprints
+                                  if executor_id not in active_executors]
+        for executor_id in self.removed_executors:
+            del self._fingerprints[executor_id]
+        self._recently_done = {executor_id: close_timestamp
+                               for executor_id, close_timestamp in self._recently_done.items()
+                               if close_timestamp is None or close_timestamp >= timestamp}
+        self.last_sync_timestamp = timestamp
+        return changed_executors
@@ -0,0 +1,130 @@
+from collections import deque
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+class IncrementalRSI:
+    """
+    增量计算的Wilder RSI，与pandas_ta的rsi结果一致（rma为alpha=1/length的ewm）。
+    update只在K线收盘后推进状态，peek用未收盘K线的价格计算当前值而不修改状态，两者都是O(1)。
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1 - 1 / length
+        self.last_close: Optional[float] = None
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.weight_sum = 0.0
+        self.count = 0
+
+    def _step(self, close: float):
+        change = close - self.last_close
+        return (max(change, 0.0) + self.decay * self.gain_sum,
+                max(-change, 0.0) + self.decay * self.loss_sum,
+                1 + self.decay * self.weight_sum)
+
+    def update(self, close: float):
+        if self.last_close is not None:
+            self.gain_sum, self.loss_sum, self.weight_sum = self._step(close)
+            self.count += 1
+        self.last_close = close
+
+    def peek(self, close: float) -> Optional[float]:
+        if self.last_close is None or self.count + 1 < self.length:
+            return None
+        gain_sum, loss_sum, _ = self._step(close)
+        # 权重和相同，直接用加权和计算比例
+        if gain_sum + loss_sum == 0:
+            return None
+        return 100 * gain_sum / (gain_sum + loss_sum)
+
+    @property
+    def value(self) -> Optional[float]:
+        # 最后一根已收盘K线的RSI
+        if self.count < self.length or self.gain_sum + self.loss_sum == 0:
+            return None
+        return 100 * self.gain_sum / (self.gain_sum + self.loss_sum)
+
+
+class RollingSMA:
+    """
+    滚动SMA，保存最近length根已收盘K线的收盘价和它们的和，peek用当前价格替换最早的收盘价得到SMA。
+    """
+
+    def __init__(self, length: int):
+        self.length = length
+        self.closes = deque(maxlen=length)
+        self.total = 0.0
+
+    def update(self, close: float):
+        if len(self.closes) == self.closes.maxlen:
+            self.total -= self.closes[0]
+        self.closes.append(close)
+        self.total += close
+
+    def peek(self, close: float) -> Optional[float]:
+        if len(self.closes) < self.length - 1:
+            return None
+        oldest = self.closes[0] if len(self.closes) == self.length else 0.0
+        return (self.total - oldest + close) / self.length
+
+    @property
+    def value(self) -> Optional[float]:
+        # 最后一根已收盘K线的SMA
+        if len(self.closes) < self.length:
+            return None
+        return self.total / self.length
+
+
+class PairIndicatorCache:
+    """
+    单个交易对的指标缓存。状态只在出现新的日K线时推进（只处理新收盘的K线），
+    当前值在最后一根K线的时间或价格变化时用peek重新计算，否则直接返回缓存值。
+    closed_values是最后一根已收盘K线的指标，用于只在完整K线上计算的信号。
+    """
+
+    def __init__(self, rsi_length: int, sma_length: int):
+        self.rsi_length = rsi_length
+        self.sma_length = sma_length
+        self.reset()
+
+    def reset(self):
+        self.rsi = IncrementalRSI(self.rsi_length)
+        self.sma = RollingSMA(self.sma_length)
+        self.last_closed_timestamp: Optional[float] = None
+        self._last_candle = None
+        self.values: Dict[str, Optional[float]] = {"rsi": None, "sma": None, "close": None}
+        self.closed_values: Dict[str, Optional[float]] = {"rsi": None, "sma": None, "close": None}
+
+    @property
+    def last_candle_timestamp(self) -> Optional[float]:
+        return self._last_candle[0] if self._last_candle is not None else None
+
+    def update(self, candles_df: pd.DataFrame) -> Dict[str, Optional[float]]:
+        if len(candles_df) == 0:
+            return self.values
+        timestamps = candles_df["timestamp"].values
+        closes = candles_df["close"].values
+        last_candle = (timestamps[-1], closes[-1])
+        if last_candle == self._last_candle:
+            return self.values
+        # 数据被重置（例如重新连接后时间倒退），重新计算全部状态
+        if self.last_closed_timestamp is not None and timestamps[-1] < self.last_closed_timestamp:
+            self.reset()
+        # 只推进新收盘的K线，最后一根K线还未收盘
+        start = 0
+        if self.last_closed_timestamp is not None:
+            start = timestamps[:-1].searchsorted(self.last_closed_timestamp, side="right")
+        for close in closes[start:-1]:
+            self.rsi.update(float(close))
+            self.sma.update(float(close))
+        if len(timestamps) > 1 and start < len(timestamps) - 1:
+            self.last_closed_timestamp = timestamps[-2]
+            self.closed_values = {"rsi": self.rsi.value, "sma": self.sma.value, "close": float(closes[-2])}
+        close = float(closes[-1])
+        self.values = {"rsi": self.rsi.peek(close), "sma": self.sma.peek(close), "close": close}
+        self._last_candle = last_candle
+        return self.values
+
@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+from hummingbot.connector.connector_base import ConnectorBase
+from hummingbot.connector.trading_rule import TradingRule
+from hummingbot.core.data_type.common import PositionMode
+from hummingbot.strategy_v2.controllers.controller_base import ControllerBase
+
+
+@dataclass
+class ConnectorMetadata:
+    connector_name: str
+    is_perpetual: bool
+    position_mode: Optional[PositionMode] = None
+
+
+@dataclass
+class ControllerMetadata:
+    controller_id: str
+    connector_name: Optional[str]
+    trading_pairs: List[str]
+    is_perpetual: bool
+    position_mode: Optional[PositionMode]
+    leverage: Optional[int]
+
+
+class MetadataRegistry:
+    """
+    Connector type, position mode, leverage and trading rules of the connectors and controllers of the strategy.
+    The metadata is read once from the controllers configs, instead of serializing them on every check, and the type
+    of the connectors is taken from the connector settings instead of matching their name. The controllers are
+    refreshed when their config is reloaded. The trading rules are read through to the connector, which refreshes them
+    periodically, so they are never older than the connector's.
+    The trading pairs of a controller are the ones it declares in its markets for its connector, so a controller that
+    trades several pairs, like a multi-grid GridStrike, gets the leverage set for all of them.
+    """
+
+    def __init__(self, connectors: Dict[str, ConnectorBase], derivative_names: Set[str]):
+        self._connectors = connectors
+        self.derivative_names = derivative_names
+        self.connectors: Dict[str, ConnectorMetadata] = {
+            connector_name: ConnectorMetadata(connector_name=connector_name,
+                                              is_perpetual=connector_name in derivative_names)
+            for connector_name in connectors}
+        self.controllers: Dict[str, ControllerMetadata] = {}
+
+    def build(self, controllers: Iterable[ControllerBase]):
+        self.controllers.clear()
+        for connector in self.connectors.values():
+            connector.position_mode = None
+        for controller in controllers:
+            self.refresh_controller(controller)
+
+    def refresh_controller(self, controller: ControllerBase):
+        config = controller.config
+        connector_name = getattr(config, "connector_name", None)
+        metadata = ControllerMetadata(controller_id=config.id,
+                                      connector_name=connector_name,
+                                      trading_pairs=self.get_trading_pairs(controller),
+                                      is_perpetual=self.is_perpetual(connector_name),
+                                      position_mode=getattr(config, "position_mode", None),
+                                      leverage=getattr(config, "leverage", None))
+        self.controllers[metadata.controller_id] = metadata
+        connector = self.connectors.get(connector_name)
+        if connector is not None and connector.is_perpetual and metadata.position_mode is not None:
+            connector.position_mode = metadata.position_mode
+
+    @staticmethod
+    def get_trading_pairs(controller: ControllerBase) -> List[str]:
+        config = controller.config
+        connector_name = getattr(config, "connector_name", None)
+        if connector_name is None:
+            return []
+        trading_pairs = config.update_markets({}).get(connector_name, set())
+        trading_pair = getattr(config, "trading_pair", None)
+        if not trading_pairs and trading_pair is not None:
+            trading_pairs = {trading_pair}
+        return sorted(trading_pairs)
+
+    def is_perpetual(self, connector_name: Optional[str]) -> bool:
+        connector = self.connectors.get(connector_name)
+        if connector is not None:
+            return connector.is_perpetual
+        return connector_name in self.derivative_names
+
+    def get_trading_rule(self, connector_name: str, trading_pair: str) -> TradingRule:
+        return self._connectors[connector_name].trading_rules[trading_pair]
+
+    def get_trading_rules(self, connector_name: str, trading_pairs: Iterable[str]) -> Dict[str, TradingRule]:
+        trading_rules = self._connectors[connector_name].trading_rules
+        return {trading_pair: trading_rules[trading_pair] for trading_pair in trading_pairs}
@@ -0,0 +1,68 @@
+from decimal import Decimal
+from typing import Dict, List, Set
+
+import yaml
+from pydantic import BaseModel, Field, model_validator
+
+
+class MultiAssetRSIParams(BaseModel):
+    # 策略参数
+    trading_pairs: List[str] = ["BTC-USDT", "ETH-USDT"]
+    exchange: str = "binance"
+    # RSI参数
+    rsi_length: int = Field(default=14, ge=2)
+    eth_btc_rsi_length: int = Field(default=14, ge=2)
+    bullish_rsi_entry: float = Field(default=70, ge=0, le=100)
+    bullish_rsi_exit: float = Field(default=65, ge=0, le=100)
+    bearish_rsi_entry: float = Field(default=30, ge=0, le=100)
+    bearish_rsi_exit: float = Field(default=35, ge=0, le=100)
+    sma_length: int = Field(default=200, ge=2)
+    # 头寸管理
+    allocation: float = Field(default=0.98, gt=0, le=1)
+    rebalance_threshold: float = Field(default=0.1, ge=0)  # 10%变化触发调仓
+    max_position_ratio: float = Field(default=0.25, gt=0, le=1)  # 单资产最大仓位比例
+    # 风险管理
+    stop_loss_pct: float = Field(default=0.20, gt=0, lt=1)
+    trailing_stop_activation: float = Field(default=0.05, ge=0)  # 5%盈利后启动追踪止损
+    trailing_delta: float = Field(default=0.03, gt=0, lt=1)  # 3%追踪幅度
+    # 调度参数
+    candles_interval: str = "1d"
+    signal_offset: float = Field(default=10, ge=0)  # K线收盘后延迟执行的秒数
+    max_feed_delay: float = Field(default=300, gt=0)  # 等待数据源更新的最长秒数，超时跳过这根K线
+
+    @model_validator(mode="after")
+    def validate_trading_pairs(self):
+        # 市场状态使用BTC-USDT的SMA判断
+        if "BTC-USDT" not in self.trading_pairs:
+            raise ValueError("trading_pairs must include BTC-USDT, used to determine the market regime.")
+        return self
+
+
+class MultiAssetRSIConfig(BaseModel):
+    """
+    multi_asset_rsi_config.yaml的配置模型。params是策略参数，markets是需要连接的交易所和交易对，
+    未设置时由params的exchange和trading_pairs生成。portfolio只是资金分配示例，策略不会使用。
+    """
+    strategy: str = "multi_asset_rsi"
+    script_file: str = "../scripts/multi_asset_rsi.py"
+    markets: Dict[str, List[str]] = {}
+    params: MultiAssetRSIParams = MultiAssetRSIParams()
+    portfolio: Dict[str, Dict[str, Decimal]] = {}
+
+    @model_validator(mode="after")
+    def validate_markets(self):
+        if not self.markets:
+            self.markets = {self.params.exchange: list(self.params.trading_pairs)}
+        missing_pairs = set(self.params.trading_pairs) - set(self.markets.get(self.params.exchange, []))
+        if missing_pairs:
+            raise ValueError(f"The trading pairs {sorted(missing_pairs)} are not in the markets of "
+                             f"{self.params.exchange}.")
+        return self
+
+    @classmethod
+    def load(cls, path: str) -> "MultiAssetRSIConfig":
+        with open(path, "r") as file:
+            return cls(**(yaml.safe_load(file) or {}))
+
+    def get_markets(self) -> Dict[str, Set[str]]:
+        return {connector_name: set(trading_pairs) for connector_name, trading_pairs in self.markets.items()}
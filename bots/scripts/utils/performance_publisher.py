@@ -0,0 +1,110 @@
+import base64
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from hummingbot.remote_iface.mqtt import ETopicPublisher
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class PerformanceReportPublisher:
+    """
+    Publishes the controllers performance reports through the MQTT performance topic.
+    In "full" mode the complete reports dict is sent on every publication, which is the format expected by the
+    backend. In "delta" mode every message is an envelope with a sequence number:
+        {"type": "snapshot", "seq": 10, "reports": {controller_id: report}}
+        {"type": "delta", "seq": 11, "reports": {controller_id: {changed_field: value}}}
+    Deltas only include the controllers and fields that changed since the last message, removed controllers are sent
+    as None. A snapshot is sent at least every max_publish_interval seconds so subscribers that missed a sequence
+    number can resync, and no message is sent more often than min_publish_interval seconds.
+    With encoding "msgpack" the message is packed with msgpack and sent base64 encoded inside
+    {"encoding": "msgpack", "payload": "..."}.
+    """
+    MODES = ("full", "delta")
+    ENCODINGS = ("json", "msgpack")
+
+    def __init__(self, publisher: ETopicPublisher, mode: str = "full", encoding: str = "json",
+                 min_publish_interval: float = 1, max_publish_interval: float = 30):
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid performance report publish mode {mode}. Valid modes: {self.MODES}")
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Invalid performance report encoding {encoding}. Valid encodings: {self.ENCODINGS}")
+        if encoding == "msgpack" and msgpack is None:
+            raise ImportError("The msgpack package is required to publish the performance reports with msgpack.")
+        self._pub = publisher
+        self.mode = mode
+        self.encoding = encoding
+        self.min_publish_interval = min_publish_interval
+        self.max_publish_interval = max_publish_interval
+        self.sequence = 0
+        self._last_published_reports: Dict[str, Dict] = {}
+        self._last_publish_timestamp = 0
+        self._last_snapshot_timestamp = 0
+
+    def publish(self, reports: Dict[str, Dict], timestamp: float):
+        if timestamp - self._last_publish_timestamp < self.min_publish_interval:
+            return
+        if self.mode == "full":
+            self._send(reports)
+        elif timestamp - self._last_snapshot_timestamp >= self.max_publish_interval:
+            self.publish_snapshot(reports, timestamp)
+            return
+        else:
+            delta = self.get_delta(reports)
+            if not delta:
+                return
+            self.sequence += 1
+            self._send({"type": "delta", "seq": self.sequence, "reports": delta})
+        self._last_publish_timestamp = timestamp
+
+    def publish_snapshot(self, reports: Dict[str, Dict], timestamp: float):
+        self.sequence += 1
+        self._send({"type": "snapshot", "seq": self.sequence, "reports": reports})
+        self._last_published_reports = {controller_id: self._copy_report(report)
+                                        for controller_id, report in reports.items()}
+        self._last_publish_timestamp = timestamp
+        self._last_snapshot_timestamp = timestamp
+
+    def publish_final(self, controller_ids):
+        empty_reports = {controller_id: {} for controller_id in controller_ids}
+        if self.mode == "full":
+            self._send(empty_reports)
+        else:
+            self.sequence += 1
+            self._send({"type": "snapshot", "seq": self.sequence, "reports": empty_reports})
+
+    def get_delta(self, reports: Dict[str, Dict]) -> Dict[str, Optional[Dict]]:
+        delta = {}
+        for controller_id, report in reports.items():
+            last_report = self._last_published_reports.get(controller_id, {})
+            changed_fields = {key: value for key, value in report.items() if last_report.get(key) != value}
+            if changed_fields:
+                delta[controller_id] = changed_fields
+                self._last_published_reports[controller_id] = self._copy_report(report)
+        for controller_id in self._last_published_reports.keys() - reports.keys():
+            delta[controller_id] = None
+            del self._last_published_reports[controller_id]
+        return delta
+
+    def _send(self, message: Dict[str, Any]):
+        if self.encoding == "msgpack":
+            payload = msgpack.packb(message, default=self._encode_msgpack_value)
+            message = {"encoding": "msgpack", "payload": base64.b64encode(payload).decode("ascii")}
+        self._pub(message)
+
+    @staticmethod
+    def _copy_report(report: Dict) -> Dict:
+        # The reports are updated in place by the report engine, so nested dicts are copied to keep the last state.
+        return {key: dict(value) if isinstance(value, dict) else value for key, value in report.items()}
+
+    @staticmethod
+    def _encode_msgpack_value(value: Any):
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, Enum):
+            return value.name
+        return str(value)
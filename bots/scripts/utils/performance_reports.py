@@ -0,0 +1,157 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from hummingbot.core.data_type.common import PriceType
+from hummingbot.strategy_v2.executors.executor_orchestrator import ExecutorOrchestrator
+from hummingbot.strategy_v2.models.executors import CloseType
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+
+
+class ExecutorContribution(NamedTuple):
+    controller_id: str
+    is_done: bool
+    net_pnl_quote: Decimal
+    filled_amount_quote: Decimal
+    close_type: Optional[CloseType]
+
+    @classmethod
+    def from_executor(cls, executor: ExecutorInfo) -> "ExecutorContribution":
+        return cls(controller_id=executor.controller_id,
+                   is_done=executor.is_done,
+                   net_pnl_quote=executor.net_pnl_quote,
+                   filled_amount_quote=executor.filled_amount_quote,
+                   close_type=executor.close_type)
+
+
+class PositionsContribution(NamedTuple):
+    realized_pnl_quote: Decimal = Decimal("0")
+    unrealized_pnl_quote: Decimal = Decimal("0")
+    volume_traded: Decimal = Decimal("0")
+
+    @classmethod
+    def from_positions_summary(cls, positions_summary: List[Dict]) -> "PositionsContribution":
+        return cls(
+            realized_pnl_quote=sum((summary["realized_pnl_quote"] - summary["cum_fees_quote"]
+                                    for summary in positions_summary), Decimal("0")),
+            unrealized_pnl_quote=sum((summary["unrealized_pnl_quote"] for summary in positions_summary), Decimal("0")),
+            volume_traded=sum((summary["volume_traded_quote"] for summary in positions_summary), Decimal("0")))
+
+
+class IncrementalPerformanceReports:
+    """
+    Keeps the performance report of each controller up to date by applying only the changes of the executors that
+    were marked as dirty since the last update, instead of regenerating every report on each tick.
+    The running aggregates (realized and unrealized pnl, volume, fees and close types) are updated with the difference
+    between the new and the previous contribution of each dirty executor. The positions held are valued at the mid
+    price on every update, as the orchestrator does, and only for the controllers that hold positions. Every
+    full_recompute_interval seconds the reports are regenerated from the executor orchestrator. The reports have the
+    same fields as the ones of the orchestrator.
+    """
+
+    def __init__(self, executor_orchestrator: ExecutorOrchestrator, full_recompute_interval: int = 60):
+        self.executor_orchestrator = executor_orchestrator
+        self.full_recompute_interval = full_recompute_interval
+        self.reports: Dict[str, Dict] = {}
+        self.updated_controllers: Set[str] = set()
+        self.removed_controllers: Set[str] = set()
+        self._contributions: Dict[str, ExecutorContribution] = {}
+        self._positions_contributions: Dict[str, PositionsContribution] = {}
+        self._dirty_executors: Dict[str, ExecutorInfo] = {}
+        self._last_full_recompute_timestamp = 0
+
+    def mark_dirty(self, executors: Iterable[ExecutorInfo]):
+        for executor in executors:
+            self._dirty_executors[executor.id] = executor
+
+    def update(self, controller_ids: Iterable[str], timestamp: float) -> Dict[str, Dict]:
+        """
+        Apply the pending executor updates to the reports.
+        :param controller_ids: ids of the controllers that must have a report.
+        :param timestamp: current timestamp, used to schedule the full recompute.
+        :return: the performance reports by controller id.
+        """
+        controller_ids = list(controller_ids)
+        self.updated_controllers = set()
+        self.removed_controllers = self.reports.keys() - set(controller_ids)
+        for controller_id in self.removed_controllers:
+            del self.reports[controller_id]
+            self._positions_contributions.pop(controller_id, None)
+        for executor in self._dirty_executors.values():
+            self._apply_executor_update(executor)
+        self._dirty_executors.clear()
+        missing_reports = any(controller_id not in self.reports for controller_id in controller_ids)
+        if missing_reports or timestamp - self._last_full_recompute_timestamp >= self.full_recompute_interval:
+            self.full_recompute(controller_ids)
+            self._last_full_recompute_timestamp = timestamp
+        else:
+            self._update_positions_held()
+            for controller_id in self.updated_controllers:
+                self._update_pct_fields(self.reports[controller_id])
+        return self.reports
+
+    def full_recompute(self, controller_ids: List[str]):
+        for controller_id in controller_ids:
+            report = self.executor_orchestrator.generate_performance_report(controller_id=controller_id).dict()
+            self._positions_contributions[controller_id] = PositionsContribution.from_positions_summary(
+                report["positions_summary"])
+            self.reports[controller_id] = report
+        self.updated_controllers = set(controller_ids)
+
+    def _apply_executor_update(self, executor: ExecutorInfo):
+        contribution = ExecutorContribution.from_executor(executor)
+        previous = self._contributions.pop(executor.id, None)
+        if not contribution.is_done:
+            self._contributions[executor.id] = contribution
+        controller_id = contribution.controller_id
+        report = self.reports.get(controller_id)
+        if report is None:
+            return
+        if previous is not None:
+            pnl_key = "realized_pnl_quote" if previous.is_done else "unrealized_pnl_quote"
+            report[pnl_key] -= previous.net_pnl_quote
+            report["global_pnl_quote"] -= previous.net_pnl_quote
+            report["volume_traded"] -= previous.filled_amount_quote
+        pnl_key = "realized_pnl_quote" if contribution.is_done else "unrealized_pnl_quote"
+        report[pnl_key] += contribution.net_pnl_quote
+        report["global_pnl_quote"] += contribution.net_pnl_quote
+        report["volume_traded"] += contribution.filled_amount_quote
+        if contribution.is_done and contribution.close_type is not None:
+            close_type_counts = report["close_type_counts"]
+            close_type_counts[contribution.close_type] = close_type_counts.get(contribution.close_type, 0) + 1
+        self.updated_controllers.add(controller_id)
+
+    def _update_positions_held(self):
+        """
+        Value the positions held of the controllers that hold positions, or held them on the last update, at the
+        current mid price and replace their previous contribution to the reports.
+        """
+        positions_held = self.executor_orchestrator.positions_held
+        market_data_provider = self.executor_orchestrator.strategy.market_data_provider
+        for controller_id, report in self.reports.items():
+            positions = positions_held.get(controller_id, [])
+            previous = self._positions_contributions.get(controller_id, PositionsContribution())
+            if not positions and previous == PositionsContribution():
+                continue
+            positions_summary = [
+                position.get_position_summary(market_data_provider.get_price_by_type(
+                    position.connector_name, position.trading_pair, PriceType.MidPrice)).dict()
+                for position in positions]
+            contribution = PositionsContribution.from_positions_summary(positions_summary)
+            self._positions_contributions[controller_id] = contribution
+            report["positions_summary"] = positions_summary
+            if contribution == previous:
+                continue
+            report["realized_pnl_quote"] += contribution.realized_pnl_quote - previous.realized_pnl_quote
+            report["unrealized_pnl_quote"] += contribution.unrealized_pnl_quote - previous.unrealized_pnl_quote
+            report["global_pnl_quote"] += contribution.realized_pnl_quote + contribution.unrealized_pnl_quote - \
+                previous.realized_pnl_quote - previous.unrealized_pnl_quote
+            report["volume_traded"] += contribution.volume_traded - previous.volume_traded
+            self.updated_controllers.add(controller_id)
+
+    @staticmethod
+    def _update_pct_fields(report: Dict):
+        volume_traded = report["volume_traded"]
+        for pnl_key, pct_key in (("realized_pnl_quote", "realized_pnl_pct"),
+                                 ("unrealized_pnl_quote", "unrealized_pnl_pct"),
+                                 ("global_pnl_quote", "global_pnl_pct")):
+            report[pct_key] = report[pnl_key] / volume_traded * 100 if volume_traded > 0 else Decimal("0")
@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List
+
+from hummingbot.connector.connector_base import ConnectorBase
+
+
+@dataclass
+class PortfolioSnapshot:
+    """
+    投资组合快照：一次读取余额和中间价，计算各交易对的持仓、名义价值和权重。
+    同一次执行中的信号、权重和下单数量都使用同一个快照。
+    """
+    quote_asset: str
+    cash: Decimal
+    balances: Dict[str, Decimal]
+    mid_prices: Dict[str, Decimal]
+    notionals: Dict[str, Decimal]
+    total_value: Decimal
+    weights: Dict[str, Decimal]
+
+    @classmethod
+    def capture(cls, connector: ConnectorBase, trading_pairs: List[str], quote_asset: str = "USDT") -> "PortfolioSnapshot":
+        # 批量读取所有余额，每个交易对只读取一次中间价
+        all_balances = connector.get_all_balances()
+        cash = connector.get_available_balance(quote_asset)
+        balances = {}
+        mid_prices = {}
+        notionals = {}
+        for pair in trading_pairs:
+            base = pair.split("-")[0]
+            balances[base] = Decimal(str(all_balances.get(base, 0)))
+            mid_prices[pair] = connector.get_mid_price(pair)
+            notionals[pair] = balances[base] * mid_prices[pair]
+        total_value = cash + sum(notionals.values(), Decimal("0"))
+        weights = {pair: notional / total_value if total_value > 0 else Decimal("0")
+                   for pair, notional in notionals.items()}
+        return cls(quote_asset=quote_asset, cash=cash, balances=balances, mid_prices=mid_prices,
+                   notionals=notionals, total_value=total_value, weights=weights)
+
+    def get_position(self, pair: str) -> Decimal:
+        return self.balances.get(pair.split("-")[0], Decimal("0"))
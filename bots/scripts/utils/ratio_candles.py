@@ -0,0 +1,82 @@
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from hummingbot.data_feed.candles_feed.candles_base import CandlesBase
+
+
+class RatioCandles:
+    """
+    合成的比值K线数据源（例如ETH-USDT / BTC-USDT得到ETH-BTC），接口与CandlesFactory创建的数据源相同。
+    按时间对齐两条腿的K线后向量化计算：open和close是两条腿的比值，high和low用两条腿high、low的比值
+    近似并限制在open和close之外，volume使用基础腿的成交量。数据只来自两条腿，不产生额外的交易所请求。
+    第一次读取时全量计算，之后只重新计算最后一根合成K线之后的部分（通常一到两根）。
+    """
+    columns = ["timestamp", "open", "high", "low", "close", "volume"]
+
+    def __init__(self, base_candles: CandlesBase, quote_candles: CandlesBase, trading_pair: str):
+        self.base_candles = base_candles
+        self.quote_candles = quote_candles
+        self.trading_pair = trading_pair
+        self._candles_df = pd.DataFrame(columns=self.columns)
+        self._legs_state: Optional[Tuple] = None
+
+    @property
+    def interval(self) -> str:
+        return self.base_candles.interval
+
+    @property
+    def interval_in_seconds(self) -> int:
+        return self.base_candles.interval_in_seconds
+
+    @property
+    def ready(self) -> bool:
+        return self.base_candles.ready and self.quote_candles.ready
+
+    def start(self):
+        self.base_candles.start()
+        self.quote_candles.start()
+
+    def stop(self):
+        self.base_candles.stop()
+        self.quote_candles.stop()
+
+    @property
+    def candles_df(self) -> pd.DataFrame:
+        self.update()
+        return self._candles_df
+
+    @classmethod
+    def build(cls, base_df: pd.DataFrame, quote_df: pd.DataFrame) -> pd.DataFrame:
+        candles = base_df[cls.columns].merge(quote_df[["timestamp", "open", "high", "low", "close"]], on="timestamp",
+                                             suffixes=("", "_quote"))
+        open_ = candles["open"].values / candles["open_quote"].values
+        close = candles["close"].values / candles["close_quote"].values
+        high = np.maximum(candles["high"].values / candles["high_quote"].values, np.maximum(open_, close))
+        low = np.minimum(candles["low"].values / candles["low_quote"].values, np.minimum(open_, close))
+        return pd.DataFrame({"timestamp": candles["timestamp"].values, "open": open_, "high": high, "low": low,
+                             "close": close, "volume": candles["volume"].values})
+
+    def update(self):
+        base_df = self.base_candles.candles_df
+        quote_df = self.quote_candles.candles_df
+        if len(base_df) == 0 or len(quote_df) == 0:
+            return
+        legs_state = (base_df["timestamp"].iloc[-1], base_df["close"].iloc[-1],
+                      quote_df["timestamp"].iloc[-1], quote_df["close"].iloc[-1])
+        if legs_state == self._legs_state:
+            return
+        self._legs_state = legs_state
+        if len(self._candles_df) == 0 or min(legs_state[0], legs_state[2]) < self._candles_df["timestamp"].iloc[-1]:
+            # 第一次计算或数据源被重置，全量计算
+            self._candles_df = self.build(base_df, quote_df)
+            return
+        # 最后一根合成K线可能还未收盘，从它开始重新计算
+        last_timestamp = self._candles_df["timestamp"].iloc[-1]
+        base_start = base_df["timestamp"].values.searchsorted(last_timestamp)
+        quote_start = quote_df["timestamp"].values.searchsorted(last_timestamp)
+        new_candles = self.build(base_df.iloc[base_start:], quote_df.iloc[quote_start:])
+        max_records = max(len(base_df), len(quote_df))
+        self._candles_df = pd.concat([self._candles_df.iloc[:-1], new_candles],
+                                     ignore_index=True).iloc[-max_records:].reset_index(drop=True)
@@ -0,0 +1,112 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from hummingbot.connector.connector_base import ConnectorBase
+from hummingbot.connector.trading_rule import TradingRule
+from hummingbot.core.data_type.common import TradeType
+
+
+@dataclass
+class ConnectorSnapshot:
+    """
+    Balances, mid prices and trading rules of a connector read once per rebalance check.
+    """
+    connector_name: str
+    balances: Dict[str, Decimal]
+    mid_prices: Dict[str, Decimal]
+    trading_rules: Dict[str, TradingRule]
+
+    @classmethod
+    def capture(cls, connector_name: str, connector: ConnectorBase, trading_pairs: List[str],
+                trading_rules: Optional[Dict[str, TradingRule]] = None) -> "ConnectorSnapshot":
+        if trading_rules is None:
+            trading_rules = {trading_pair: connector.trading_rules[trading_pair] for trading_pair in trading_pairs}
+        return cls(connector_name=connector_name,
+                   balances=connector.get_all_balances(),
+                   mid_prices={trading_pair: connector.get_mid_price(trading_pair) for trading_pair in trading_pairs},
+                   trading_rules=trading_rules)
+
+
+@dataclass
+class RebalanceOrder:
+    connector_name: str
+    trading_pair: str
+    side: TradeType
+    amount: Decimal
+    price: Decimal
+    balance: Decimal
+    required_amount: Decimal
+    unmatched_amount: Decimal
+    reason: str = field(default="")
+
+    def __str__(self):
+        return (f"{self.side.name} {self.amount} {self.trading_pair} on {self.connector_name} @ {self.price} | "
+                f"Balance: {self.balance} | Required: {self.required_amount} | "
+                f"Executors unmatched balance: {self.unmatched_amount} | {self.reason}")
+
+
+class RebalancePlanner:
+    """
+    Computes the market orders needed to keep the balance required by the controllers in each connector.
+    The requirements of all the controllers are netted by connector and token, the balances and prices are read from a
+    single snapshot per connector, and the unmatched amount of the active executors is netted across controllers by
+    trading pair. The result is a single list of orders that can be placed or just logged in dry run mode.
+    """
+
+    def __init__(self, asset_to_rebalance: str, extra_inventory: float, min_amount_to_rebalance_usd: Decimal):
+        self.asset_to_rebalance = asset_to_rebalance
+        self.extra_inventory = Decimal(extra_inventory)
+        self.min_amount_to_rebalance_usd = min_amount_to_rebalance_usd
+
+    def get_trading_pair(self, token: str) -> str:
+        return f"{token}-{self.asset_to_rebalance}"
+
+    def trading_pairs_required(self, balance_required: Dict[str, Decimal]) -> List[str]:
+        return [self.get_trading_pair(token) for token in balance_required if token != self.asset_to_rebalance]
+
+    def plan(self, balance_required: Dict[str, Dict[str, Decimal]], snapshots: Dict[str, ConnectorSnapshot],
+             unmatched_amounts: Dict[str, Dict[str, Decimal]]) -> List[RebalanceOrder]:
+        """
+        Build the consolidated list of rebalance orders.
+        :param balance_required: amount required by token, netted across controllers, by connector name.
+        :param snapshots: connector snapshot by connector name.
+        :param unmatched_amounts: quote amount sold minus quote amount bought by the active executors, by trading
+        pair, by connector name.
+        :return: list of orders to place.
+        """
+        orders = []
+        for connector_name, tokens_required in balance_required.items():
+            snapshot = snapshots[connector_name]
+            connector_unmatched_amounts = unmatched_amounts.get(connector_name, {})
+            for token, amount in tokens_required.items():
+                if token == self.asset_to_rebalance:
+                    continue
+                trading_pair = self.get_trading_pair(token)
+                mid_price = snapshot.mid_prices[trading_pair]
+                trading_rule = snapshot.trading_rules[trading_pair]
+                unmatched_amount = connector_unmatched_amounts.get(trading_pair, Decimal("0"))
+                balance = snapshot.balances.get(token, Decimal("0")) + unmatched_amount / mid_price
+                amount_with_safe_margin = amount * (1 + self.extra_inventory)
+                base_balance_diff = balance - amount_with_safe_margin
+                abs_balance_diff = abs(base_balance_diff)
+                trading_rules_condition = abs_balance_diff > trading_rule.min_order_size and \
+                    abs_balance_diff * mid_price > trading_rule.min_notional_size and \
+                    abs_balance_diff * mid_price > self.min_amount_to_rebalance_usd
+                order_kwargs = dict(connector_name=connector_name, trading_pair=trading_pair, price=mid_price,
+                                    balance=balance, required_amount=amount_with_safe_margin,
+                                    unmatched_amount=unmatched_amount / mid_price)
+                if base_balance_diff > 0:
+                    if trading_rules_condition:
+                        orders.append(RebalanceOrder(side=TradeType.SELL, amount=abs_balance_diff,
+                                                     reason="Selling the excess of balance", **order_kwargs))
+                elif trading_rules_condition:
+                    orders.append(RebalanceOrder(side=TradeType.BUY, amount=abs_balance_diff,
+                                                 reason="Buying the missing balance", **order_kwargs))
+                else:
+                    min_amount = max([self.min_amount_to_rebalance_usd / mid_price, trading_rule.min_order_size,
+                                      trading_rule.min_notional_size / mid_price])
+                    orders.append(RebalanceOrder(side=TradeType.BUY, amount=min_amount,
+                                                 reason="Buying for a higher value to avoid future imbalance",
+                                                 **order_kwargs))
+        return orders
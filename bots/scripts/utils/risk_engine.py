@@ -0,0 +1,70 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, List, Tuple
+
+from hummingbot.core.data_type.common import TradeType
+
+
+@dataclass
+class PositionRisk:
+    amount: Decimal
+    entry_price: Decimal
+    peak_price: Decimal
+
+
+class IntradayRiskEngine:
+    """
+    每个tick运行的止损引擎。每个交易对只保存持仓数量、平均入场价和入场后的最高价，
+    evaluate只比较价格，复杂度O(交易对数量)，不做K线或指标计算。
+    硬止损：价格低于入场价的(1 - stop_loss_pct)。
+    追踪止损：最高价达到入场价的(1 + trailing_stop_activation)后，价格从最高价回撤trailing_delta。
+    """
+
+    def __init__(self, stop_loss_pct: float, trailing_stop_activation: float, trailing_delta: float,
+                 min_notional: Decimal = Decimal("10")):
+        self.stop_loss_pct = Decimal(str(stop_loss_pct))
+        self.trailing_stop_activation = Decimal(str(trailing_stop_activation))
+        self.trailing_delta = Decimal(str(trailing_delta))
+        self.min_notional = min_notional
+        self.positions: Dict[str, PositionRisk] = {}
+
+    def on_fill(self, pair: str, trade_type: TradeType, amount: Decimal, price: Decimal):
+        # 买入更新平均入场价，卖出减少持仓，持仓清空后删除状态
+        position = self.positions.get(pair)
+        if trade_type == TradeType.BUY:
+            if position is None:
+                self.positions[pair] = PositionRisk(amount=amount, entry_price=price, peak_price=price)
+            else:
+                total_amount = position.amount + amount
+                position.entry_price = (position.entry_price * position.amount + price * amount) / total_amount
+                position.amount = total_amount
+                position.peak_price = max(position.peak_price, price)
+        elif position is not None:
+            position.amount -= amount
+            if position.amount * price < self.min_notional:
+                del self.positions[pair]
+
+    def sync(self, pair: str, amount: Decimal, price: Decimal):
+        # 启动前已有的持仓没有成交记录，用当前价格作为入场价
+        if pair not in self.positions and amount * price >= self.min_notional:
+            self.positions[pair] = PositionRisk(amount=amount, entry_price=price, peak_price=price)
+
+    def evaluate(self, prices: Dict[str, Decimal]) -> List[Tuple[str, str]]:
+        """
+        :return: 触发止损的交易对和原因，触发后删除该交易对的状态，避免重复平仓。
+        """
+        triggered = []
+        for pair, price in prices.items():
+            position = self.positions.get(pair)
+            if position is None or price.is_nan():
+                continue
+            if price > position.peak_price:
+                position.peak_price = price
+            if price <= position.entry_price * (1 - self.stop_loss_pct):
+                triggered.append((pair, "stop_loss"))
+            elif position.peak_price >= position.entry_price * (1 + self.trailing_stop_activation) and \
+                    price <= position.peak_price * (1 - self.trailing_delta):
+                triggered.append((pair, "trailing_stop"))
+        for pair, _ in triggered:
+            del self.positions[pair]
+        return triggered
@@ -0,0 +1,117 @@
+import time
+from contextlib import nullcontext
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from hummingbot.strategy_v2.controllers.controller_base import ControllerBase
+
+DEFAULT_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+
+
+class PhaseTimings:
+    """
+    Ring buffer with the wall time of the last window runs of a phase.
+    """
+
+    def __init__(self, window: int):
+        self.durations = np.zeros(window)
+        self.count = 0
+
+    def add(self, duration: float):
+        self.durations[self.count % len(self.durations)] = duration
+        self.count += 1
+
+    def get_durations(self) -> np.ndarray:
+        return self.durations[:min(self.count, len(self.durations))]
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "TickProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class TickProfiler:
+    """
+    Records the wall time of the phases of the strategy tick and of the controllers methods. The last window timings
+    of every phase are kept in a ring buffer and summarized as percentiles and a histogram over buckets_ms when a
+    report is requested. When disabled, phase returns a shared no-op context manager and the controllers are not
+    wrapped, so the cost is a method call per phase.
+    """
+    CONTROLLER_METHODS = ("update_processed_data", "determine_executor_actions")
+
+    def __init__(self, enabled: bool = False, window: int = 1000, buckets_ms: Sequence[float] = DEFAULT_BUCKETS_MS):
+        self.enabled = enabled
+        self.window = window
+        self.buckets_ms = list(buckets_ms)
+        self.timings: Dict[str, PhaseTimings] = {}
+        self._null_phase = nullcontext()
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return self._null_phase
+        return _Phase(self, name)
+
+    def record(self, name: str, duration: float):
+        if name not in self.timings:
+            self.timings[name] = PhaseTimings(self.window)
+        self.timings[name].add(duration)
+
+    def wrap_controller(self, controller_id: str, controller: ControllerBase):
+        """
+        Time the update_processed_data and determine_executor_actions methods of the controller.
+        """
+        if not self.enabled:
+            return
+        update_processed_data = controller.update_processed_data
+        determine_executor_actions = controller.determine_executor_actions
+
+        async def timed_update_processed_data():
+            with self.phase(f"{controller_id}.update_processed_data"):
+                return await update_processed_data()
+
+        def timed_determine_executor_actions():
+            with self.phase(f"{controller_id}.determine_executor_actions"):
+                return determine_executor_actions()
+
+        controller.update_processed_data = timed_update_processed_data
+        controller.determine_executor_actions = timed_determine_executor_actions
+
+    def get_report(self) -> Dict:
+        edges = np.array([0] + self.buckets_ms + [np.inf])
+        phases = {}
+        for name, timings in self.timings.items():
+            durations_ms = timings.get_durations() * 1000
+            if len(durations_ms) == 0:
+                continue
+            p50, p95, p99 = np.percentile(durations_ms, [50, 95, 99])
+            phases[name] = {
+                "count": timings.count,
+                "mean_ms": float(durations_ms.mean()),
+                "p50_ms": float(p50),
+                "p95_ms": float(p95),
+                "p99_ms": float(p99),
+                "max_ms": float(durations_ms.max()),
+                "histogram": np.histogram(durations_ms, bins=edges)[0].tolist(),
+            }
+        return {"buckets_ms": self.buckets_ms, "phases": phases}
+
+    def format_status(self) -> List[str]:
+        report = self.get_report()
+        lines = [f"Tick profile (last {self.window} runs, ms):",
+                 f"  {'Phase':<60} {'Count':>8} {'Mean':>9} {'P50':>9} {'P95':>9} {'P99':>9} {'Max':>9}"]
+        for name, stats in sorted(report["phases"].items(), key=lambda item: -item[1]["mean_ms"]):
+            lines.append(f"  {name:<60} {stats['count']:>8} {stats['mean_ms']:>9.3f} {stats['p50_ms']:>9.3f} "
+                         f"{stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+        return lines
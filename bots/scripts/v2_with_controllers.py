@@ -1,8 +1,13 @@
 import os
 import time
 from decimal import Decimal
-from typing import Dict, List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 
+import yaml
+
+from hummingbot import data_path
+from hummingbot.client import settings
+from hummingbot.client.settings import AllConnectorSettings
 from hummingbot.client.hummingbot_application import HummingbotApplication
 from hummingbot.connector.connector_base import ConnectorBase
 from hummingbot.core.clock import Clock
@@ -12,6 +17,18 @@ from hummingbot.remote_iface.mqtt import ETopicPublisher
 from hummingbot.strategy.strategy_v2_base import StrategyV2Base, StrategyV2ConfigBase
 from hummingbot.strategy_v2.models.base import RunnableStatus
 from hummingbot.strategy_v2.models.executor_actions import CreateExecutorAction, StopExecutorAction
+from hummingbot.strategy_v2.models.executors_info import ExecutorInfo
+from scripts.utils.cash_out import CashOutCoordinator, CashOutState
+from scripts.utils.config_watcher import ConfigFileWatcher, get_config_changes
+from scripts.utils.drawdown_monitor import DrawdownMonitor, HighWaterMarkStore
+from scripts.utils.executor_archive import ExecutorArchive
+from scripts.utils.executor_index import ExecutorIndex
+from scripts.utils.executor_tracker import ExecutorTracker
+from scripts.utils.metadata_registry import MetadataRegistry
+from scripts.utils.performance_publisher import PerformanceReportPublisher
+from scripts.utils.performance_reports import IncrementalPerformanceReports
+from scripts.utils.rebalance_planner import ConnectorSnapshot, RebalanceOrder, RebalancePlanner
+from scripts.utils.tick_profiler import TickProfiler
 
 
 class GenericV2StrategyWithCashOutConfig(StrategyV2ConfigBase):
@@ -19,47 +36,130 @@ class GenericV2StrategyWithCashOutConfig(StrategyV2ConfigBase):
     candles_config: List[CandlesConfig] = []
     markets: Dict[str, Set[str]] = {}
     time_to_cash_out: Optional[int] = None
+    cash_out_max_stops_per_batch: int = 20
+    cash_out_batch_interval: float = 1
+    cash_out_stop_retry_interval: float = 30
     max_global_drawdown: Optional[float] = None
     max_controller_drawdown: Optional[float] = None
+    drawdown_flush_interval: float = 10
     rebalance_interval: Optional[int] = None
     extra_inventory: Optional[float] = 0.02
     min_amount_to_rebalance_usd: Decimal = Decimal("8")
     asset_to_rebalance: str = "USDT"
+    rebalance_dry_run: bool = False
+    performance_report_full_recompute_interval: int = 60
+    performance_report_publish_mode: str = "full"
+    performance_report_encoding: str = "json"
+    performance_report_min_publish_interval: float = 1
+    performance_report_max_publish_interval: float = 30
+    executors_archive_age: Optional[int] = None
+    executors_archive_log: bool = True
+    controllers_config_poll_interval: float = 5
+    controllers_config_debounce: float = 2
+    tick_profiler_enabled: bool = False
+    tick_profiler_window: int = 1000
+    tick_profiler_publish_interval: float = 60
 
 
 class GenericV2StrategyWithCashOut(StrategyV2Base):
     """
     This script runs a generic strategy with cash out feature. Will also check if the controllers configs have been
-    updated and apply the new settings.
+    updated and apply the new settings. The controllers config files are polled every
+    controllers_config_poll_interval seconds, a changed file is parsed once it has been stable for
+    controllers_config_debounce seconds and only the fields marked as is_updatable that changed are applied to the
+    running controller, without restarting it or stopping its executors.
     The cash out of the script can be set by the time_to_cash_out parameter in the config file. If set, the script will
     stop the controllers after the specified time has passed, and wait until the active executors finalize their
-    execution.
+    execution. The executors without a position are stopped in batches of cash_out_max_stops_per_batch per connector
+    every cash_out_batch_interval seconds, and a stop is only sent again if the executor is still running after
+    cash_out_stop_retry_interval seconds.
     The controllers will also have a parameter to manually cash out. In that scenario, the main strategy will stop the
     specific controller and wait until the active executors finalize their execution. The rest of the executors will
     wait until the main strategy stops them.
+    The performance reports are published through MQTT in full mode by default. With
+    performance_report_publish_mode set to delta, only the changed controllers and fields are sent, with a periodic
+    snapshot every performance_report_max_publish_interval seconds.
+    If executors_archive_age is set, the executors closed for more than executors_archive_age seconds, and never less
+    than the longest cooldown_time of the controllers, are removed from the executors info scanned by the controllers,
+    aggregated in a summary by controller and, if executors_archive_log is set, appended to a JSON
+    lines log in the data folder.
+    The high-water marks of the PnL used by the drawdown checks are stored in a SQLite file named after the script
+    config in the data folder and restored on start, delete the file to reset them. The global high-water mark is
+    reset when the set of controllers changes.
+    With tick_profiler_enabled, the wall time of the phases of the tick and of the update_processed_data and
+    determine_executor_actions methods of each controller is shown in the status and published through the MQTT
+    tick_profile topic every tick_profiler_publish_interval seconds.
     """
-    performance_report_interval: int = 1
 
     def __init__(self, connectors: Dict[str, ConnectorBase], config: GenericV2StrategyWithCashOutConfig):
         super().__init__(connectors, config)
         self.config = config
         self.cashing_out = False
-        self.max_pnl_by_controller = {}
+        self.cash_out = CashOutCoordinator(max_stops_per_batch=self.config.cash_out_max_stops_per_batch,
+                                           batch_interval=self.config.cash_out_batch_interval,
+                                           stop_retry_interval=self.config.cash_out_stop_retry_interval)
         self.performance_reports = {}
-        self.max_global_pnl = Decimal("0")
+        self.drawdown_monitor: Optional[DrawdownMonitor] = None
+        if self.config.max_controller_drawdown or self.config.max_global_drawdown:
+            # One file per script config, so two bots running the same script with different configs don't share it
+            db_path = os.path.join(data_path(), f"{self.get_script_config_name()}_high_water_marks.sqlite")
+            self.drawdown_monitor = DrawdownMonitor(HighWaterMarkStore(db_path=db_path,
+                                                                       flush_interval=self.config.drawdown_flush_interval),
+                                                    controller_ids=self.controllers.keys())
         self.drawdown_exited_controllers = []
         self.closed_executors_buffer: int = 30
         self.rebalance_interval: int = self.config.rebalance_interval
-        self._last_performance_report_timestamp = 0
         self._last_rebalance_check_timestamp = 0
+        self.rebalance_planner = RebalancePlanner(asset_to_rebalance=self.config.asset_to_rebalance,
+                                                  extra_inventory=self.config.extra_inventory,
+                                                  min_amount_to_rebalance_usd=self.config.min_amount_to_rebalance_usd)
+        self.last_rebalance_plan: List[RebalanceOrder] = []
+        self.executor_archive: Optional[ExecutorArchive] = None
+        if self.config.executors_archive_age is not None:
+            log_path = os.path.join(data_path(), f"{self.config.script_file_name.split('.')[0]}_executors_archive.jsonl") \
+                if self.config.executors_archive_log else None
+            self.executor_archive = ExecutorArchive(archive_after=self.get_executors_archive_age(), log_path=log_path)
+        self.config_watcher = ConfigFileWatcher(directory=settings.CONTROLLERS_CONF_DIR_PATH,
+                                                file_names=self.config.controllers_config,
+                                                poll_interval=self.config.controllers_config_poll_interval,
+                                                debounce=self.config.controllers_config_debounce)
+        self.controllers_config_data = {file_name: self.read_controller_config(file_name)
+                                        for file_name in self.config.controllers_config}
+        self.tick_profiler = TickProfiler(enabled=self.config.tick_profiler_enabled,
+                                          window=self.config.tick_profiler_window)
+        for controller_id, controller in self.controllers.items():
+            self.tick_profiler.wrap_controller(controller_id, controller)
+        self._tick_profile_pub: Optional[ETopicPublisher] = None
+        self._last_tick_profile_publish_timestamp = 0
+        self.metadata_registry = MetadataRegistry(connectors=self.connectors,
+                                                  derivative_names=AllConnectorSettings.get_derivative_names())
+        self.metadata_registry.build(self.controllers.values())
+        self.executor_tracker = ExecutorTracker()
+        self.executor_index = ExecutorIndex()
+        self.performance_report_engine = IncrementalPerformanceReports(
+            executor_orchestrator=self.executor_orchestrator,
+            full_recompute_interval=self.config.performance_report_full_recompute_interval)
         hb_app = HummingbotApplication.main_application()
         self.mqtt_enabled = hb_app._mqtt is not None
-        self._pub: Optional[ETopicPublisher] = None
+        self._pub: Optional[PerformanceReportPublisher] = None
         if self.config.time_to_cash_out:
             self.cash_out_time = self.config.time_to_cash_out + time.time()
         else:
             self.cash_out_time = None
 
+    def initialize_controllers(self):
+        super().initialize_controllers()
+        # The controllers are created in the order of their config files, the configs without an id get a generated one
+        self.controller_ids_by_file_name: Dict[str, str] = dict(zip(self.config.controllers_config, self.controllers))
+
+    def get_script_config_name(self) -> str:
+        """
+        Name of the script config file the bot was started with, or of the script when it runs without one.
+        """
+        script_config_file_name = HummingbotApplication.main_application().strategy_file_name or \
+            self.config.script_file_name
+        return os.path.splitext(os.path.basename(script_config_file_name))[0]
+
     def start(self, clock: Clock, timestamp: float) -> None:
         """
         Start the strategy.
@@ -69,129 +169,223 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
         self._last_timestamp = timestamp
         self.apply_initial_setting()
         if self.mqtt_enabled:
-            self._pub = ETopicPublisher("performance", use_bot_prefix=True)
+            self._pub = PerformanceReportPublisher(
+                publisher=ETopicPublisher("performance", use_bot_prefix=True),
+                mode=self.config.performance_report_publish_mode,
+                encoding=self.config.performance_report_encoding,
+                min_publish_interval=self.config.performance_report_min_publish_interval,
+                max_publish_interval=self.config.performance_report_max_publish_interval)
+            if self.tick_profiler.enabled:
+                self._tick_profile_pub = ETopicPublisher("tick_profile", use_bot_prefix=True)
 
     async def on_stop(self):
         await super().on_stop()
+        if self.drawdown_monitor is not None:
+            self.drawdown_monitor.store.close()
         if self.mqtt_enabled:
-            self._pub({controller_id: {} for controller_id in self.controllers.keys()})
+            self._pub.publish_final(self.controllers.keys())
             self._pub = None
 
     def on_tick(self):
-        super().on_tick()
-        self.performance_reports = {controller_id: self.executor_orchestrator.generate_performance_report(controller_id=controller_id).dict() for controller_id in self.controllers.keys()}
-        self.control_rebalance()
-        self.control_cash_out()
-        self.control_max_drawdown()
-        self.send_performance_report()
+        profiler = self.tick_profiler
+        with profiler.phase("tick"):
+            with profiler.phase("strategy_v2_tick"):
+                super().on_tick()
+            with profiler.phase("executors_sync"):
+                changed_executors = self.executor_tracker.sync(self.executors_info, self.current_timestamp)
+                self.executor_index.update(changed_executors)
+                self.executor_index.remove(self.executor_tracker.removed_executors)
+                self.notify_executors_update(changed_executors)
+            with profiler.phase("performance_reports"):
+                self.update_performance_reports(changed_executors)
+            with profiler.phase("control_rebalance"):
+                self.control_rebalance()
+            with profiler.phase("control_cash_out"):
+                self.control_cash_out(changed_executors)
+            with profiler.phase("control_max_drawdown"):
+                self.control_max_drawdown()
+            with profiler.phase("send_performance_report"):
+                self.send_performance_report()
+        self.send_tick_profile()
+
+    def notify_executors_update(self, changed_executors: List[ExecutorInfo]):
+        """
+        Send the executors changed in the tick to the controllers that keep state from them (on_executors_update), so
+        they don't rescan their full executors info.
+        """
+        changed_by_controller: Dict[str, List[ExecutorInfo]] = {}
+        for executor in changed_executors:
+            changed_by_controller.setdefault(executor.controller_id, []).append(executor)
+        for controller_id, controller in self.controllers.items():
+            if hasattr(controller, "on_executors_update"):
+                controller.on_executors_update(changed_by_controller.get(controller_id, []),
+                                               self.executor_tracker.removed_executors)
+
+    def send_tick_profile(self):
+        if self._tick_profile_pub is None or \
+                self.current_timestamp - self._last_tick_profile_publish_timestamp < self.config.tick_profiler_publish_interval:
+            return
+        self._tick_profile_pub(self.tick_profiler.get_report())
+        self._last_tick_profile_publish_timestamp = self.current_timestamp
+
+    def update_executors_info(self):
+        super().update_executors_info()
+        if self.executor_archive is None:
+            return
+        for controller_id, executors in self.executors_info.items():
+            self.executors_info[controller_id] = self.executor_archive.prune(controller_id, executors,
+                                                                             self.current_timestamp,
+                                                                             self.executor_tracker.is_reported)
+        for controller in self.controllers.values():
+            controller.executors_info = self.executors_info.get(controller.config.id, [])
+        try:
+            self.executor_archive.flush()
+        except OSError as e:
+            self.logger().error(f"Error writing the executors archive: {e}", exc_info=True)
+
+    def get_executors_archive_age(self) -> float:
+        """
+        Age to archive the done executors, at least the longest cooldown of the controllers, which check the close
+        timestamp of their last executors.
+        """
+        cooldown_times = [getattr(controller.config, "cooldown_time", None) or 0 for controller in self.controllers.values()]
+        return max([self.config.executors_archive_age] + cooldown_times)
+
+    def update_controllers_configs(self):
+        for file_name in self.config_watcher.poll(self.current_timestamp):
+            self.reload_controller_config(file_name)
+
+    @staticmethod
+    def read_controller_config(file_name: str) -> Dict:
+        try:
+            with open(os.path.join(settings.CONTROLLERS_CONF_DIR_PATH, file_name), "r") as file:
+                return yaml.safe_load(file) or {}
+        except (OSError, yaml.YAMLError):
+            return {}
+
+    def reload_controller_config(self, file_name: str):
+        try:
+            with open(os.path.join(settings.CONTROLLERS_CONF_DIR_PATH, file_name), "r") as file:
+                config_data = yaml.safe_load(file) or {}
+            controller = self.controllers.get(self.controller_ids_by_file_name.get(file_name))
+            if controller is None:
+                self.logger().warning(f"The config {file_name} doesn't match any running controller.")
+                return
+            new_config = type(controller.config)(**{"id": controller.config.id, **config_data})
+        except Exception as e:
+            self.logger().error(f"Error loading the controller config {file_name}: {e}", exc_info=True)
+            return
+        updates, not_updatable = get_config_changes(new_config, self.controllers_config_data.get(file_name, {}),
+                                                    config_data)
+        self.controllers_config_data[file_name] = config_data
+        for field_name, value in updates.items():
+            setattr(controller.config, field_name, value)
+        if updates:
+            self.metadata_registry.refresh_controller(controller)
+            if self.executor_archive is not None:
+                self.executor_archive.archive_after = self.get_executors_archive_age()
+            self.logger().info(f"Updated {list(updates)} of controller {controller.config.id} from {file_name}.")
+        if not_updatable:
+            self.logger().warning(f"Changes of {not_updatable} in {file_name} require a restart of the controller.")
+
+    def update_performance_reports(self, changed_executors: List[ExecutorInfo]):
+        self.performance_report_engine.mark_dirty(changed_executors)
+        self.performance_reports = self.performance_report_engine.update(controller_ids=self.controllers.keys(),
+                                                                         timestamp=self.current_timestamp)
 
     def control_rebalance(self):
         if self.rebalance_interval and self._last_rebalance_check_timestamp + self.rebalance_interval <= self.current_timestamp:
-            balance_required = {}
-            for controller_id, controller in self.controllers.items():
-                connector_name = controller.config.model_dump().get("connector_name")
-                if connector_name and "perpetual" in connector_name:
+            orders = self.get_rebalance_plan()
+            self.last_rebalance_plan = orders
+            for order in orders:
+                if self.config.rebalance_dry_run:
+                    self.logger().info(f"Rebalance [dry run]: {order}")
                     continue
-                if connector_name not in balance_required:
-                    balance_required[connector_name] = {}
-                tokens_required = controller.get_balance_requirements()
-                for token, amount in tokens_required:
-                    if token not in balance_required[connector_name]:
-                        balance_required[connector_name][token] = amount
-                    else:
-                        balance_required[connector_name][token] += amount
-            for connector_name, balance_requirements in balance_required.items():
-                connector = self.connectors[connector_name]
-                for token, amount in balance_requirements.items():
-                    if token == self.config.asset_to_rebalance:
-                        continue
-                    balance = connector.get_balance(token)
-                    trading_pair = f"{token}-{self.config.asset_to_rebalance}"
-                    mid_price = connector.get_mid_price(trading_pair)
-                    trading_rule = connector.trading_rules[trading_pair]
-                    amount_with_safe_margin = amount * (1 + Decimal(self.config.extra_inventory))
-                    active_executors_for_pair = self.filter_executors(
-                        executors=self.get_all_executors(),
-                        filter_func=lambda x: x.is_active and x.trading_pair == trading_pair and x.connector_name == connector_name
-                    )
-                    unmatched_amount = sum([executor.filled_amount_quote for executor in active_executors_for_pair if executor.side == TradeType.SELL]) - sum([executor.filled_amount_quote for executor in active_executors_for_pair if executor.side == TradeType.BUY])
-                    balance += unmatched_amount / mid_price
-                    base_balance_diff = balance - amount_with_safe_margin
-                    abs_balance_diff = abs(base_balance_diff)
-                    trading_rules_condition = abs_balance_diff > trading_rule.min_order_size and abs_balance_diff * mid_price > trading_rule.min_notional_size and abs_balance_diff * mid_price > self.config.min_amount_to_rebalance_usd
-                    order_type = OrderType.MARKET
-                    if base_balance_diff > 0:
-                        if trading_rules_condition:
-                            self.logger().info(f"Rebalance: Selling {amount_with_safe_margin} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount / mid_price}")
-                            connector.sell(
-                                trading_pair=trading_pair,
-                                amount=abs_balance_diff,
-                                order_type=order_type,
-                                price=mid_price)
-                        else:
-                            self.logger().info("Skipping rebalance due a low amount to sell that may cause future imbalance")
-                    else:
-                        if not trading_rules_condition:
-                            amount = max([self.config.min_amount_to_rebalance_usd / mid_price, trading_rule.min_order_size, trading_rule.min_notional_size / mid_price])
-                            self.logger().info(f"Rebalance: Buying for a higher value to avoid future imbalance {amount} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount}")
-                        else:
-                            amount = abs_balance_diff
-                            self.logger().info(f"Rebalance: Buying {amount} {token} to {self.config.asset_to_rebalance}. Balance: {balance} | Executors unmatched balance {unmatched_amount}")
-                        connector.buy(
-                            trading_pair=trading_pair,
-                            amount=amount,
-                            order_type=order_type,
-                            price=mid_price)
+                self.logger().info(f"Rebalance: {order}")
+                connector = self.connectors[order.connector_name]
+                if order.side == TradeType.SELL:
+                    connector.sell(trading_pair=order.trading_pair, amount=order.amount, order_type=OrderType.MARKET,
+                                   price=order.price)
+                else:
+                    connector.buy(trading_pair=order.trading_pair, amount=order.amount, order_type=OrderType.MARKET,
+                                  price=order.price)
             self._last_rebalance_check_timestamp = self.current_timestamp
 
+    def get_rebalance_plan(self) -> List[RebalanceOrder]:
+        balance_required = {}
+        for controller_id, controller in self.controllers.items():
+            metadata = self.metadata_registry.controllers[controller_id]
+            connector_name = metadata.connector_name
+            if connector_name is None or metadata.is_perpetual:
+                continue
+            if connector_name not in balance_required:
+                balance_required[connector_name] = {}
+            tokens_required = controller.get_balance_requirements()
+            for token, amount in tokens_required:
+                if token not in balance_required[connector_name]:
+                    balance_required[connector_name][token] = amount
+                else:
+                    balance_required[connector_name][token] += amount
+        snapshots = {}
+        unmatched_amounts = {}
+        for connector_name, tokens_required in balance_required.items():
+            trading_pairs = self.rebalance_planner.trading_pairs_required(tokens_required)
+            snapshots[connector_name] = ConnectorSnapshot.capture(
+                connector_name, self.connectors[connector_name], trading_pairs,
+                trading_rules=self.metadata_registry.get_trading_rules(connector_name, trading_pairs))
+            unmatched_amounts[connector_name] = {}
+            for trading_pair in trading_pairs:
+                sell_executors = self.executor_index.get_executors(connector_name=connector_name, trading_pair=trading_pair,
+                                                                   side=TradeType.SELL)
+                buy_executors = self.executor_index.get_executors(connector_name=connector_name, trading_pair=trading_pair,
+                                                                  side=TradeType.BUY)
+                unmatched_amounts[connector_name][trading_pair] = sum([executor.filled_amount_quote for executor in sell_executors]) - sum([executor.filled_amount_quote for executor in buy_executors])
+        return self.rebalance_planner.plan(balance_required, snapshots, unmatched_amounts)
+
     def control_max_drawdown(self):
+        if self.drawdown_monitor is None:
+            return
+        # The drawdown can only change for the controllers with a new PnL or when a controller is removed
+        self.drawdown_monitor.remove(self.performance_report_engine.removed_controllers)
+        changed_controllers = self.performance_report_engine.updated_controllers
+        if not changed_controllers and not self.performance_report_engine.removed_controllers:
+            return
+        self.drawdown_monitor.update(self.performance_reports, changed_controllers, self.current_timestamp)
         if self.config.max_controller_drawdown:
-            self.check_max_controller_drawdown()
+            self.check_max_controller_drawdown(changed_controllers)
         if self.config.max_global_drawdown:
             self.check_max_global_drawdown()
 
-    def check_max_controller_drawdown(self):
-        for controller_id, controller in self.controllers.items():
-            if controller.status != RunnableStatus.RUNNING:
+    def check_max_controller_drawdown(self, controller_ids: Iterable[str]):
+        for controller_id in controller_ids:
+            controller = self.controllers.get(controller_id)
+            if controller is None or controller.status != RunnableStatus.RUNNING:
                 continue
-            controller_pnl = self.performance_reports[controller_id]["global_pnl_quote"]
-            last_max_pnl = self.max_pnl_by_controller[controller_id]
-            if controller_pnl > last_max_pnl:
-                self.max_pnl_by_controller[controller_id] = controller_pnl
-            else:
-                current_drawdown = last_max_pnl - controller_pnl
-                if current_drawdown > self.config.max_controller_drawdown:
-                    self.logger().info(f"Controller {controller_id} reached max drawdown. Stopping the controller.")
-                    controller.stop()
-                    executors_order_placed = self.filter_executors(
-                        executors=self.executors_info[controller_id],
-                        filter_func=lambda x: x.is_active and not x.is_trading,
-                    )
-                    self.executor_orchestrator.execute_actions(
-                        actions=[StopExecutorAction(controller_id=controller_id, executor_id=executor.id) for executor in executors_order_placed]
-                    )
-                    self.drawdown_exited_controllers.append(controller_id)
+            current_drawdown = self.drawdown_monitor.get_drawdown(controller_id)
+            if current_drawdown > self.config.max_controller_drawdown:
+                self.logger().info(f"Controller {controller_id} reached max drawdown. Stopping the controller.")
+                controller.stop()
+                executors_order_placed = self.executor_index.get_executors(controller_id=controller_id, is_trading=False)
+                self.executor_orchestrator.execute_actions(
+                    actions=[StopExecutorAction(controller_id=controller_id, executor_id=executor.id) for executor in executors_order_placed]
+                )
+                self.drawdown_exited_controllers.append(controller_id)
 
     def check_max_global_drawdown(self):
-        current_global_pnl = sum([report["global_pnl_quote"] for report in self.performance_reports.values()])
-        if current_global_pnl > self.max_global_pnl:
-            self.max_global_pnl = current_global_pnl
-        else:
-            current_global_drawdown = self.max_global_pnl - current_global_pnl
-            if current_global_drawdown > self.config.max_global_drawdown:
-                self.drawdown_exited_controllers.extend(list(self.controllers.keys()))
-                self.logger().info("Global drawdown reached. Stopping the strategy.")
-                HummingbotApplication.main_application().stop()
+        current_global_drawdown = self.drawdown_monitor.get_global_drawdown()
+        if current_global_drawdown > self.config.max_global_drawdown:
+            self.drawdown_exited_controllers.extend(list(self.controllers.keys()))
+            self.logger().info("Global drawdown reached. Stopping the strategy.")
+            HummingbotApplication.main_application().stop()
 
     def send_performance_report(self):
-        if self.current_timestamp - self._last_performance_report_timestamp >= self.performance_report_interval and self.mqtt_enabled:
-            self._pub(self.performance_reports)
-            self._last_performance_report_timestamp = self.current_timestamp
+        if self.mqtt_enabled and self._pub:
+            self._pub.publish(self.performance_reports, self.current_timestamp)
 
-    def control_cash_out(self):
+    def control_cash_out(self, changed_executors: List[ExecutorInfo]):
         self.evaluate_cash_out_time()
         if self.cashing_out:
-            self.check_executors_status()
+            self.check_executors_status(changed_executors)
         else:
             self.check_manual_cash_out()
 
@@ -203,13 +397,14 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
                     self.logger().info(f"Cash out for controller {controller_id}.")
                     controller.stop()
             self.cashing_out = True
+            self.cash_out.start(self.executor_index.get_executors(status=RunnableStatus.RUNNING))
 
     def check_manual_cash_out(self):
         for controller_id, controller in self.controllers.items():
             if controller.config.manual_kill_switch and controller.status == RunnableStatus.RUNNING:
                 self.logger().info(f"Manual cash out for controller {controller_id}.")
                 controller.stop()
-                executors_to_stop = self.get_executors_by_controller(controller_id)
+                executors_to_stop = self.executor_index.get_executors(controller_id=controller_id)
                 self.executor_orchestrator.execute_actions(
                     [StopExecutorAction(executor_id=executor.id,
                                         controller_id=executor.controller_id) for executor in executors_to_stop])
@@ -219,22 +414,29 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
                 self.logger().info(f"Restarting controller {controller_id}.")
                 controller.start()
 
-    def check_executors_status(self):
-        active_executors = self.filter_executors(
-            executors=self.get_all_executors(),
-            filter_func=lambda executor: executor.status == RunnableStatus.RUNNING
-        )
-        if not active_executors:
+    def check_executors_status(self, changed_executors: List[ExecutorInfo]):
+        self.cash_out.on_executors_update(changed_executors)
+        if self.cash_out.state == CashOutState.DONE:
             self.logger().info("All executors have finalized their execution. Stopping the strategy.")
             HummingbotApplication.main_application().stop()
-        else:
-            non_trading_executors = self.filter_executors(
-                executors=active_executors,
-                filter_func=lambda executor: not executor.is_trading
-            )
-            self.executor_orchestrator.execute_actions(
-                [StopExecutorAction(executor_id=executor.id,
-                                    controller_id=executor.controller_id) for executor in non_trading_executors])
+            return
+        stop_actions = self.cash_out.get_stop_actions(self.current_timestamp)
+        if stop_actions:
+            self.logger().info(f"Cash out: stopping {len(stop_actions)} executors, "
+                               f"{self.cash_out.queued_stops} queued, {len(self.cash_out.running_executors)} running.")
+            self.executor_orchestrator.execute_actions(stop_actions)
+
+    def format_status(self) -> str:
+        original_status = super().format_status()
+        extra_status = []
+        if self.executor_archive is not None and self.executor_archive.archived_executors:
+            extra_status.extend(["", f"Archived executors: {self.executor_archive.archived_executors}"])
+            extra_status.extend(self.executor_archive.format_summary())
+        if self.tick_profiler.enabled:
+            extra_status.extend([""] + self.tick_profiler.format_status())
+        if self.config.rebalance_dry_run and self.last_rebalance_plan:
+            extra_status.extend(["", "Rebalance plan (dry run):"] + [f"  {order}" for order in self.last_rebalance_plan])
+        return original_status + "\n".join(extra_status)
 
     def create_actions_proposal(self) -> List[CreateExecutorAction]:
         return []
@@ -243,16 +445,11 @@ class GenericV2StrategyWithCashOut(StrategyV2Base):
         return []
 
     def apply_initial_setting(self):
-        connectors_position_mode = {}
-        for controller_id, controller in self.controllers.items():
-            self.max_pnl_by_controller[controller_id] = Decimal("0")
-            config_dict = controller.config.dict()
-            if "connector_name" in config_dict:
-                if self.is_perpetual(config_dict["connector_name"]):
-                    if "position_mode" in config_dict:
-                        connectors_position_mode[config_dict["connector_name"]] = config_dict["position_mode"]
-                    if "leverage" in config_dict:
-                        self.connectors[config_dict["connector_name"]].set_leverage(leverage=config_dict["leverage"],
-                                                                                    trading_pair=config_dict["trading_pair"])
-        for connector_name, position_mode in connectors_position_mode.items():
-            self.connectors[connector_name].set_position_mode(position_mode)
+        for metadata in self.metadata_registry.controllers.values():
+            if metadata.is_perpetual and metadata.leverage is not None:
+                for trading_pair in metadata.trading_pairs:
+                    self.connectors[metadata.connector_name].set_leverage(leverage=metadata.leverage,
+                                                                          trading_pair=trading_pair)
+        for connector_name, connector in self.metadata_registry.connectors.items():
+            if connector.is_perpetual and connector.position_mode is not None:
+                self.connectors[connector_name].set_position_mode(connector.position_mode)
@@ -1,10 +1,23 @@
+import pandas as pd
 import pandas_ta as ta  # noqa: F401
 
+try:
+    from controllers.utils.pmm_dynamic import get_pmm_dynamic_multipliers as get_controller_multipliers
+except ImportError:
+    # The bots controllers are not mounted in the dashboard, the multipliers are computed with pandas_ta
+    get_controller_multipliers = None
+
 
 def get_pmm_dynamic_multipliers(df, macd_fast, macd_slow, macd_signal, natr_length):
     """
-    Get the spread and price multipliers for PMM Dynamic
+    Get the spread and price multipliers for PMM Dynamic, with the same indicators used by the controller when the
+    controllers are available
     """
+    if get_controller_multipliers is not None:
+        price_multiplier, spread_multiplier = get_controller_multipliers(
+            df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy(), macd_fast, macd_slow, macd_signal,
+            natr_length)
+        return pd.Series(price_multiplier, index=df.index), pd.Series(spread_multiplier, index=df.index)
     natr = ta.natr(df["high"], df["low"], df["close"], length=natr_length) / 100
     macd_output = ta.macd(df["close"], fast=macd_fast,
                           slow=macd_slow, signal=macd_signal)
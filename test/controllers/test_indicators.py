@@ -0,0 +1,217 @@
+import importlib
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pandas_ta as ta
+except ImportError:
+    ta = None
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+def get_candles(n_candles: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n_candles)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.003, n_candles)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.003, n_candles)))
+    return pd.DataFrame({"timestamp": 1_700_000_000 + 60 * np.arange(n_candles), "open": open_, "high": high,
+                         "low": low, "close": close, "volume": rng.uniform(1, 10, n_candles)})
+
+
+# Batch references of the indicators replaced by the streaming ones. pandas_ta is used when it is installed, otherwise
+# the same definitions as pandas_ta 0.3.14b (SMA seeded EMA, RMA with min periods, bbands with ddof 0).
+
+def reference_ema(close: pd.Series, length: int) -> pd.Series:
+    values = close.loc[close.first_valid_index():].copy()
+    seed = values.iloc[:length].mean()
+    values.iloc[:length - 1] = np.nan
+    values.iloc[length - 1] = seed
+    return values.ewm(span=length, adjust=False).mean().reindex(close.index)
+
+
+def reference_bbands(df: pd.DataFrame, length: int, std: float) -> pd.DataFrame:
+    if ta is not None:
+        return ta.bbands(df["close"], length=length, std=std)
+    close = df["close"]
+    mid = close.rolling(length, min_periods=length).mean()
+    stdev = close.rolling(length, min_periods=length).std(ddof=0)
+    lower, upper = mid - std * stdev, mid + std * stdev
+    suffix = f"_{length}_{std}"
+    return pd.DataFrame({f"BBL{suffix}": lower, f"BBM{suffix}": mid, f"BBU{suffix}": upper,
+                         f"BBB{suffix}": 100 * (upper - lower) / mid, f"BBP{suffix}": (close - lower) / (upper - lower)})
+
+
+def reference_macd(df: pd.DataFrame, fast: int, slow: int, signal: int) -> pd.DataFrame:
+    if ta is not None:
+        return ta.macd(df["close"], fast=fast, slow=slow, signal=signal)
+    macd = reference_ema(df["close"], fast) - reference_ema(df["close"], slow)
+    macd_signal = reference_ema(macd, signal)
+    suffix = f"_{fast}_{slow}_{signal}"
+    return pd.DataFrame({f"MACD{suffix}": macd, f"MACDh{suffix}": macd - macd_signal, f"MACDs{suffix}": macd_signal})
+
+
+def reference_atr(df: pd.DataFrame, length: int) -> pd.DataFrame:
+    if ta is not None:
+        return pd.DataFrame({f"ATRr_{length}": ta.atr(df["high"], df["low"], df["close"], length=length),
+                             f"NATR_{length}": ta.natr(df["high"], df["low"], df["close"], length=length)})
+    previous_close = df["close"].shift(1)
+    true_range = pd.concat([df["high"] - df["low"], (df["high"] - previous_close).abs(),
+                            (previous_close - df["low"]).abs()], axis=1).max(axis=1)
+    true_range.iloc[0] = np.nan
+    atr = true_range.ewm(alpha=1 / length, min_periods=length).mean()
+    return pd.DataFrame({f"ATRr_{length}": atr, f"NATR_{length}": 100 * atr / df["close"]})
+
+
+def reference_supertrend(df: pd.DataFrame, length: int, multiplier: float) -> pd.DataFrame:
+    if ta is not None:
+        return ta.supertrend(df["high"], df["low"], df["close"], length=length, multiplier=multiplier)
+    close = df["close"].to_numpy()
+    hl2 = ((df["high"] + df["low"]) / 2).to_numpy()
+    matr = multiplier * reference_atr(df, length)[f"ATRr_{length}"].to_numpy()
+    upper_band, lower_band = hl2 + matr, hl2 - matr
+    direction, trend = np.ones(len(df)), np.zeros(len(df))
+    long, short = np.full(len(df), np.nan), np.full(len(df), np.nan)
+    for i in range(1, len(df)):
+        if close[i] > upper_band[i - 1]:
+            direction[i] = 1
+        elif close[i] < lower_band[i - 1]:
+            direction[i] = -1
+        else:
+            direction[i] = direction[i - 1]
+            if direction[i] > 0 and lower_band[i] < lower_band[i - 1]:
+                lower_band[i] = lower_band[i - 1]
+            if direction[i] < 0 and upper_band[i] > upper_band[i - 1]:
+                upper_band[i] = upper_band[i - 1]
+        if direction[i] > 0:
+            trend[i] = long[i] = lower_band[i]
+        else:
+            trend[i] = short[i] = upper_band[i]
+    suffix = f"_{length}_{multiplier}"
+    return pd.DataFrame({f"SUPERT{suffix}": trend, f"SUPERTd{suffix}": direction, f"SUPERTl{suffix}": long,
+                         f"SUPERTs{suffix}": short}, index=df.index)
+
+
+def reference_volatility(df: pd.DataFrame, length: int) -> pd.DataFrame:
+    return pd.DataFrame({f"VOLATILITY_{length}": np.log(df["close"]).diff().rolling(length).std()})
+
+
+class IndicatorsParityTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sys.path.insert(0, BOTS_PATH)
+        cls.module = importlib.import_module("controllers.utils.indicators")
+        cls.candles = get_candles(1000)
+
+    @classmethod
+    def tearDownClass(cls):
+        sys.path.remove(BOTS_PATH)
+
+    def get_cases(self):
+        module = self.module
+        return [
+            (lambda: module.BollingerBands(length=20, std=2.0), lambda df: reference_bbands(df, 20, 2.0)),
+            (lambda: module.MACD(fast=12, slow=26, signal=9), lambda df: reference_macd(df, 12, 26, 9)),
+            (lambda: module.ATR(length=14), lambda df: reference_atr(df, 14)),
+            (lambda: module.SuperTrend(length=7, multiplier=3.0), lambda df: reference_supertrend(df, 7, 3.0)),
+            (lambda: module.Volatility(length=30), lambda df: reference_volatility(df, 30)),
+        ]
+
+    def assert_frame_matches(self, frame: pd.DataFrame, reference: pd.DataFrame):
+        self.assertEqual(len(reference), len(frame))
+        for column in reference.columns:
+            np.testing.assert_allclose(frame[column].to_numpy(dtype=float), reference[column].to_numpy(dtype=float),
+                                       rtol=1e-9, atol=1e-12, equal_nan=True, err_msg=column)
+
+    def test_batch_update_matches_reference(self):
+        # One update over the whole dataframe, as in backtesting, including the NaN rows of the warm-up window
+        candles = self.candles.iloc[:300]
+        for create_indicator, reference in self.get_cases():
+            indicator = create_indicator()
+            with self.subTest(indicator=indicator.spec):
+                engine = self.module.IndicatorEngine([indicator])
+                engine.update(candles)
+                self.assert_frame_matches(engine.to_frame(), reference(candles))
+
+    def test_streaming_update_matches_reference(self):
+        # A rolling feed of 100 candles where the last one is in progress: the latest values of each update match the
+        # batch values of the same candle computed over all the candles seen since the start
+        window = 100
+        for create_indicator, reference in self.get_cases():
+            indicator = create_indicator()
+            with self.subTest(indicator=indicator.spec):
+                engine = self.module.IndicatorEngine([indicator], history_size=window)
+                expected = reference(self.candles.iloc[:400])
+                for end in range(window, 401):
+                    engine.update(self.candles.iloc[end - window:end])
+                    np.testing.assert_allclose(
+                        np.array(engine.last_row[len(self.module.CANDLE_COLUMNS):], dtype=float),
+                        expected.iloc[end - 1].to_numpy(dtype=float), rtol=1e-9, atol=1e-12, equal_nan=True)
+                self.assert_frame_matches(engine.to_frame().iloc[-window:].reset_index(drop=True),
+                                          expected.iloc[400 - window:400].reset_index(drop=True))
+
+    def test_supertrend_direction_flips(self):
+        engine = self.module.IndicatorEngine([self.module.SuperTrend(length=7, multiplier=3.0)])
+        engine.update(self.candles)
+        direction = engine.to_frame()["SUPERTd_7_3.0"].to_numpy()
+        self.assertGreater(np.count_nonzero(np.diff(direction)), 10)
+        self.assert_frame_matches(engine.to_frame(), reference_supertrend(self.candles, 7, 3.0))
+
+    def test_resume_after_gap(self):
+        # The feed resumes after a gap longer than the dataframe, so the indicators warm up again from the new candles
+        for create_indicator, reference in self.get_cases():
+            indicator = create_indicator()
+            with self.subTest(indicator=indicator.spec):
+                engine = self.module.IndicatorEngine([indicator], history_size=100)
+                engine.update(self.candles.iloc[:150])
+                candles = self.candles.iloc[300:400].reset_index(drop=True)
+                engine.update(candles)
+                self.assert_frame_matches(engine.to_frame(), reference(candles))
+
+    def test_backtest_over_wider_range(self):
+        # A second backtest on the same engine over a range that contains the last closed candle of the previous one
+        # but starts before it gets the full features
+        for create_indicator, reference in self.get_cases():
+            indicator = create_indicator()
+            with self.subTest(indicator=indicator.spec):
+                engine = self.module.IndicatorEngine([indicator], history_size=100)
+                engine.update(self.candles.iloc[100:301])
+                candles = self.candles.iloc[50:1001].reset_index(drop=True)
+                engine.update(candles)
+                self.assert_frame_matches(engine.to_frame(), reference(candles))
+
+    def test_history_grows_with_the_candles(self):
+        engine = self.module.IndicatorEngine([self.module.BollingerBands(length=20, std=2.0)], history_size=10)
+        engine.update(self.candles.iloc[:50])
+        engine.update(self.candles.iloc[:400])
+        self.assert_frame_matches(engine.to_frame(), reference_bbands(self.candles.iloc[:400], 20, 2.0))
+
+
+class FeatureCacheTest(unittest.TestCase):
+    def setUp(self):
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        self.indicators = importlib.import_module("controllers.utils.indicators")
+        self.cache = importlib.import_module("controllers.utils.feature_cache").FeatureCache()
+
+    def get_engine(self, owner: str):
+        return self.cache.get_engine(connector_name="binance", trading_pair="BTC-USDT", interval="1m",
+                                     indicators=[self.indicators.ATR(length=14)], owner=owner)
+
+    def test_engine_released_by_its_last_owner(self):
+        engine = self.get_engine("controller_1")
+        self.assertIs(engine, self.get_engine("controller_2"))
+        self.cache.release("controller_1")
+        self.assertIs(engine, self.get_engine("controller_3"))
+        self.cache.release("controller_2")
+        self.cache.release("controller_3")
+        self.assertIsNot(engine, self.get_engine("controller_1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
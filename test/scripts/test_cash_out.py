@@ -0,0 +1,118 @@
+import importlib
+import os
+import sys
+import types
+import unittest
+from dataclasses import dataclass
+from enum import Enum
+from unittest.mock import patch
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+class RunnableStatus(Enum):
+    RUNNING = 1
+    SHUTTING_DOWN = 2
+    TERMINATED = 3
+
+
+@dataclass
+class FakeStopExecutorAction:
+    executor_id: str
+    controller_id: str
+
+
+@dataclass
+class FakeExecutorInfo:
+    id: str
+    connector_name: str = "binance"
+    controller_id: str = "pmm"
+    is_trading: bool = False
+    status: RunnableStatus = RunnableStatus.RUNNING
+
+    @property
+    def is_done(self) -> bool:
+        return self.status == RunnableStatus.TERMINATED
+
+
+def get_stub_modules():
+    return {
+        "hummingbot": types.ModuleType("hummingbot"),
+        "hummingbot.strategy_v2": types.ModuleType("hummingbot.strategy_v2"),
+        "hummingbot.strategy_v2.models": types.ModuleType("hummingbot.strategy_v2.models"),
+        "hummingbot.strategy_v2.models.base": types.SimpleNamespace(RunnableStatus=RunnableStatus),
+        "hummingbot.strategy_v2.models.executor_actions": types.SimpleNamespace(
+            StopExecutorAction=FakeStopExecutorAction),
+        "hummingbot.strategy_v2.models.executors_info": types.SimpleNamespace(ExecutorInfo=object),
+    }
+
+
+class CashOutCoordinatorTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(sys.modules, get_stub_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.module = importlib.import_module("scripts.utils.cash_out")
+        self.cash_out = self.module.CashOutCoordinator(max_stops_per_batch=2, batch_interval=1, stop_retry_interval=30)
+
+    def get_stopped_ids(self, timestamp: float):
+        return [action.executor_id for action in self.cash_out.get_stop_actions(timestamp)]
+
+    def test_updates_ignored_until_started(self):
+        self.cash_out.on_executors_update([FakeExecutorInfo(id="binance_1")])
+        self.assertEqual(self.module.CashOutState.IDLE, self.cash_out.state)
+        self.assertEqual([], self.get_stopped_ids(0))
+
+    def test_stops_sent_in_batches_by_connector(self):
+        executors = [FakeExecutorInfo(id=f"binance_{i}") for i in range(5)] + \
+            [FakeExecutorInfo(id=f"okx_{i}", connector_name="okx") for i in range(2)]
+        self.cash_out.start(executors)
+        self.assertEqual(7, self.cash_out.queued_stops)
+        self.assertEqual(["binance_0", "binance_1", "okx_0", "okx_1"], self.get_stopped_ids(0))
+        # Rate limited until batch_interval seconds passed
+        self.assertEqual([], self.get_stopped_ids(0.5))
+        self.assertEqual(["binance_2", "binance_3"], self.get_stopped_ids(1))
+        self.assertEqual(["binance_4"], self.get_stopped_ids(2))
+        self.assertEqual(0, self.cash_out.queued_stops)
+        self.assertEqual(7, len(self.cash_out.pending_stops))
+
+    def test_trading_executors_wait_for_their_position(self):
+        executor = FakeExecutorInfo(id="binance_1", is_trading=True)
+        self.cash_out.start([executor])
+        self.assertEqual([], self.get_stopped_ids(0))
+        self.assertEqual(self.module.CashOutState.STOPPING, self.cash_out.state)
+        # The executor is queued once its position is closed
+        executor.is_trading = False
+        self.cash_out.on_executors_update([executor])
+        self.assertEqual(["binance_1"], self.get_stopped_ids(1))
+
+    def test_stop_retried_after_the_retry_interval(self):
+        self.cash_out.start([FakeExecutorInfo(id="binance_1")])
+        self.assertEqual(["binance_1"], self.get_stopped_ids(0))
+        # Updates of the executor while its stop is pending don't queue it again
+        self.cash_out.on_executors_update([FakeExecutorInfo(id="binance_1")])
+        self.assertEqual([], self.get_stopped_ids(10))
+        self.assertEqual([], self.get_stopped_ids(29))
+        self.assertEqual(["binance_1"], self.get_stopped_ids(30))
+        self.assertEqual({"binance_1": 30}, self.cash_out.pending_stops)
+
+    def test_done_when_no_executor_is_running(self):
+        executors = [FakeExecutorInfo(id="binance_1"), FakeExecutorInfo(id="binance_2", is_trading=True)]
+        self.cash_out.start(executors)
+        self.assertEqual(["binance_1"], self.get_stopped_ids(0))
+        executors[0].status = RunnableStatus.TERMINATED
+        self.cash_out.on_executors_update([executors[0]])
+        self.assertEqual(self.module.CashOutState.STOPPING, self.cash_out.state)
+        self.assertEqual({}, self.cash_out.pending_stops)
+        executors[1].status = RunnableStatus.SHUTTING_DOWN
+        self.cash_out.on_executors_update([executors[1]])
+        self.assertEqual(self.module.CashOutState.DONE, self.cash_out.state)
+        self.assertEqual([], self.get_stopped_ids(60))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+class ConfigFileWatcherTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.module = importlib.import_module("scripts.utils.config_watcher")
+        self.mtime = 1_700_000_000
+        self.write("pmm.yml")
+        self.write("grid.yml")
+        self.watcher = self.module.ConfigFileWatcher(directory=self.directory, file_names=["pmm.yml", "grid.yml"],
+                                                     poll_interval=5, debounce=2)
+
+    def write(self, file_name: str):
+        # The modification time is set explicitly, the writes of a test can happen within the file system resolution
+        self.mtime += 1
+        path = os.path.join(self.directory, file_name)
+        with open(path, "w") as file:
+            file.write(f"id: {file_name}\n")
+        os.utime(path, ns=(self.mtime * 10 ** 9, self.mtime * 10 ** 9))
+
+    def test_unchanged_files_not_reported(self):
+        for timestamp in range(5, 60, 5):
+            self.assertEqual([], self.watcher.poll(timestamp))
+
+    def test_change_reported_once_stable_for_the_debounce(self):
+        self.write("pmm.yml")
+        # Polled every poll_interval seconds only
+        self.assertEqual([], self.watcher.poll(4))
+        self.assertEqual([], self.watcher.poll(5))
+        self.assertEqual([], self.watcher.poll(6))
+        self.assertEqual(["pmm.yml"], self.watcher.poll(10))
+        self.assertEqual([], self.watcher.poll(15))
+
+    def test_repeated_writes_restart_the_debounce(self):
+        self.watcher.debounce = 8
+        self.write("pmm.yml")
+        self.assertEqual([], self.watcher.poll(5))
+        self.write("pmm.yml")
+        self.assertEqual([], self.watcher.poll(10))
+        self.write("grid.yml")
+        self.assertEqual([], self.watcher.poll(15))
+        self.assertEqual(["pmm.yml"], self.watcher.poll(20))
+        self.assertEqual(["grid.yml"], self.watcher.poll(25))
+
+    def test_missing_file_reported_when_recreated(self):
+        os.remove(os.path.join(self.directory, "pmm.yml"))
+        self.assertEqual([], self.watcher.poll(5))
+        self.assertEqual([], self.watcher.poll(10))
+        self.write("pmm.yml")
+        self.assertEqual([], self.watcher.poll(15))
+        self.assertEqual(["pmm.yml"], self.watcher.poll(20))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import importlib
+import os
+import sys
+import types
+import unittest
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from typing import Optional
+from unittest.mock import patch
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+class RunnableStatus(Enum):
+    RUNNING = 1
+    TERMINATED = 2
+
+
+class TradeType(Enum):
+    BUY = 1
+    SELL = 2
+
+
+@dataclass
+class FakeExecutorInfo:
+    id: str
+    controller_id: str = "pmm"
+    connector_name: str = "binance"
+    trading_pair: str = "BTC-USDT"
+    side: TradeType = TradeType.BUY
+    is_trading: bool = False
+    net_pnl_quote: Decimal = Decimal("0")
+    filled_amount_quote: Decimal = Decimal("0")
+    cum_fees_quote: Decimal = Decimal("0")
+    close_type: Optional[str] = None
+    close_timestamp: Optional[float] = None
+    status: RunnableStatus = RunnableStatus.RUNNING
+
+    @property
+    def is_done(self) -> bool:
+        return self.status == RunnableStatus.TERMINATED
+
+    @property
+    def is_active(self) -> bool:
+        return not self.is_done
+
+
+def get_stub_modules():
+    return {
+        "hummingbot": types.ModuleType("hummingbot"),
+        "hummingbot.core": types.ModuleType("hummingbot.core"),
+        "hummingbot.core.data_type": types.ModuleType("hummingbot.core.data_type"),
+        "hummingbot.core.data_type.common": types.SimpleNamespace(TradeType=TradeType),
+        "hummingbot.strategy_v2": types.ModuleType("hummingbot.strategy_v2"),
+        "hummingbot.strategy_v2.models": types.ModuleType("hummingbot.strategy_v2.models"),
+        "hummingbot.strategy_v2.models.base": types.SimpleNamespace(RunnableStatus=RunnableStatus),
+        "hummingbot.strategy_v2.models.executors_info": types.SimpleNamespace(ExecutorInfo=object),
+    }
+
+
+class ExecutorArchiveTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(sys.modules, get_stub_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.archive = importlib.import_module("scripts.utils.executor_archive").ExecutorArchive(archive_after=0)
+        self.tracker = importlib.import_module("scripts.utils.executor_tracker").ExecutorTracker()
+        self.index = importlib.import_module("scripts.utils.executor_index").ExecutorIndex()
+        self.executors = []
+
+    def tick(self, timestamp: float):
+        # Same order as the strategy: the working set is pruned before the tracker sync
+        executors_info = {"pmm": self.archive.prune("pmm", self.executors, timestamp, self.tracker.is_reported)}
+        self.index.update(self.tracker.sync(executors_info, timestamp))
+        self.index.remove(self.tracker.removed_executors)
+        return executors_info["pmm"]
+
+    def test_executor_archived_after_its_done_state_is_reported(self):
+        executor = FakeExecutorInfo(id="pmm_1")
+        self.executors.append(executor)
+        self.tick(1)
+        self.assertEqual([executor], self.index.get_executors(status=RunnableStatus.RUNNING))
+        # Closes after the sync of the tick, with archive_after 0 it is already expired on the next tick
+        executor.status, executor.close_timestamp = RunnableStatus.TERMINATED, 1
+        self.assertEqual([executor], self.tick(2))
+        self.assertEqual([], self.index.get_executors(status=RunnableStatus.RUNNING))
+        self.assertEqual([], self.tick(3))
+        self.assertEqual(1, self.archive.archived_executors)
+        # The archived ids are dropped once the orchestrator stops reporting the executor
+        self.executors.clear()
+        self.tick(4)
+        self.assertEqual({"pmm": set()}, self.archive._archived_by_controller)
+
+    def test_vanished_executor_removed_from_index(self):
+        self.executors.append(FakeExecutorInfo(id="pmm_1"))
+        self.tick(1)
+        self.executors.clear()
+        self.tick(2)
+        self.assertEqual(["pmm_1"], self.tracker.removed_executors)
+        self.assertEqual([], self.index.get_executors(controller_id="pmm"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,210 @@
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import types
+import unittest
+from decimal import Decimal
+from enum import Enum
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+DAY = 86400
+
+
+class TradeType(Enum):
+    BUY = 1
+    SELL = 2
+
+
+class OrderType(Enum):
+    MARKET = 1
+
+
+class FakeCandles:
+    interval = "1d"
+    interval_in_seconds = DAY
+
+    def __init__(self, config):
+        self.config = config
+        self.candles_df = pd.DataFrame(columns=["timestamp", "open", "high", "low", "close", "volume"])
+        self.ready = True
+        self.start_count = 0
+        self.stop_count = 0
+
+    def start(self):
+        self.start_count += 1
+
+    def stop(self):
+        self.stop_count += 1
+
+
+class FakeCandlesFactory:
+    @staticmethod
+    def get_candle(config):
+        return FakeCandles(config)
+
+
+class FakeCandlesConfig:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+class FakeConnector:
+    def __init__(self, mid_prices):
+        self.mid_prices = mid_prices
+        self.orders = []
+
+    def get_all_balances(self):
+        return {"USDT": Decimal("10000")}
+
+    def get_available_balance(self, asset):
+        return Decimal("10000") if asset == "USDT" else Decimal("0")
+
+    def get_balance(self, asset):
+        return self.get_all_balances().get(asset, Decimal("0"))
+
+    def get_mid_price(self, trading_pair):
+        return self.mid_prices[trading_pair]
+
+    def buy(self, trading_pair, amount, order_type):
+        self.orders.append((TradeType.BUY, trading_pair, amount))
+
+    def sell(self, trading_pair, amount, order_type):
+        self.orders.append((TradeType.SELL, trading_pair, amount))
+
+
+class FakeScriptStrategyBase:
+    def __init__(self, connectors, config=None):
+        self.connectors = connectors
+        self.current_timestamp = 0
+
+    def logger(self):
+        return logging.getLogger(__name__)
+
+
+def get_stub_modules(conf_dir):
+    stubs = {
+        "hummingbot": types.ModuleType("hummingbot"),
+        "hummingbot.client": types.ModuleType("hummingbot.client"),
+        "hummingbot.client.settings": types.SimpleNamespace(CONF_DIR_PATH=conf_dir),
+        "hummingbot.core": types.ModuleType("hummingbot.core"),
+        "hummingbot.core.data_type": types.ModuleType("hummingbot.core.data_type"),
+        "hummingbot.core.data_type.common": types.SimpleNamespace(OrderType=OrderType, TradeType=TradeType),
+        "hummingbot.core.data_type.candles": types.SimpleNamespace(CandlesFactory=FakeCandlesFactory,
+                                                                   CandlesConfig=FakeCandlesConfig),
+        "hummingbot.core.event": types.ModuleType("hummingbot.core.event"),
+        "hummingbot.core.event.events": types.SimpleNamespace(OrderFilledEvent=object),
+        "hummingbot.strategy": types.ModuleType("hummingbot.strategy"),
+        "hummingbot.strategy.script_strategy_base": types.SimpleNamespace(ScriptStrategyBase=FakeScriptStrategyBase),
+        "hummingbot.connector": types.ModuleType("hummingbot.connector"),
+        "hummingbot.connector.connector_base": types.SimpleNamespace(ConnectorBase=object),
+        "hummingbot.data_feed": types.ModuleType("hummingbot.data_feed"),
+        "hummingbot.data_feed.candles_feed": types.ModuleType("hummingbot.data_feed.candles_feed"),
+        "hummingbot.data_feed.candles_feed.candles_base": types.SimpleNamespace(CandlesBase=object),
+    }
+    stubs["hummingbot.client"].settings = stubs["hummingbot.client.settings"]
+    return stubs
+
+
+def get_downtrend_candles(n_candles: int, last_timestamp: float, start_price: float) -> pd.DataFrame:
+    close = start_price * 0.99 ** np.arange(n_candles)
+    return pd.DataFrame({"timestamp": last_timestamp - DAY * np.arange(n_candles)[::-1], "open": close,
+                         "high": close, "low": close, "close": close, "volume": np.ones(n_candles)})
+
+
+class MultiAssetRSIStrategyTest(unittest.TestCase):
+    def setUp(self):
+        modules = get_stub_modules(conf_dir=os.path.join(BOTS_PATH, "conf", "missing"))
+        patcher = patch.dict(sys.modules, modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.module = importlib.import_module("scripts.multi_asset_rsi")
+
+        self.last_candle_timestamp = 1000 * DAY
+        btc_candles = get_downtrend_candles(250, self.last_candle_timestamp, 100_000)
+        eth_candles = get_downtrend_candles(250, self.last_candle_timestamp, 5_000)
+        self.connector = FakeConnector({"BTC-USDT": Decimal(str(btc_candles["close"].iloc[-1])),
+                                        "ETH-USDT": Decimal(str(eth_candles["close"].iloc[-1]))})
+        self.strategy = self.module.MultiAssetRSIStrategy({"binance": self.connector})
+        self.strategy.candles["BTC-USDT"].candles_df = btc_candles
+        self.strategy.candles["ETH-USDT"].candles_df = eth_candles
+
+    def test_candles_feeds_lifecycle(self):
+        # The legs of the ETH-BTC feed are started once, through the ratio feed
+        self.assertIn(self.strategy.eth_btc_candles, self.strategy.candles_feeds)
+        for candle in self.strategy.candles.values():
+            self.assertEqual(1, candle.start_count)
+        self.strategy.on_stop()
+        for candle in self.strategy.candles.values():
+            self.assertEqual(1, candle.stop_count)
+
+    def test_candle_close_runs_signal(self):
+        signals = {}
+        rebalance_positions = self.strategy.rebalance_positions
+
+        def capture_signals(pair_signals, target_value, portfolio):
+            signals.update(pair_signals)
+            rebalance_positions(pair_signals, target_value, portfolio)
+
+        self.strategy.rebalance_positions = capture_signals
+        self.strategy.current_timestamp = self.last_candle_timestamp + self.strategy.signal_offset + 1
+        self.strategy.on_tick()
+
+        # The closes fall every day, so the RSI of the closed candles is below the bearish entry level
+        self.assertEqual({"BTC-USDT": "buy", "ETH-USDT": "buy"}, signals)
+        self.assertEqual({TradeType.BUY}, {order[0] for order in self.connector.orders})
+        self.assertEqual({"BTC-USDT", "ETH-USDT"}, {order[1] for order in self.connector.orders})
+
+        # The next ticks before the next candle close don't run the signal again
+        signals.clear()
+        self.strategy.current_timestamp += 3600
+        self.strategy.on_tick()
+        self.assertEqual({}, signals)
+
+
+class MultiAssetRSIConfigLoadingTest(unittest.TestCase):
+    def setUp(self):
+        conf_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(conf_dir.cleanup)
+        self.config_file_path = os.path.join(conf_dir.name, "multi_asset_rsi_config.yaml")
+        patcher = patch.dict(sys.modules, get_stub_modules(conf_dir=conf_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+
+    def write_config(self, content: str):
+        with open(self.config_file_path, "w") as file:
+            file.write(content)
+
+    def test_config_loaded_on_init(self):
+        # An invalid config doesn't break the import of the script
+        self.write_config("params:\n  trading_pairs: [ETH-USDT]\n")
+        strategy_class = importlib.import_module("scripts.multi_asset_rsi").MultiAssetRSIStrategy
+        with self.assertRaises(ValueError):
+            strategy_class.init_markets()
+
+        self.write_config("params:\n  exchange: okx\n  rsi_length: 21\n  trading_pairs: [BTC-USDT, SOL-USDT]\n")
+        strategy_class.init_markets()
+        self.assertEqual({"okx": {"BTC-USDT", "SOL-USDT"}}, strategy_class.markets)
+        connector = FakeConnector({"BTC-USDT": Decimal("100000"), "SOL-USDT": Decimal("150")})
+        strategy = strategy_class({"okx": connector})
+        self.assertEqual(21, strategy.rsi_length)
+        self.assertEqual({"BTC-USDT", "SOL-USDT"}, set(strategy.candles))
+        with self.assertRaises(ValueError):
+            strategy_class({"binance": connector})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import copy
+import importlib
+import os
+import sys
+import types
+import unittest
+from decimal import Decimal
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+class FakePublisher:
+    def __init__(self):
+        self.messages: List[Dict] = []
+
+    def __call__(self, message: Dict):
+        self.messages.append(copy.deepcopy(message))
+
+
+class DeltaSubscriber:
+    """
+    Rebuilds the full reports from the delta mode envelopes, as a subscriber of the performance topic would. A gap in
+    the sequence numbers leaves the reports out of sync until the next snapshot.
+    """
+
+    def __init__(self):
+        self.reports: Dict[str, Dict] = {}
+        self.last_seq: Optional[int] = None
+        self.in_sync = False
+        self.gaps = 0
+
+    def on_message(self, message: Dict):
+        if self.last_seq is not None and message["seq"] != self.last_seq + 1:
+            self.gaps += 1
+            self.in_sync = False
+        self.last_seq = message["seq"]
+        if message["type"] == "snapshot":
+            self.reports = copy.deepcopy(message["reports"])
+            self.in_sync = True
+        elif self.in_sync:
+            for controller_id, changed_fields in message["reports"].items():
+                if changed_fields is None:
+                    self.reports.pop(controller_id, None)
+                else:
+                    self.reports.setdefault(controller_id, {}).update(copy.deepcopy(changed_fields))
+
+
+def get_report(global_pnl_quote: str, volume_traded: str, close_type_counts: Optional[Dict] = None) -> Dict:
+    return {"global_pnl_quote": Decimal(global_pnl_quote), "volume_traded": Decimal(volume_traded),
+            "positions_summary": [], "close_type_counts": close_type_counts or {}}
+
+
+class PerformanceReportPublisherTest(unittest.TestCase):
+    def setUp(self):
+        modules = {
+            "hummingbot": types.ModuleType("hummingbot"),
+            "hummingbot.remote_iface": types.ModuleType("hummingbot.remote_iface"),
+            "hummingbot.remote_iface.mqtt": types.SimpleNamespace(ETopicPublisher=object),
+        }
+        patcher = patch.dict(sys.modules, modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.publisher_module = importlib.import_module("scripts.utils.performance_publisher")
+        self.fake_publisher = FakePublisher()
+        self.publisher = self.publisher_module.PerformanceReportPublisher(
+            publisher=self.fake_publisher, mode="delta", min_publish_interval=1, max_publish_interval=30)
+        self.subscriber = DeltaSubscriber()
+
+    def publish(self, reports: Dict[str, Dict], timestamp: float, drop: bool = False):
+        n_messages = len(self.fake_publisher.messages)
+        self.publisher.publish(reports, timestamp)
+        for message in self.fake_publisher.messages[n_messages:]:
+            if not drop:
+                self.subscriber.on_message(message)
+
+    def test_deltas_rebuild_the_reports(self):
+        # The reports are updated in place, as the incremental report engine does
+        reports = {"grid": get_report("0", "0"), "pmm": get_report("1", "50")}
+        self.publish(reports, timestamp=30)
+        self.assertEqual("snapshot", self.fake_publisher.messages[-1]["type"])
+        self.assertEqual(reports, self.subscriber.reports)
+
+        reports["grid"]["global_pnl_quote"] = Decimal("2.5")
+        reports["grid"]["close_type_counts"]["TAKE_PROFIT"] = 1
+        self.publish(reports, timestamp=31)
+        self.assertEqual({"type": "delta", "seq": 2, "reports": {"grid": {
+            "global_pnl_quote": Decimal("2.5"), "close_type_counts": {"TAKE_PROFIT": 1}}}},
+            self.fake_publisher.messages[-1])
+        self.assertEqual(reports, self.subscriber.reports)
+
+        # Under min_publish_interval the change waits for the next publication
+        reports["pmm"]["volume_traded"] = Decimal("80")
+        self.publish(reports, timestamp=31.5)
+        self.assertEqual(2, len(self.fake_publisher.messages))
+        self.publish(reports, timestamp=32)
+        self.assertEqual({"pmm": {"volume_traded": Decimal("80")}}, self.fake_publisher.messages[-1]["reports"])
+
+        # Nothing changed, no message
+        self.publish(reports, timestamp=33)
+        self.assertEqual(3, len(self.fake_publisher.messages))
+
+        reports["xemm"] = get_report("-1", "10")
+        del reports["grid"]
+        self.publish(reports, timestamp=34)
+        self.assertIsNone(self.fake_publisher.messages[-1]["reports"]["grid"])
+        self.assertEqual(reports, self.subscriber.reports)
+        self.assertEqual([1, 2, 3, 4], [message["seq"] for message in self.fake_publisher.messages])
+        self.assertEqual(0, self.subscriber.gaps)
+
+    def test_gap_detected_until_the_next_snapshot(self):
+        reports = {"grid": get_report("0", "0")}
+        self.publish(reports, timestamp=30)
+
+        # The subscriber misses a delta
+        reports["grid"]["global_pnl_quote"] = Decimal("1")
+        self.publish(reports, timestamp=31, drop=True)
+        reports["grid"]["volume_traded"] = Decimal("100")
+        self.publish(reports, timestamp=32)
+        self.assertEqual(1, self.subscriber.gaps)
+        self.assertFalse(self.subscriber.in_sync)
+        self.assertNotEqual(reports, self.subscriber.reports)
+
+        reports["grid"]["global_pnl_quote"] = Decimal("3")
+        self.publish(reports, timestamp=40)
+        self.assertFalse(self.subscriber.in_sync)
+
+        # The periodic snapshot resyncs the subscriber
+        self.publish(reports, timestamp=60)
+        self.assertEqual("snapshot", self.fake_publisher.messages[-1]["type"])
+        self.assertTrue(self.subscriber.in_sync)
+        self.assertEqual(reports, self.subscriber.reports)
+        self.assertEqual(list(range(1, 6)), [message["seq"] for message in self.fake_publisher.messages])
+
+        reports["grid"]["global_pnl_quote"] = Decimal("4")
+        self.publish(reports, timestamp=61)
+        self.assertEqual(reports, self.subscriber.reports)
+        self.assertEqual(1, self.subscriber.gaps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+import copy
+import importlib
+import os
+import sys
+import types
+import unittest
+from dataclasses import dataclass, field
+from decimal import Decimal
+from enum import Enum
+from typing import Dict, List, Optional
+from unittest.mock import patch
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+class CloseType(Enum):
+    TAKE_PROFIT = 1
+    STOP_LOSS = 2
+    EARLY_STOP = 3
+
+
+class PriceType(Enum):
+    MidPrice = 1
+
+
+@dataclass
+class FakeExecutorInfo:
+    id: str
+    controller_id: str
+    net_pnl_quote: Decimal = Decimal("0")
+    filled_amount_quote: Decimal = Decimal("0")
+    cum_fees_quote: Decimal = Decimal("0")
+    is_done: bool = False
+    close_type: Optional[CloseType] = None
+    close_timestamp: Optional[float] = None
+    is_trading: bool = False
+
+    @property
+    def status(self) -> str:
+        return "TERMINATED" if self.is_done else "RUNNING"
+
+    @property
+    def is_active(self) -> bool:
+        return not self.is_done
+
+    def close(self, close_type: CloseType, timestamp: float):
+        self.is_done = True
+        self.close_type = close_type
+        self.close_timestamp = timestamp
+
+
+class FakePositionSummary:
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def dict(self) -> Dict:
+        return dict(self.fields)
+
+
+@dataclass
+class FakePositionHold:
+    connector_name: str
+    trading_pair: str
+    amount: Decimal
+    entry_price: Decimal
+    realized_pnl_quote: Decimal = Decimal("0")
+    cum_fees_quote: Decimal = Decimal("0")
+
+    def get_position_summary(self, mid_price: Decimal) -> FakePositionSummary:
+        return FakePositionSummary(connector_name=self.connector_name, trading_pair=self.trading_pair,
+                                   volume_traded_quote=self.amount * self.entry_price,
+                                   unrealized_pnl_quote=(mid_price - self.entry_price) * self.amount,
+                                   realized_pnl_quote=self.realized_pnl_quote, cum_fees_quote=self.cum_fees_quote)
+
+
+class FakePerformanceReport:
+    def __init__(self, **fields):
+        self.fields = fields
+
+    def dict(self) -> Dict:
+        report = copy.deepcopy(self.fields)
+        report["positions_summary"] = [summary.dict() for summary in self.fields["positions_summary"]]
+        return report
+
+
+@dataclass
+class FakeExecutorOrchestrator:
+    """
+    Executor orchestrator with the report of ExecutorOrchestrator.generate_performance_report.
+    """
+    mid_prices: Dict[str, Decimal]
+    executors: Dict[str, List[FakeExecutorInfo]] = field(default_factory=dict)
+    positions_held: Dict[str, List[FakePositionHold]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.strategy = types.SimpleNamespace(market_data_provider=types.SimpleNamespace(
+            get_price_by_type=lambda connector_name, trading_pair, price_type: self.mid_prices[trading_pair]))
+
+    def generate_performance_report(self, controller_id: str) -> FakePerformanceReport:
+        realized_pnl_quote = unrealized_pnl_quote = volume_traded = Decimal("0")
+        close_type_counts = {}
+        positions_summary = []
+        for executor in self.executors.get(controller_id, []):
+            if executor.is_done:
+                realized_pnl_quote += executor.net_pnl_quote
+                if executor.close_type:
+                    close_type_counts[executor.close_type] = close_type_counts.get(executor.close_type, 0) + 1
+            else:
+                unrealized_pnl_quote += executor.net_pnl_quote
+            volume_traded += executor.filled_amount_quote
+        for position in self.positions_held.get(controller_id, []):
+            summary = position.get_position_summary(self.mid_prices[position.trading_pair])
+            realized_pnl_quote += summary.fields["realized_pnl_quote"] - summary.fields["cum_fees_quote"]
+            volume_traded += summary.fields["volume_traded_quote"]
+            unrealized_pnl_quote += summary.fields["unrealized_pnl_quote"]
+            positions_summary.append(summary)
+        global_pnl_quote = unrealized_pnl_quote + realized_pnl_quote
+
+        def pct(pnl: Decimal) -> Decimal:
+            return pnl / volume_traded * 100 if volume_traded != 0 else Decimal("0")
+        return FakePerformanceReport(realized_pnl_quote=realized_pnl_quote, unrealized_pnl_quote=unrealized_pnl_quote,
+                                     unrealized_pnl_pct=pct(unrealized_pnl_quote),
+                                     realized_pnl_pct=pct(realized_pnl_quote), global_pnl_quote=global_pnl_quote,
+                                     global_pnl_pct=pct(global_pnl_quote), volume_traded=volume_traded,
+                                     positions_summary=positions_summary, close_type_counts=close_type_counts)
+
+
+def get_stub_modules():
+    return {
+        "hummingbot": types.ModuleType("hummingbot"),
+        "hummingbot.core": types.ModuleType("hummingbot.core"),
+        "hummingbot.core.data_type": types.ModuleType("hummingbot.core.data_type"),
+        "hummingbot.core.data_type.common": types.SimpleNamespace(PriceType=PriceType),
+        "hummingbot.strategy_v2": types.ModuleType("hummingbot.strategy_v2"),
+        "hummingbot.strategy_v2.executors": types.ModuleType("hummingbot.strategy_v2.executors"),
+        "hummingbot.strategy_v2.executors.executor_orchestrator": types.SimpleNamespace(ExecutorOrchestrator=object),
+        "hummingbot.strategy_v2.models": types.ModuleType("hummingbot.strategy_v2.models"),
+        "hummingbot.strategy_v2.models.executors": types.SimpleNamespace(CloseType=CloseType),
+        "hummingbot.strategy_v2.models.executors_info": types.SimpleNamespace(ExecutorInfo=object),
+    }
+
+
+class IncrementalPerformanceReportsTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(sys.modules, get_stub_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.reports_module = importlib.import_module("scripts.utils.performance_reports")
+        self.tracker_module = importlib.import_module("scripts.utils.executor_tracker")
+        self.orchestrator = FakeExecutorOrchestrator(mid_prices={"BTC-USDT": Decimal("100"),
+                                                                 "ETH-USDT": Decimal("10")})
+        self.tracker = self.tracker_module.ExecutorTracker()
+        # The full recompute only runs on the first update, every other update is incremental
+        self.engine = self.reports_module.IncrementalPerformanceReports(self.orchestrator,
+                                                                        full_recompute_interval=10_000)
+        self.controller_ids = ["grid", "pmm"]
+
+    def add_executor(self, executor_id: str, controller_id: str) -> FakeExecutorInfo:
+        executor = FakeExecutorInfo(id=executor_id, controller_id=controller_id)
+        self.orchestrator.executors.setdefault(controller_id, []).append(executor)
+        return executor
+
+    def tick(self, timestamp: float):
+        changed_executors = self.tracker.sync(self.orchestrator.executors, timestamp)
+        self.engine.mark_dirty(changed_executors)
+        reports = self.engine.update(self.controller_ids, timestamp)
+        for controller_id in self.controller_ids:
+            with self.subTest(controller_id=controller_id, timestamp=timestamp):
+                expected = self.orchestrator.generate_performance_report(controller_id).dict()
+                self.assertEqual(expected.keys(), reports[controller_id].keys())
+                for key, value in expected.items():
+                    self.assertEqual(value, reports[controller_id][key], key)
+
+    def test_incremental_reports_match_orchestrator(self):
+        grid_1 = self.add_executor("grid_1", "grid")
+        self.orchestrator.positions_held["pmm"] = [
+            FakePositionHold("binance", "ETH-USDT", amount=Decimal("3"), entry_price=Decimal("10"),
+                             realized_pnl_quote=Decimal("0.5"), cum_fees_quote=Decimal("0.02"))]
+        self.tick(1)
+
+        grid_1.net_pnl_quote, grid_1.filled_amount_quote, grid_1.cum_fees_quote = \
+            Decimal("1.5"), Decimal("100"), Decimal("0.1")
+        grid_2 = self.add_executor("grid_2", "grid")
+        grid_2.net_pnl_quote, grid_2.filled_amount_quote = Decimal("-0.3"), Decimal("50")
+        self.tick(2)
+
+        grid_1.net_pnl_quote = Decimal("2")
+        grid_1.close(CloseType.TAKE_PROFIT, timestamp=3)
+        self.orchestrator.mid_prices["ETH-USDT"] = Decimal("10.5")
+        self.tick(3)
+
+        grid_2.net_pnl_quote, grid_2.filled_amount_quote = Decimal("-0.8"), Decimal("75")
+        pmm_1 = self.add_executor("pmm_1", "pmm")
+        pmm_1.net_pnl_quote, pmm_1.filled_amount_quote = Decimal("0.2"), Decimal("30")
+        self.orchestrator.positions_held["grid"] = [
+            FakePositionHold("binance", "BTC-USDT", amount=Decimal("0.5"), entry_price=Decimal("98"))]
+        self.tick(4)
+
+        # An executor that closes during the tick of the sync is reported on the next one
+        grid_2.close(CloseType.STOP_LOSS, timestamp=5)
+        self.orchestrator.mid_prices["BTC-USDT"] = Decimal("95")
+        self.tick(5)
+        pmm_1.close(CloseType.EARLY_STOP, timestamp=5)
+        self.tick(6)
+
+        # Only the price of the positions held changes
+        self.orchestrator.mid_prices["BTC-USDT"] = Decimal("103")
+        self.orchestrator.mid_prices["ETH-USDT"] = Decimal("9")
+        self.tick(7)
+        del self.orchestrator.positions_held["pmm"]
+        self.tick(8)
+
+    def test_done_executors_reported_once(self):
+        executor = self.add_executor("grid_1", "grid")
+        self.assertEqual([executor], self.tracker.sync(self.orchestrator.executors, 1))
+        executor.close(CloseType.TAKE_PROFIT, timestamp=1)
+        self.assertEqual([executor], self.tracker.sync(self.orchestrator.executors, 1))
+        self.assertEqual([], self.tracker.sync(self.orchestrator.executors, 2))
+        self.assertEqual([], self.tracker.sync(self.orchestrator.executors, 3))
+        # The done executors are skipped by their close timestamp, their ids are not kept
+        self.assertEqual({}, self.tracker._recently_done)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import importlib
+import os
+import sys
+import types
+import unittest
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
+from unittest.mock import patch
+
+BOTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "bots")
+
+
+class TradeType(Enum):
+    BUY = 1
+    SELL = 2
+
+
+@dataclass
+class FakeTradingRule:
+    min_order_size: Decimal = Decimal("0.0001")
+    min_notional_size: Decimal = Decimal("5")
+
+
+def get_stub_modules():
+    return {
+        "hummingbot": types.ModuleType("hummingbot"),
+        "hummingbot.connector": types.ModuleType("hummingbot.connector"),
+        "hummingbot.connector.connector_base": types.SimpleNamespace(ConnectorBase=object),
+        "hummingbot.connector.trading_rule": types.SimpleNamespace(TradingRule=FakeTradingRule),
+        "hummingbot.core": types.ModuleType("hummingbot.core"),
+        "hummingbot.core.data_type": types.ModuleType("hummingbot.core.data_type"),
+        "hummingbot.core.data_type.common": types.SimpleNamespace(TradeType=TradeType),
+    }
+
+
+class RebalancePlannerTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.dict(sys.modules, get_stub_modules())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        sys.path.insert(0, BOTS_PATH)
+        self.addCleanup(sys.path.remove, BOTS_PATH)
+        for module_name in [name for name in sys.modules if name == "scripts" or name.startswith("scripts.")]:
+            del sys.modules[module_name]
+        self.module = importlib.import_module("scripts.utils.rebalance_planner")
+        self.planner = self.module.RebalancePlanner(asset_to_rebalance="USDT", extra_inventory=0.25,
+                                                    min_amount_to_rebalance_usd=Decimal("8"))
+
+    def get_snapshot(self, balances):
+        return self.module.ConnectorSnapshot(connector_name="binance", balances=balances,
+                                             mid_prices={"BTC-USDT": Decimal("100")},
+                                             trading_rules={"BTC-USDT": FakeTradingRule()})
+
+    def plan(self, btc_balance: str, btc_required: str = "1", unmatched_amount: str = "0"):
+        return self.planner.plan({"binance": {"BTC": Decimal(btc_required), "USDT": Decimal("500")}},
+                                 {"binance": self.get_snapshot({"BTC": Decimal(btc_balance), "USDT": Decimal("0")})},
+                                 {"binance": {"BTC-USDT": Decimal(unmatched_amount)}})
+
+    def test_sell_the_excess_of_balance(self):
+        # 1 BTC required plus the 25% of extra inventory
+        orders = self.plan(btc_balance="2")
+        self.assertEqual(1, len(orders))
+        self.assertEqual((TradeType.SELL, Decimal("0.75")), (orders[0].side, orders[0].amount))
+        self.assertEqual(Decimal("1.25"), orders[0].required_amount)
+        self.assertEqual(Decimal("100"), orders[0].price)
+
+    def test_buy_the_missing_balance(self):
+        orders = self.plan(btc_balance="0.5")
+        self.assertEqual([(TradeType.BUY, Decimal("0.75"))], [(order.side, order.amount) for order in orders])
+
+    def test_excess_under_min_notional_skipped(self):
+        # 0.02 BTC of excess, 2 USDT under the min notional and the min amount to rebalance
+        self.assertEqual([], self.plan(btc_balance="1.27"))
+
+    def test_missing_balance_under_min_amount_buys_the_min_amount(self):
+        # 0.02 BTC missing, the minimum amount that can be traded is bought instead
+        orders = self.plan(btc_balance="1.23")
+        self.assertEqual([(TradeType.BUY, Decimal("0.08"))], [(order.side, order.amount) for order in orders])
+
+    def test_unmatched_amount_of_the_executors_added_to_the_balance(self):
+        # The executors sold 50 USDT more than they bought, 0.5 BTC to buy back when they close
+        orders = self.plan(btc_balance="0.75", unmatched_amount="50")
+        self.assertEqual([(TradeType.BUY, Decimal("0.08"))], [(order.side, order.amount) for order in orders])
+        self.assertEqual(Decimal("1.25"), orders[0].balance)
+        self.assertEqual(Decimal("0.5"), orders[0].unmatched_amount)
+
+    def test_asset_to_rebalance_not_traded(self):
+        self.assertEqual(["BTC-USDT"], self.planner.trading_pairs_required({"BTC": Decimal("1"), "USDT": Decimal("1")}))
+        self.assertNotIn("USDT-USDT", [order.trading_pair for order in self.plan(btc_balance="2")])
+
+
+if __name__ == "__main__":
+    unittest.main()